@@ -4,6 +4,7 @@ from flask import Flask, jsonify, request
 from flask_smorest import Api
 from flask_jwt_extended import JWTManager, create_access_token
 from werkzeug.exceptions import NotFound, UnprocessableEntity
+from werkzeug.middleware.proxy_fix import ProxyFix
 from flask_cors import CORS
 
 # potlačíme varování o duplicitních schématech pro OpenAPI
@@ -16,6 +17,11 @@ warnings.filterwarnings(
 
 from .config import config_by_name
 from .db import db, migrate
+from .json_provider import JSON_PROVIDERY
+from . import instrumentation
+from . import metrics
+from . import ratelimit
+from . import warmup
 
 # načteme modely, aby je Alembic/apispec viděl
 from .models import (
@@ -26,12 +32,22 @@ from .models import (
     Role, TokenBlacklist
 )
 
+# posluchače session událostí (inkrementální agregace) se registrují importem
+from . import reporting  # noqa
+from . import ratings  # noqa
+from . import loyalty  # noqa
+from . import outbox  # noqa
+from . import reminders  # noqa
+from . import events  # noqa
+from . import search  # noqa
+from . import allergens
+from . import daily_menu  # noqa
+
 def create_app(config_name=None, config_override=None):
     if not config_name:
         config_name = os.getenv("FLASK_CONFIG", "default")
 
     app = Flask(__name__)
-    app.json.ensure_ascii = False
 
     # načtení configu (development/testing/production)
     if config_override:
@@ -40,6 +56,15 @@ def create_app(config_name=None, config_override=None):
         app.config.from_object(config_by_name[config_name])
     app.config.setdefault("JSON_AS_ASCII", False)
 
+    # za load balancerem: remote_addr / scheme z X-Forwarded-* (rate limit po IP)
+    proxy = app.config.get("PROXY_POCET", 0)
+    if proxy:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=proxy, x_proto=proxy)
+
+    # JSON provider (výchozí orjson – viz app/json_provider.py)
+    app.json = JSON_PROVIDERY[app.config.get("JSON_PROVIDER", "orjson")](app)
+    app.json.ensure_ascii = False
+
     # povolíme CORS pro frontend na localhost:3000
     CORS(
         app,
@@ -51,13 +76,23 @@ def create_app(config_name=None, config_override=None):
     db.init_app(app)
     migrate.init_app(app, db)
 
+    # počty a časy SQL dotazů po requestech (hlavičky, log pomalých requestů)
+    instrumentation.init_app(app)
+
+    # Prometheus metriky (GET /metrics) – bez prometheus_client no-op
+    metrics.init_app(app)
+
+    # rate limit podle identity / IP a odlehčení při přetížení (429 / 503)
+    ratelimit.init_app(app)
+
     # init JWT + blacklist callback
     jwt = JWTManager(app)
 
     @jwt.token_in_blocklist_loader
     def check_if_token_revoked(jwt_header, jwt_payload):
         jti = jwt_payload["jti"]
-        return db.session.query(TokenBlacklist).filter_by(jti=jti).first() is not None
+        with metrics.kontrola_blocklistu():
+            return db.session.query(TokenBlacklist).filter_by(jti=jti).first() is not None
 
     # ─── dev‐mode JWT injector ───────────────────────────────────────────────
     if config_name == "development":
@@ -80,6 +115,9 @@ def create_app(config_name=None, config_override=None):
     api.register_blueprint(api_bp)
     api.register_blueprint(auth_bp)
 
+    # GET /ready – 503, dokud se proces nezahřeje (app/warmup.py, gunicorn.conf.py)
+    warmup.init_app(app)
+
     # ─── Idempotentní seed trvalých položek menu + alergenů ─────────────────
     from .models import PolozkaMenu, Alergen, PolozkaMenuAlergen
 
@@ -197,6 +235,16 @@ def create_app(config_name=None, config_override=None):
             "errors": messages
         }), 422
 
+    @app.errorhandler(allergens.MimoMasku)
+    def handle_alergen_mimo_masku(err):
+        # vyhozeno z flushe → transakce je neplatná
+        db.session.rollback()
+        return jsonify({
+            "status": "Chybný vstup",
+            "code":   422,
+            "errors": {"id_alergenu": [str(err)]}
+        }), 422
+
     @app.errorhandler(NotFound)
     def handle_404(err):
         msg = err.description or "Nenalezeno"
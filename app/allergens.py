@@ -0,0 +1,154 @@
+# app/allergens.py
+
+"""
+Bitová maska alergenů u PolozkaMenu (alergeny_maska).
+
+- alergen s id_alergenu = n má bit 1 << (n - 1) (BigInteger → nejvýš 63 alergenů)
+  – alergen nebo vazba s vyšším id shodí flush výjimkou MimoMasku, API ji
+  vrací jako 422 (app/__init__.py), ne 500
+- přidání / smazání vazby PolozkaMenuAlergen → atomický UPDATE
+  maska = maska | bit, resp. maska & ~bit ve stejné transakci
+- filtr „bez alergenů“ je pak jediná podmínka maska & :vyloucene = 0
+- serializace seznamu alergenů dekóduje masku přes mapu id → název
+  (cache v app.extensions, zneplatní ji commit, který měnil Alergen)
+- prepocitat_masky(): jedním UPDATE přestaví masky z vazeb
+"""
+
+import threading
+
+from flask import current_app
+from sqlalchemy import case, event, func, select, update
+from sqlalchemy.orm.util import identity_key
+
+from .db import db, zneplatnit_pri_zmene
+from .models import Alergen, PolozkaMenu, PolozkaMenuAlergen
+from .search import slozit
+
+MAX_ID = 63
+_zamek = threading.Lock()
+
+
+class MimoMasku(ValueError):
+    """Alergen s id mimo 1..MAX_ID – do bitové masky se nevejde."""
+
+
+def bit(id_alergenu):
+    if not 1 <= id_alergenu <= MAX_ID:
+        raise MimoMasku(f"Alergen {id_alergenu} se do masky nevejde (max {MAX_ID}).")
+    return 1 << (id_alergenu - 1)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Údržba masky
+# ──────────────────────────────────────────────────────────────────────────────
+@event.listens_for(db.session, "after_flush_postexec")
+def _aktualizovat_masky(session, flush_context):
+    # až po dokončení flushe – expirace masky v session už nic nepřepíše
+    pridat, odebrat = {}, {}
+    for pridana, id_menu, id_alergenu in session.info.pop("alergeny_vazby", ()):
+        cil = pridat if pridana else odebrat
+        cil[id_menu] = cil.get(id_menu, 0) | bit(id_alergenu)
+    if not pridat and not odebrat:
+        return
+    conn = session.connection()
+    for id_menu, bity in pridat.items():
+        conn.execute(update(PolozkaMenu).where(PolozkaMenu.id_menu_polozka == id_menu)
+                     .values(alergeny_maska=PolozkaMenu.alergeny_maska.bitwise_or(bity),
+                             verze=PolozkaMenu.verze + 1))
+    for id_menu, bity in odebrat.items():
+        conn.execute(update(PolozkaMenu).where(PolozkaMenu.id_menu_polozka == id_menu)
+                     .values(alergeny_maska=PolozkaMenu.alergeny_maska.bitwise_and(~bity),
+                             verze=PolozkaMenu.verze + 1))
+    for id_menu in {*pridat, *odebrat}:
+        obj = session.identity_map.get(identity_key(PolozkaMenu, id_menu))
+        if obj is not None:
+            session.expire(obj, ["alergeny_maska", "verze"])
+
+
+@event.listens_for(db.session, "after_flush")
+def _zaznamenat_vazby(session, flush_context):
+    vazby = session.info.setdefault("alergeny_vazby", [])
+    for obj in session.new:
+        # id přidělila až DB → kontrola po flushi, výjimka transakci vrátí
+        if isinstance(obj, Alergen):
+            bit(obj.id_alergenu)
+        elif isinstance(obj, PolozkaMenuAlergen):
+            bit(obj.id_alergenu)
+            vazby.append((True, obj.id_menu_polozka, obj.id_alergenu))
+    for obj in session.deleted:
+        if isinstance(obj, PolozkaMenuAlergen):
+            vazby.append((False, obj.id_menu_polozka, obj.id_alergenu))
+
+
+@event.listens_for(db.session, "after_rollback")
+def _zahodit_vazby(session):
+    session.info.pop("alergeny_vazby", None)
+
+
+zneplatnit_pri_zmene("alergeny_mapa", Alergen)
+
+
+def prepocitat_masky():
+    """Přestaví masky všech položek z vazeb (po importu mimo ORM) jedním UPDATE."""
+    ids = db.session.scalars(select(Alergen.id_alergenu)).all()
+    bity = case({i: bit(i) for i in ids}, value=PolozkaMenuAlergen.id_alergenu, else_=0) \
+        if ids else 0
+    soucet = (
+        select(func.coalesce(func.sum(bity), 0))
+        .where(PolozkaMenuAlergen.id_menu_polozka == PolozkaMenu.id_menu_polozka)
+        .scalar_subquery()
+    )
+    vysledek = db.session.execute(
+        update(PolozkaMenu).values(alergeny_maska=soucet, verze=PolozkaMenu.verze + 1))
+    db.session.commit()
+    return vysledek.rowcount
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Dekódování a filtr
+# ──────────────────────────────────────────────────────────────────────────────
+def mapa_alergenu():
+    """id_alergenu → název (cache na aplikaci)."""
+    ext = current_app.extensions
+    mapa = ext.get("alergeny_mapa")
+    if mapa is None:
+        with _zamek:
+            mapa = ext.get("alergeny_mapa")
+            if mapa is None:
+                mapa = dict(db.session.execute(select(Alergen.id_alergenu, Alergen.nazev)).all())
+                ext["alergeny_mapa"] = mapa
+    return mapa
+
+
+def dekodovat(maska):
+    """Maska → [{"id_alergenu", "nazev"}] seřazené podle id."""
+    mapa = mapa_alergenu()
+    vysledek = []
+    maska = maska or 0
+    while maska:
+        nejnizsi = maska & -maska
+        id_ = nejnizsi.bit_length()
+        vysledek.append({"id_alergenu": id_, "nazev": mapa.get(id_)})
+        maska ^= nejnizsi
+    return vysledek
+
+
+def maska_z_parametru(hodnota):
+    """'Lepek,Ořechy' nebo '1,5' → maska; neznámý alergen → ValueError."""
+    podle_nazvu = {slozit(n): i for i, n in mapa_alergenu().items()}
+    maska = 0
+    for cast in (c.strip() for c in hodnota.split(",")):
+        if not cast:
+            continue
+        id_ = int(cast) if cast.isdigit() else podle_nazvu.get(slozit(cast))
+        if id_ is None or id_ not in mapa_alergenu():
+            raise ValueError(f"Neznámý alergen: {cast}")
+        maska |= bit(id_)
+    return maska
+
+
+def bez_alergenu(stmt, maska):
+    """Přidá do SELECTu nad PolozkaMenu podmínku maska & :vyloucene = 0."""
+    if not maska:
+        return stmt
+    return stmt.where(PolozkaMenu.alergeny_maska.bitwise_and(maska) == 0)
@@ -2,8 +2,14 @@
 
 from flask_smorest import Blueprint
 
+from .negotiation import pripojit
+
 # jednou definujeme blueprint
 api_bp = Blueprint("api", __name__, url_prefix="/api")
+pripojit(api_bp)   # komprese + MessagePack (app/api/negotiation.py)
 
 # import routes spustí decorators, které registrují všechny endpointy
 from . import routes  # noqa
+from . import export  # noqa
+from . import reporting  # noqa
+from . import events  # noqa
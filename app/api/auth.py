@@ -9,10 +9,13 @@ from flask_jwt_extended import (
 )
 
 from ..db import db
+from .. import metrics, passwords
 from ..models import Zakaznik, TokenBlacklist
 from ..schemas import LoginSchema
+from .negotiation import pripojit
 
 auth_bp = Blueprint("auth", __name__, url_prefix="/api/auth")
+pripojit(auth_bp)
 
 
 @auth_bp.route("/login")
@@ -20,7 +23,9 @@ class LoginResource(MethodView):
     """
     POST /api/auth/login
     - @arguments(LoginSchema): validuje email, password
-    - Ověříme uživatele a heslo, abort(401) při chybě
+    - Ověříme uživatele a heslo (v poolu app/passwords.py), abort(401) při chybě,
+      abort(503) když je fronta na ověření plná
+    - Hash se zastaralou metodou / cenou se přepočítá a uloží
     - Vytvoříme access i refresh token s rolemi
     - Vrací { "access_token": ..., "refresh_token": ... }
     """
@@ -28,8 +33,21 @@ class LoginResource(MethodView):
     def post(self, data):
         user = db.session.query(Zakaznik).filter_by(
             email=data["email"]).first()
-        if not user or not user.check_password(data["password"]):
+        try:
+            platne = user is not None and passwords.v_poolu(
+                passwords.overit, user._password, data["password"])
+            if platne and passwords.potreba_prehashovat(user._password):
+                user._password = passwords.v_poolu(
+                    passwords.hashovat, data["password"], passwords.metoda())
+                db.session.commit()
+        except passwords.PretizeniHesel:
+            metrics.prihlaseni("pretizeni")
+            abort(503, message="Příliš mnoho přihlášení najednou, zkuste to za chvíli.",
+                  headers={"Retry-After": "1"})
+        if not platne:
+            metrics.prihlaseni("neplatne_udaje")
             abort(401, message="Neplatné přihlašovací údaje.")
+        metrics.prihlaseni("ok")
         roles = [r.name for r in user.roles]
         access_token = create_access_token(
             identity=str(user.id_zakaznika),
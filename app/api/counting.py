@@ -0,0 +1,92 @@
+# app/api/counting.py
+
+"""
+Stránkování seznamů a levný celkový počet (X-Total-Count).
+
+- ?limit=&offset= → stránka seřazená podle PK; bez limitu celý seznam jako dřív
+- ?pocet= zapne hlavičky X-Total-Count a X-Total-Count-Mode (použitý režim):
+  presny = COUNT(*) nad stejným dotazem (bez řazení a stránkování)
+  odhad  = Postgres: bez filtru pg_class.reltuples, s filtrem odhad řádků
+           plánovače (EXPLAIN); malé odhady (< POCET_ODHAD_OD) a jiné DB
+           se spočítají přesně – hlavička pak říká "presny"
+  cache  = přesný počet uložený na POCET_CACHE_TTL_S v paměti workeru
+           (klíč = SQL + parametry, takže filtr podle uživatele se nemíchá)
+"""
+
+import json
+import threading
+import time
+
+from flask import current_app
+from sqlalchemy import func, select, text
+
+from ..db import db
+
+MAX_CACHE = 1000
+_zamek = threading.Lock()
+
+
+def _presny(stmt):
+    return db.session.scalar(
+        select(func.count()).select_from(stmt.order_by(None).subquery())
+    )
+
+
+def _odhad(stmt):
+    """Odhad plánovače, nebo None (jiná DB / tabulka bez statistik)."""
+    if db.session.get_bind().dialect.name != "postgresql":
+        return None
+    if stmt.whereclause is None and len(stmt.get_final_froms()) == 1:
+        tabulka = stmt.get_final_froms()[0]
+        odhad = db.session.scalar(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:t AS regclass)"),
+            {"t": tabulka.name},
+        )
+        return odhad if odhad is not None and odhad >= 0 else None    # -1 = nikdy neanalyzováno
+    sql = str(stmt.order_by(None).compile(
+        dialect=db.session.get_bind().dialect, compile_kwargs={"literal_binds": True}))
+    plan = db.session.connection().exec_driver_sql("EXPLAIN (FORMAT JSON) " + sql).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def _z_cache(stmt):
+    cache = current_app.extensions.setdefault("pocty_cache", {})
+    prelozeny = stmt.compile()
+    klic = (str(prelozeny), repr(sorted(prelozeny.params.items())))
+    ted = time.monotonic()
+    with _zamek:
+        zaznam = cache.get(klic)
+    if zaznam and zaznam[0] > ted:
+        return zaznam[1], "cache"
+    pocet = _presny(stmt)
+    with _zamek:
+        if len(cache) >= MAX_CACHE:
+            cache.clear()
+        cache[klic] = (ted + current_app.config.get("POCET_CACHE_TTL_S", 30), pocet)
+    return pocet, "presny"
+
+
+def celkovy_pocet(stmt, rezim):
+    """→ (počet, skutečně použitý režim)."""
+    if rezim == "cache":
+        return _z_cache(stmt)
+    if rezim == "odhad":
+        odhad = _odhad(stmt)
+        if odhad is not None and odhad >= current_app.config.get("POCET_ODHAD_OD", 10_000):
+            return odhad, "odhad"
+    return _presny(stmt), "presny"
+
+
+def seznam(stmt, args, model):
+    """Výsledek list view: položky, nebo (položky, 200, hlavičky) s ?pocet=."""
+    hlavicky = {}
+    if args.get("pocet"):
+        pocet, rezim = celkovy_pocet(stmt, args["pocet"])
+        hlavicky = {"X-Total-Count": str(pocet), "X-Total-Count-Mode": rezim}
+    if args.get("limit"):
+        stmt = (stmt.order_by(*model.__table__.primary_key.columns)
+                    .limit(args["limit"]).offset(args["offset"]))
+    polozky = db.session.scalars(stmt).all()
+    return (polozky, 200, hlavicky) if hlavicky else polozky
@@ -0,0 +1,49 @@
+# app/api/etag.py
+
+"""
+Optimistické zamykání přes ETag / If-Match (sloupec verze, mixin Verzovany).
+
+- GET položky, POST a PUT vracejí slabý ETag: W/"<verze>" – verze záznamu
+  neříká nic o bajtech odpovědi (JSON / msgpack, komprese se vyjednávají)
+- PUT vyžaduje If-Match: bez něj 428, s jinou verzí 412 ("*" = libovolná)
+- zápis je jeden UPDATE … WHERE pk = :id AND verze = :verze (version_id_col);
+  změna jiného requestu mezi načtením a commitem → StaleDataError → 412
+"""
+
+from flask import request
+from flask_smorest import abort
+from sqlalchemy.orm.exc import StaleDataError
+
+from ..db import db
+
+
+def etag(obj):
+    return f'W/"{obj.verze}"'
+
+
+def s_etagem(obj, status=200):
+    """Návratová hodnota view: (objekt, status, hlavičky) – @response ji serializuje."""
+    return obj, status, {"ETag": etag(obj)}
+
+
+def zkontrolovat_if_match(obj):
+    if "If-Match" not in request.headers:
+        abort(428, message="Úprava vyžaduje hlavičku If-Match s ETagem záznamu.")
+    pozadovano = request.if_match
+    # slabá shoda: ETag je slabý, klient může poslat i silný "<verze>"
+    if not pozadovano.star_tag and not pozadovano.contains_weak(str(obj.verze)):
+        abort(412, message="Záznam se mezitím změnil, načtěte ho znovu.",
+              headers={"ETag": etag(obj)})
+
+
+def ulozit_zmeny(obj, data):
+    """Ověří If-Match, zapíše změny jedním hlídaným UPDATE a vrátí s_etagem(obj)."""
+    zkontrolovat_if_match(obj)
+    for k, v in data.items():
+        setattr(obj, k, v)
+    try:
+        db.session.commit()
+    except StaleDataError:
+        db.session.rollback()
+        abort(412, message="Záznam se mezitím změnil, načtěte ho znovu.")
+    return s_etagem(obj)
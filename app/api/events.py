@@ -0,0 +1,56 @@
+# app/api/events.py
+
+from flask import Response, current_app, request, stream_with_context
+from flask.views import MethodView
+from flask_smorest import abort
+from flask_jwt_extended import jwt_required, get_jwt
+from marshmallow import Schema, fields
+
+from ..events import posledni_id, sse_stream, zabrat_stream
+from . import api_bp
+
+
+class UdalostiArgsSchema(Schema):
+    po_id = fields.Int()    # alternativa k hlavičce Last-Event-ID (první připojení)
+    jwt   = fields.Str()    # EventSource neumí hlavičky → token lze poslat v query
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# ŽIVÉ UDÁLOSTI – SSE pro kuchyň a obsluhu
+# ──────────────────────────────────────────────────────────────────────────────
+@api_bp.route("/udalosti/stream")
+class UdalostiStream(MethodView):
+    @jwt_required(locations=["headers", "query_string"])
+    @api_bp.arguments(UdalostiArgsSchema, location="query")
+    def get(self, args):
+        """
+        text/event-stream s událostmi objednavka.* a rezervace.*.
+        Bez Last-Event-ID / po_id začíná od teď (historii nepřehrává).
+        Nad UDALOSTI_MAX_STREAMU otevřených streamů ve workeru jen jeden průchod
+        s retry za UDALOSTI_POLL_S.
+        """
+        roles = set(get_jwt().get("roles", []))
+        if not roles.intersection({"staff", "admin"}):
+            abort(403, message="Nemáte oprávnění sledovat události.")
+
+        posledni = request.headers.get("Last-Event-ID") or args.get("po_id")
+        try:
+            po_id = int(posledni) if posledni is not None else posledni_id()
+        except ValueError:
+            abort(400, message="Neplatné Last-Event-ID.")
+
+        cfg = current_app.config
+        uvolnit = zabrat_stream()
+        if uvolnit is None:
+            # plno → jeden průchod a konec (long-poll), vlákno se hned vrátí
+            proud = sse_stream(po_id, cfg["UDALOSTI_INTERVAL_S"], cfg["UDALOSTI_PING_S"], 0,
+                               retry_s=cfg.get("UDALOSTI_POLL_S", 5))
+        else:
+            proud = sse_stream(po_id, cfg["UDALOSTI_INTERVAL_S"], cfg["UDALOSTI_PING_S"],
+                               cfg["UDALOSTI_MAX_S"])
+        resp = Response(stream_with_context(proud), mimetype="text/event-stream")
+        if uvolnit is not None:
+            resp.call_on_close(uvolnit)     # i když klient spojení zavře předčasně
+        resp.headers["Cache-Control"] = "no-cache"
+        resp.headers["X-Accel-Buffering"] = "no"    # nginx nesmí odpověď bufferovat
+        return resp
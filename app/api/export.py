@@ -0,0 +1,38 @@
+# app/api/export.py
+
+from flask import Response, stream_with_context
+from flask.views import MethodView
+from flask_smorest import abort
+from flask_jwt_extended import jwt_required, get_jwt
+from marshmallow import Schema, fields, validate
+
+from ..export import FORMATY, radky_exportu
+from . import api_bp
+
+
+class ExportArgsSchema(Schema):
+    format = fields.Str(load_default="ndjson", validate=validate.OneOf(list(FORMATY)))
+    od     = fields.Date()          # včetně
+    do     = fields.Date()          # bez
+    po_id  = fields.Int()           # navázání za poslední exportované id_objednavky
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# ÚČETNÍ EXPORT – streamovaný NDJSON / CSV
+# ──────────────────────────────────────────────────────────────────────────────
+@api_bp.route("/export/objednavky")
+class ExportObjednavek(MethodView):
+    @jwt_required()
+    @api_bp.arguments(ExportArgsSchema, location="query")
+    def get(self, args):
+        """Streamuje objednávky s položkami a platbami za zvolené období."""
+        roles = set(get_jwt().get("roles", []))
+        if not roles.intersection({"staff", "admin"}):
+            abort(403, message="Nemáte oprávnění exportovat objednávky.")
+        formatovac, mimetype = FORMATY[args["format"]]
+        radky = radky_exportu(args.get("od"), args.get("do"), args.get("po_id"))
+        resp = Response(stream_with_context(formatovac(radky)), mimetype=mimetype)
+        resp.headers["Content-Disposition"] = (
+            f'attachment; filename="objednavky.{args["format"]}"'
+        )
+        return resp
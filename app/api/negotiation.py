@@ -0,0 +1,77 @@
+# app/api/negotiation.py
+
+"""
+Odpovědní vrstva pro api_bp a auth_bp (after_request).
+
+1) MessagePack: klient s Accept: application/msgpack dostane místo JSON
+   binární msgpack – before_request nastaví g.odpoved_msgpack a JSON provider
+   (app/json_provider.py) zabalí výstup schématu přímo, bez JSON mezikroku
+   (msgpack je volitelný)
+2) Komprese: br / gzip podle Accept-Encoding (q-hodnoty respektuje werkzeug),
+   jen od KOMPRESE_MIN_B bajtů a jen u komprimovatelných typů
+   - gzip úroveň 5 a brotli kvalita 4: u dynamických odpovědí ~stejný poměr
+     jako maximum za zlomek CPU (vyšší úrovně šetří jednotky % dat)
+- streamované odpovědi (export, SSE) a už kódované odpovědi se nemění
+"""
+
+import gzip
+
+from flask import current_app, g, request
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover – volitelná závislost
+    brotli = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover – volitelná závislost
+    msgpack = None
+
+MSGPACK_TYPY = ("application/msgpack", "application/x-msgpack")
+KOMPRIMOVATELNE = ("application/json", "application/msgpack", "application/x-ndjson")
+
+
+def _vyjednat_msgpack():
+    if msgpack is None:
+        return
+    nabidka = ["application/json", *MSGPACK_TYPY]
+    g.odpoved_msgpack = request.accept_mimetypes.best_match(nabidka) in MSGPACK_TYPY
+
+
+def _komprimovat(resp):
+    resp.vary.add("Accept-Encoding")
+    if "Content-Encoding" in resp.headers:
+        return
+    if resp.mimetype not in KOMPRIMOVATELNE and not resp.mimetype.startswith("text/"):
+        return
+    cfg = current_app.config
+    telo = resp.get_data()
+    if len(telo) < cfg.get("KOMPRESE_MIN_B", 1024):
+        return
+
+    kodovani = ["br", "gzip"] if brotli is not None else ["gzip"]
+    vybrane = request.accept_encodings.best_match(kodovani)
+    if vybrane == "br":
+        resp.set_data(brotli.compress(telo, quality=cfg.get("KOMPRESE_BROTLI_KVALITA", 4)))
+    elif vybrane == "gzip":
+        resp.set_data(gzip.compress(telo, compresslevel=cfg.get("KOMPRESE_GZIP_UROVEN", 5), mtime=0))
+    else:
+        return
+    resp.headers["Content-Encoding"] = vybrane
+
+
+def odpovedni_vrstva(resp):
+    if resp.is_streamed or resp.direct_passthrough:
+        return resp
+    if resp.status_code in (204, 304) or resp.status_code < 200:
+        return resp
+    resp.vary.add("Accept")
+    _komprimovat(resp)
+    return resp
+
+
+def pripojit(bp):
+    """Zaregistruje vrstvu na blueprint (volá se jednou při importu modulu)."""
+    bp.before_request(_vyjednat_msgpack)
+    bp.after_request(odpovedni_vrstva)
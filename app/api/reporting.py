@@ -0,0 +1,45 @@
+# app/api/reporting.py
+
+from datetime import date, timedelta
+
+from flask.views import MethodView
+from flask_smorest import abort
+from flask_jwt_extended import jwt_required, get_jwt
+
+from ..reporting import report_trzeb, report_polozek
+from ..schemas import ReportArgsSchema, DenniTrzbaSchema, ProdejPolozkySchema
+from . import api_bp
+
+
+def _obdobi(args):
+    roles = set(get_jwt().get("roles", []))
+    if not roles.intersection({"staff", "admin"}):
+        abort(403, message="Nemáte oprávnění zobrazit reporty.")
+    do = args.get("do") or date.today() + timedelta(days=1)
+    od = args.get("od") or do - timedelta(days=31)
+    if od >= do:
+        abort(422, message="'od' musí být před 'do'.")
+    return od, do
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# REPORTY TRŽEB – jen z agregačních tabulek, cena O(počet dní)
+# ──────────────────────────────────────────────────────────────────────────────
+@api_bp.route("/reporty/trzby")
+class ReportTrzeb(MethodView):
+    @jwt_required()
+    @api_bp.arguments(ReportArgsSchema, location="query")
+    @api_bp.response(200, DenniTrzbaSchema(many=True))
+    def get(self, args):
+        """Denní tržby, počty objednávek a mix typů plateb za období."""
+        return report_trzeb(*_obdobi(args))
+
+
+@api_bp.route("/reporty/polozky")
+class ReportPolozek(MethodView):
+    @jwt_required()
+    @api_bp.arguments(ReportArgsSchema, location="query")
+    @api_bp.response(200, ProdejPolozkySchema(many=True))
+    def get(self, args):
+        """Prodané množství a tržba po položkách menu za období."""
+        return report_polozek(*_obdobi(args))
@@ -25,14 +25,25 @@ Principy a důležité body
 
 7. register_crud
    - Generuje CRUD endpointy automaticky.
+
+8. Optimistické zamykání (app/api/etag.py)
+   - GET položky / POST / PUT vracejí ETag s verzí záznamu.
+   - PUT vyžaduje If-Match: bez něj 428, jiná verze → 412.
+
+9. Seznamy (app/api/counting.py)
+   - ?limit=&offset= stránkuje, ?pocet=presny|odhad|cache přidá X-Total-Count
+     a X-Total-Count-Mode.
+
+10. Idempotency-Key (@idempotentni, app/idempotency.py)
+   - POST, které vytvářejí záznam, přijímají hlavičku Idempotency-Key;
+     opakovaný request se stejným klíčem dostane uloženou první odpověď.
 """
 
 from functools import wraps
 from flask.views import MethodView
 from flask_smorest import abort
-from flask import request
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import lazyload
 from datetime import date
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 
@@ -40,8 +51,9 @@ from ..db import db
 from ..models import (
     Zakaznik, VernostniUcet, Stul, Salonek, PodnikovaAkce,
     Objednavka, PolozkaObjednavky, Platba, Hodnoceni,
-    PolozkaMenu, PolozkaMenuAlergen, JidelniPlan,
-    PolozkaJidelnihoPlanu, Alergen, Notifikace, Rezervace, Role
+    PolozkaMenu, JidelniPlan,
+    PolozkaJidelnihoPlanu, Alergen, Notifikace, Rezervace, Role,
+    HodnoceniStatistika, BodovyPohyb
 )
 from ..schemas import (
     ZakaznikSchema, ZakaznikCreateSchema,
@@ -54,14 +66,23 @@ from ..schemas import (
     PlatbaSchema, PlatbaCreateSchema,
     HodnoceniSchema, HodnoceniCreateSchema,
     PolozkaMenuSchema, PolozkaMenuCreateSchema,
-    PolozkaMenuAlergenSchema, PolozkaMenuAlergenCreateSchema,
     JidelniPlanSchema, JidelniPlanCreateSchema,
     PolozkaJidelnihoPlanuSchema, PolozkaJidelnihoPlanuCreateSchema,
     AlergenSchema, AlergenCreateSchema,
     NotifikaceSchema, NotifikaceCreateSchema,
-    RezervaceSchema, RezervaceCreateSchema
+    RezervaceSchema, RezervaceCreateSchema,
+    HodnoceniPrehledSchema, BodovyPohybSchema, BodyUpravaSchema, HledaniArgsSchema, MenuArgsSchema,
+    DnesniMenuSchema, SeznamArgsSchema, ZakaznikSeznamArgsSchema
 )
+from ..ratings import CELKEM, statistika_dict
+from ..loyalty import pripsat
+from ..search import hledat_menu
+from ..allergens import bez_alergenu, maska_z_parametru
+from ..daily_menu import dnesni_nabidka
+from ..idempotency import idempotentni
 from . import api_bp
+from .counting import seznam
+from .etag import s_etagem, ulozit_zmeny
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Dekorátory pro omezení přístupu
@@ -98,18 +119,20 @@ def must_own_reservation_or_admin(fn):
 @api_bp.route("/zakaznik")
 class ZakaznikList(MethodView):
     @jwt_required()
+    @api_bp.arguments(ZakaznikSeznamArgsSchema, location="query")
     @api_bp.response(200, ZakaznikSchema(many=True))
-    def get(self):
+    def get(self, args):
         roles = set(get_jwt().get("roles", []))
         if not roles.intersection({"staff", "admin"}):
             abort(403, message="Nemáte oprávnění zobrazit všechny zákazníky.")
-        role_filter = request.args.get("role")
+        role_filter = args.get("role")
         stmt = db.select(Zakaznik)
         if role_filter:
             stmt = stmt.join(Zakaznik.roles).where(Role.name == role_filter)
-        return db.session.scalars(stmt).all()
+        return seznam(stmt, args, Zakaznik)
 
     @jwt_required()
+    @idempotentni
     @api_bp.arguments(ZakaznikCreateSchema)
     @api_bp.response(201, ZakaznikSchema)
     def post(self, new_data):
@@ -128,7 +151,7 @@ class ZakaznikList(MethodView):
         except IntegrityError:
             db.session.rollback()
             abort(409, message="Duplicitní nebo neplatný záznam.")
-        return zak
+        return s_etagem(zak, 201)
 
 @api_bp.route("/zakaznik/<int:id_zakaznika>")
 class ZakaznikItem(MethodView):
@@ -142,7 +165,7 @@ class ZakaznikItem(MethodView):
         zak = db.session.get(Zakaznik, id_zakaznika)
         if not zak:
             abort(404, message="Zákazník nenalezen.")
-        return zak
+        return s_etagem(zak)
 
     @jwt_required()
     @must_be_self_or_admin("id_zakaznika")
@@ -152,10 +175,7 @@ class ZakaznikItem(MethodView):
         zak = db.session.get(Zakaznik, id_zakaznika)
         if not zak:
             abort(404, message="Zákazník nenalezen.")
-        for k, v in data.items():
-            setattr(zak, k, v)
-        db.session.commit()
-        return zak
+        return ulozit_zmeny(zak, data)
 
     @jwt_required()
     @must_be_self_or_admin("id_zakaznika")
@@ -191,12 +211,14 @@ def register_crud(
     @api_bp.route(f"/{route_base}")
     class ListView(MethodView):
         @jwt_required()
+        @api_bp.arguments(SeznamArgsSchema, location="query")
         @api_bp.response(200, schema_cls(many=True))
-        def get(self):
+        def get(self, args):
             check_roles(roles_list)
-            return db.session.scalars(db.select(model)).all()
+            return seznam(db.select(model), args, model)
 
         @jwt_required()
+        @idempotentni
         @api_bp.arguments(create_schema_cls)
         @api_bp.response(201, schema_cls)
         def post(self, new_data):
@@ -208,7 +230,7 @@ def register_crud(
             except IntegrityError:
                 db.session.rollback()
                 abort(409, message="Duplicitní nebo neplatný záznam.")
-            return obj
+            return s_etagem(obj, 201)
 
     @api_bp.route(f"/{route_base}/<int:{pk_name}>")
     class ItemView(MethodView):
@@ -219,7 +241,7 @@ def register_crud(
             obj = db.session.get(model, kwargs[pk_name])
             if not obj:
                 abort(404, message=f"{model.__tablename__.capitalize()} nenalezen.")
-            return obj
+            return s_etagem(obj)
 
         @jwt_required()
         @api_bp.arguments(schema_cls(partial=True))
@@ -229,10 +251,7 @@ def register_crud(
             obj = db.session.get(model, kwargs[pk_name])
             if not obj:
                 abort(404, message=f"{model.__tablename__.capitalize()} nenalezen.")
-            for k, v in data.items():
-                setattr(obj, k, v)
-            db.session.commit()
-            return obj
+            return ulozit_zmeny(obj, data)
 
         @jwt_required()
         @api_bp.response(204)
@@ -299,23 +318,59 @@ register_crud('alergen', Alergen, AlergenSchema, AlergenCreateSchema, 'id_alerge
               roles_update=('user','staff','admin'),
               roles_delete=('user','staff','admin'))
 
+# ──────────────────────────────────────────────────────────────────────────────
+# VĚRNOSTNÍ BODY – kniha pohybů (app/loyalty.py)
+# ──────────────────────────────────────────────────────────────────────────────
+@api_bp.route("/ucet/<int:id_ucet>/body")
+class VernostniBody(MethodView):
+    @jwt_required()
+    @api_bp.response(200, BodovyPohybSchema(many=True))
+    def get(self, id_ucet):
+        """Historie pohybů bodů – vlastník účtu nebo obsluha."""
+        ucet = db.session.get(VernostniUcet, id_ucet)
+        if not ucet:
+            abort(404, message="Účet nenalezen.")
+        roles = set(get_jwt().get("roles", []))
+        if ucet.id_zakaznika != int(get_jwt_identity()) and not roles.intersection({"staff", "admin"}):
+            abort(403, message="Nemáte oprávnění.")
+        return ucet.pohyby.order_by(BodovyPohyb.id_pohyb.desc()).all()
+
+    @jwt_required()
+    @api_bp.arguments(BodyUpravaSchema)
+    @api_bp.response(201, VernostniUcetSchema)
+    def post(self, data, id_ucet):
+        """Ruční úprava bodů – atomicky (body = body + :n) a se záznamem v knize."""
+        roles = set(get_jwt().get("roles", []))
+        if not roles.intersection({"staff", "admin"}):
+            abort(403, message="Nemáte oprávnění upravovat body.")
+        ucet = db.session.get(VernostniUcet, id_ucet)
+        if not ucet:
+            abort(404, message="Účet nenalezen.")
+        pripsat(db.session.connection(), id_ucet, data["body"], "uprava", data.get("popis"))
+        db.session.commit()
+        return ucet
+
 # ──────────────────────────────────────────────────────────────────────────────
 # VLASTNÍ ENDPOINTY PRO MENU
 # ──────────────────────────────────────────────────────────────────────────────
+def _maska_alergenu(args):
+    try:
+        return maska_z_parametru(args.get("bez_alergenu") or "")
+    except ValueError as e:
+        abort(400, message=str(e))
+
 @api_bp.route("/menu")
 class PolozkaMenuList(MethodView):
+    @api_bp.arguments(MenuArgsSchema, location="query")
     @api_bp.response(200, PolozkaMenuSchema(many=True))
-    def get(self):
-        stmt = (
-            db.select(PolozkaMenu)
-              .options(
-                  selectinload(PolozkaMenu.alergeny)
-                    .selectinload(PolozkaMenuAlergen.alergen)
-              )
-        )
+    def get(self, args):
+        # alergeny se serializují z bitové masky → vazby se nenačítají
+        stmt = db.select(PolozkaMenu).options(lazyload(PolozkaMenu.alergeny))
+        stmt = bez_alergenu(stmt, _maska_alergenu(args))
         return db.session.scalars(stmt).all()
 
     @jwt_required()
+    @idempotentni
     @api_bp.arguments(PolozkaMenuCreateSchema)
     @api_bp.response(201, PolozkaMenuSchema)
     def post(self, new_data):
@@ -329,7 +384,36 @@ class PolozkaMenuList(MethodView):
         except IntegrityError:
             db.session.rollback()
             abort(409, message="Duplicitní nebo neplatný záznam.")
-        return obj
+        return s_etagem(obj, 201)
+
+@api_bp.route("/menu/hledat")
+class PolozkaMenuHledani(MethodView):
+    @api_bp.arguments(HledaniArgsSchema, location="query")
+    @api_bp.response(200, PolozkaMenuSchema(many=True))
+    def get(self, args):
+        """Hledání v názvu a popisu bez ohledu na diakritiku, seřazené podle relevance."""
+        maska = _maska_alergenu(args)
+        ids = hledat_menu(args["q"], args["limit"])
+        if not ids:
+            return []
+        stmt = (
+            db.select(PolozkaMenu)
+              .options(lazyload(PolozkaMenu.alergeny))
+              .where(PolozkaMenu.id_menu_polozka.in_(ids))
+        )
+        stmt = bez_alergenu(stmt, maska)
+        polozky = {p.id_menu_polozka: p for p in db.session.scalars(stmt)}
+        return [polozky[i] for i in ids if i in polozky]
+
+@api_bp.route("/menu/dnes")
+class DnesniMenu(MethodView):
+    @api_bp.response(200)
+    @api_bp.doc(responses={200: {"description": "Dnešní nabídka",
+                                 "content": {"application/json": {"schema": DnesniMenuSchema}}}})
+    def get(self):
+        """Dnešní nabídka: jídelní plány + jídla dne + stálá nabídka (cache do půlnoci)."""
+        # v cache je už serializovaný výsledek → odpověď se znovu neserializuje
+        return dnesni_nabidka(PolozkaMenuSchema())
 
 @api_bp.route("/menu/<int:id_menu_polozka>")
 class PolozkaMenuItem(MethodView):
@@ -337,16 +421,13 @@ class PolozkaMenuItem(MethodView):
     def get(self, id_menu_polozka):
         stmt = (
             db.select(PolozkaMenu)
-              .options(
-                  selectinload(PolozkaMenu.alergeny)
-                    .selectinload(PolozkaMenuAlergen.alergen)
-              )
+              .options(lazyload(PolozkaMenu.alergeny))
               .where(PolozkaMenu.id_menu_polozka == id_menu_polozka)
         )
         obj = db.session.scalars(stmt).first()
         if not obj:
             abort(404, message="Položka menu nenalezena.")
-        return obj
+        return s_etagem(obj)
 
     @jwt_required()
     @api_bp.arguments(PolozkaMenuSchema(partial=True))
@@ -358,10 +439,7 @@ class PolozkaMenuItem(MethodView):
         obj = db.session.get(PolozkaMenu, id_menu_polozka)
         if not obj:
             abort(404, message="Položka menu nenalezena.")
-        for k, v in data.items():
-            setattr(obj, k, v)
-        db.session.commit()
-        return obj
+        return ulozit_zmeny(obj, data)
 
     @jwt_required()
     @api_bp.response(204)
@@ -376,6 +454,24 @@ class PolozkaMenuItem(MethodView):
         db.session.commit()
         return ""
 
+# ──────────────────────────────────────────────────────────────────────────────
+# STATISTIKA HODNOCENÍ (předpočítaná v app/ratings.py)
+# ──────────────────────────────────────────────────────────────────────────────
+@api_bp.route("/hodnoceni/statistiky")
+class HodnoceniStatistiky(MethodView):
+    @api_bp.response(200, HodnoceniPrehledSchema)
+    def get(self):
+        """Souhrnná statistika hodnocení + statistika po položkách menu."""
+        staty = db.session.scalars(
+            db.select(HodnoceniStatistika).order_by(HodnoceniStatistika.id_menu_polozka)
+        ).all()
+        celkem = next((s for s in staty if s.id_menu_polozka == CELKEM), None)
+        return {
+            "celkem":  statistika_dict(celkem),
+            "polozky": [statistika_dict(s) for s in staty
+                        if s.id_menu_polozka != CELKEM and s.pocet],
+        }
+
 # ──────────────────────────────────────────────────────────────────────────────
 # VLASTNÍ ENDPOINTY PRO MEAL-PLANS
 # ──────────────────────────────────────────────────────────────────────────────
@@ -413,17 +509,19 @@ class MealPlanItem(MethodView):
 @api_bp.route("/rezervace")
 class RezervaceList(MethodView):
     @jwt_required()
+    @api_bp.arguments(SeznamArgsSchema, location="query")
     @api_bp.response(200, RezervaceSchema(many=True))
-    def get(self):
+    def get(self, args):
         current_id = int(get_jwt_identity())
         roles = set(get_jwt().get("roles", []))
         if roles.intersection({"staff", "admin"}):
             stmt = db.select(Rezervace)
         else:
             stmt = db.select(Rezervace).where(Rezervace.id_zakaznika == current_id)
-        return db.session.scalars(stmt).all()
+        return seznam(stmt, args, Rezervace)
 
     @jwt_required()
+    @idempotentni
     @api_bp.arguments(RezervaceCreateSchema)
     @api_bp.response(201, RezervaceSchema)
     def post(self, new_data):
@@ -435,7 +533,7 @@ class RezervaceList(MethodView):
         except IntegrityError:
             db.session.rollback()
             abort(409, message="Duplicitní nebo neplatný záznam.")
-        return rez
+        return s_etagem(rez, 201)
 
 @api_bp.route("/rezervace/<int:id_rezervace>")
 class RezervaceItem(MethodView):
@@ -443,7 +541,7 @@ class RezervaceItem(MethodView):
     @must_own_reservation_or_admin
     @api_bp.response(200, RezervaceSchema)
     def get(self, id_rezervace):
-        return db.session.get(Rezervace, id_rezervace)
+        return s_etagem(db.session.get(Rezervace, id_rezervace))
 
     @jwt_required()
     @must_own_reservation_or_admin
@@ -451,10 +549,7 @@ class RezervaceItem(MethodView):
     @api_bp.response(200, RezervaceSchema)
     def put(self, data, id_rezervace):
         rez = db.session.get(Rezervace, id_rezervace)
-        for k, v in data.items():
-            setattr(rez, k, v)
-        db.session.commit()
-        return rez
+        return ulozit_zmeny(rez, data)
 
     @jwt_required()
     @must_own_reservation_or_admin
@@ -0,0 +1,185 @@
+# app/archive.py
+
+"""
+Archivace starých objednávek, položek, plateb a notifikací (flask archivovat).
+
+- provozní tabulky drží jen posledních ARCHIV_PO_DNECH dní → jejich indexy
+  a vacuum neplatí za celou historii; cizí klíče zůstávají beze změny
+- starší data se přesunou do tabulek *_archiv (app/models.py), na Postgresu
+  rozdělených po měsících (PARTITION BY RANGE); chybějící měsíční oddíly se
+  založí před přesunem
+- přesun po dávkách objednávek: INSERT … SELECT do archivu a DELETE v pořadí
+  cizích klíčů, commit po každé dávce – žádná dlouhá transakce
+- objednávky s hodnocením, otevřené objednávky a objednávky s nevyřízenou
+  notifikací (cekajici / odesilani) zůstávají – hodnocení na ně odkazuje,
+  otevřené se ještě mění a zprávu musí outbox ještě doručit; archivují se
+  jen vyřízené notifikace (odeslano / chyba), i samostatně bez objednávky
+- platby archivované objednávky jdou do archivu s ní, i když jsou mladší
+  než hranice → přepočet agregací (app/reporting.py) je od hranice čte
+  i z platba_archiv
+- hranice (PlanovacZnacka "archiv_do"): agregace tržeb se pod ní nepřepočítávají
+  (zdrojová data už nejsou v provozních tabulkách) a API čte archiv jen když
+  request výslovně žádá období před hranicí (export s ?od=); jiné endpointy
+  časový rozsah nepřijímají, takže archiv nečtou – seznamy /api/objednavka,
+  /api/platba, /api/notifikace vrací jen provozní data a detail
+  archivovaného záznamu 404
+"""
+
+from datetime import date, datetime, time, timedelta
+
+from flask import current_app
+from sqlalchemy import and_, delete, exists, func, insert, select, text
+
+from .db import db
+from .models import (
+    Hodnoceni, Notifikace, Objednavka, OTEVRENE_STAVY, PlanovacZnacka, Platba, PolozkaObjednavky,
+    notifikace_archiv, objednavka_archiv, platba_archiv, polozka_objednavky_archiv,
+)
+from .outbox import CHYBA, ODESLANO
+
+ZNACKA = "archiv_do"
+
+O = Objednavka.__table__
+P = PolozkaObjednavky.__table__
+PL = Platba.__table__
+N = Notifikace.__table__
+VYRIZENA = N.c.stav.in_((ODESLANO, CHYBA))
+
+# archivní tabulka → sloupec, podle kterého je rozdělená
+ODDILY = {
+    objednavka_archiv:         "datum_cas",
+    polozka_objednavky_archiv: "datum_cas",
+    platba_archiv:             "datum",
+    notifikace_archiv:         "datum_cas",
+}
+
+
+def archivovano_do():
+    """Čas, před kterým už mohou být data v archivu (None = nic archivováno)."""
+    znacka = db.session.get(PlanovacZnacka, ZNACKA)
+    return znacka.hodnota if znacka else None
+
+
+def cte_archiv(od):
+    """Má request s počátkem období `od` (date / datetime) číst i archiv?"""
+    hranice = archivovano_do()
+    if od is None or hranice is None:
+        return False
+    if not isinstance(od, datetime):
+        od = datetime.combine(od, time.min)
+    return od < hranice
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Měsíční oddíly (jen Postgres)
+# ──────────────────────────────────────────────────────────────────────────────
+def _mesice(od, do):
+    mesic = date(od.year, od.month, 1)
+    while mesic <= do:
+        dalsi = date(mesic.year + mesic.month // 12, mesic.month % 12 + 1, 1)
+        yield mesic, dalsi
+        mesic = dalsi
+
+
+def zalozit_oddily(conn, od, do):
+    """Založí chybějící měsíční oddíly všech archivních tabulek pro [od, do]."""
+    if conn.dialect.name != "postgresql":
+        return
+    for tabulka in ODDILY:
+        for mesic, dalsi in _mesice(od, do):
+            conn.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {tabulka.name}_{mesic:%Y_%m} "
+                f"PARTITION OF {tabulka.name} FOR VALUES FROM ('{mesic}') TO ('{dalsi}')"
+            ))
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Přesun
+# ──────────────────────────────────────────────────────────────────────────────
+def _presunout(conn, ids):
+    """Přesune objednávky `ids` i s položkami, platbami a notifikacemi."""
+    conn.execute(insert(objednavka_archiv).from_select(
+        O.c.keys(), select(O).where(O.c.id_objednavky.in_(ids))))
+    conn.execute(insert(polozka_objednavky_archiv).from_select(
+        [*P.c.keys(), "datum_cas"],
+        select(*P.c, O.c.datum_cas).join(O, O.c.id_objednavky == P.c.id_objednavky)
+        .where(P.c.id_objednavky.in_(ids))))
+    conn.execute(insert(platba_archiv).from_select(
+        PL.c.keys(), select(PL).where(PL.c.id_objednavky.in_(ids))))
+    # nevyřízené zprávy by zmizely neodeslané – kandidáti je mít nesmí
+    conn.execute(insert(notifikace_archiv).from_select(
+        N.c.keys(), select(N).where(N.c.id_objednavky.in_(ids), VYRIZENA)))
+
+    pocty = {N.name: conn.execute(
+        delete(N).where(N.c.id_objednavky.in_(ids), VYRIZENA)).rowcount}
+    for tabulka in (PL, P):
+        pocty[tabulka.name] = conn.execute(
+            delete(tabulka).where(tabulka.c.id_objednavky.in_(ids))).rowcount
+    pocty[O.name] = conn.execute(delete(O).where(O.c.id_objednavky.in_(ids))).rowcount
+    return pocty
+
+
+def archivovat(dni=None, davka=None, prubeh=None):
+    """
+    Přesune do archivu data starší než `dni` dní (výchozí ARCHIV_PO_DNECH).
+    Vrací počty přesunutých řádků podle tabulek; prubeh(počty) se volá po každé dávce.
+    """
+    dni = current_app.config.get("ARCHIV_PO_DNECH", 365) if dni is None else dni
+    davka = davka or current_app.config.get("ARCHIV_DAVKA", 5000)
+    hranice = datetime.combine(date.today() - timedelta(days=dni), time.min)
+    conn = db.session.connection()
+    nejstarsi = min(
+        (d for d in (conn.scalar(select(func.min(O.c.datum_cas))),
+                     conn.scalar(select(func.min(N.c.datum_cas)))) if d is not None),
+        default=None,
+    )
+    celkem = dict.fromkeys((O.name, P.name, PL.name, N.name), 0)
+    if nejstarsi is None or nejstarsi >= hranice:
+        return celkem
+    # platby a notifikace staré objednávky mohou být mladší než hranice
+    zalozit_oddily(conn, nejstarsi.date(), date.today())
+
+    # hranice se zapíše hned: agregace pod ní se od teď nepřepočítávají
+    znacka = db.session.get(PlanovacZnacka, ZNACKA)
+    if znacka is None:
+        db.session.add(PlanovacZnacka(nazev=ZNACKA, hodnota=hranice))
+    elif znacka.hodnota < hranice:
+        znacka.hodnota = hranice
+    db.session.commit()
+
+    kandidati = (
+        select(O.c.id_objednavky)
+        .where(O.c.datum_cas < hranice)
+        .where(func.coalesce(O.c.stav, "").notin_(OTEVRENE_STAVY))
+        .where(~exists().where(Hodnoceni.id_objednavky == O.c.id_objednavky))
+        .where(~exists().where(N.c.id_objednavky == O.c.id_objednavky, ~VYRIZENA))
+        .order_by(O.c.id_objednavky)
+    )
+    posledni = 0
+    while True:
+        conn = db.session.connection()
+        ids = conn.scalars(kandidati.where(O.c.id_objednavky > posledni).limit(davka)).all()
+        if not ids:
+            break
+        for nazev, pocet in _presunout(conn, ids).items():
+            celkem[nazev] += pocet
+        db.session.commit()
+        posledni = ids[-1]
+        if prubeh:
+            prubeh(celkem)
+
+    # vyřízené notifikace bez archivované objednávky (rezervace, objednávky s hodnocením)
+    stare = and_(N.c.datum_cas < hranice, VYRIZENA)
+    while True:
+        conn = db.session.connection()
+        ids = conn.scalars(select(N.c.id_notifikace).where(stare)
+                           .order_by(N.c.id_notifikace).limit(davka)).all()
+        if not ids:
+            break
+        conn.execute(insert(notifikace_archiv).from_select(
+            N.c.keys(), select(N).where(N.c.id_notifikace.in_(ids))))
+        celkem[N.name] += conn.execute(delete(N).where(N.c.id_notifikace.in_(ids))).rowcount
+        db.session.commit()
+        if prubeh:
+            prubeh(celkem)
+    return celkem
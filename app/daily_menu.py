@@ -0,0 +1,92 @@
+# app/daily_menu.py
+
+"""
+Dnešní nabídka (GET /api/menu/dnes).
+
+- jeden dotaz: PolozkaMenu + (outer join) dnešní položky aktivních jídelních
+  plánů, k tomu jídla s dnešním PolozkaMenu.den a „stálá nabídka“
+- pořadí: plán (podle poradi) → jídla dne → stálá nabídka (podle názvu)
+- výsledek se drží serializovaný v app.extensions do půlnoci (místní čas),
+  do zápisu plánu / menu / alergenů / hodnocení, nejdéle MENU_DNES_TTL_S
+  (zápis v jiném procesu tuto cache nezneplatní)
+"""
+
+import threading
+import time
+from datetime import date
+
+from flask import current_app
+from sqlalchemy import case, func, or_, select
+from sqlalchemy.orm import lazyload
+
+from .db import db, zneplatnit_pri_zmene
+from .models import (
+    Alergen, Hodnoceni, JidelniPlan, PolozkaJidelnihoPlanu, PolozkaMenu, PolozkaMenuAlergen
+)
+
+DNY = ("Pondělí", "Úterý", "Středa", "Čtvrtek", "Pátek", "Sobota", "Neděle")
+STALA_NABIDKA = "stálá nabídka"
+_zamek = threading.Lock()
+
+zneplatnit_pri_zmene("menu_dnes", JidelniPlan, PolozkaJidelnihoPlanu, PolozkaMenu,
+                     PolozkaMenuAlergen, Alergen, Hodnoceni)
+
+
+def dotaz_nabidky(dnes):
+    """SELECT (PolozkaMenu, sekce, poradi) pro daný den."""
+    den_tydne = DNY[dnes.weekday()]
+    plan = (
+        select(PolozkaJidelnihoPlanu.id_menu_polozka,
+               func.min(PolozkaJidelnihoPlanu.poradi).label("poradi"))
+        .join(JidelniPlan, JidelniPlan.id_plan == PolozkaJidelnihoPlanu.id_plan)
+        .where(PolozkaJidelnihoPlanu.den == dnes)
+        .where(JidelniPlan.platny_od <= dnes)
+        .where(or_(JidelniPlan.platny_do.is_(None), JidelniPlan.platny_do >= dnes))
+        .group_by(PolozkaJidelnihoPlanu.id_menu_polozka)
+        .subquery()
+    )
+    sekce = case(
+        (plan.c.poradi.is_not(None), "plan"),
+        (PolozkaMenu.den == den_tydne, "den"),
+        else_="stala",
+    )
+    poradi_sekce = case(
+        (plan.c.poradi.is_not(None), 0),
+        (PolozkaMenu.den == den_tydne, 1),
+        else_=2,
+    )
+    return (
+        select(PolozkaMenu, sekce.label("sekce"), plan.c.poradi)
+        .outerjoin(plan, plan.c.id_menu_polozka == PolozkaMenu.id_menu_polozka)
+        .where(or_(plan.c.poradi.is_not(None),
+                   PolozkaMenu.den == den_tydne,
+                   PolozkaMenu.kategorie == STALA_NABIDKA))
+        .options(lazyload(PolozkaMenu.alergeny))
+        .order_by(poradi_sekce, plan.c.poradi, PolozkaMenu.nazev)
+    )
+
+
+def sestavit_nabidku(dnes, schema):
+    polozky = []
+    for polozka, sekce, poradi in db.session.execute(dotaz_nabidky(dnes)):
+        data = schema.dump(polozka)
+        data.update(sekce=sekce, poradi=poradi)
+        polozky.append(data)
+    return {"den": dnes.isoformat(), "den_tydne": DNY[dnes.weekday()], "polozky": polozky}
+
+
+def dnesni_nabidka(schema):
+    """Serializovaná dnešní nabídka – z cache, dokud platí."""
+    dnes = date.today()
+    ext = current_app.extensions
+    ttl = current_app.config.get("MENU_DNES_TTL_S", 300)
+    zaznam = ext.get("menu_dnes")
+    if zaznam and zaznam[0] == dnes and time.monotonic() - zaznam[1] < ttl:
+        return zaznam[2]
+    with _zamek:
+        zaznam = ext.get("menu_dnes")
+        if zaznam and zaznam[0] == dnes and time.monotonic() - zaznam[1] < ttl:
+            return zaznam[2]
+        data = sestavit_nabidku(dnes, schema)
+        ext["menu_dnes"] = (dnes, time.monotonic(), data)
+        return data
@@ -1,10 +1,103 @@
 # app/db.py
 
+from flask import current_app, has_app_context
 from flask_sqlalchemy import SQLAlchemy    # importuje SQLAlchemy ORM pro Flask
 # importuje Migrate pro správu databázových migrací
 from flask_migrate import Migrate
+from collections import defaultdict
+
+from sqlalchemy import event, insert, inspect, update
+from sqlalchemy.dialects import postgresql, sqlite
 
 # vytvoří instanci ORM, kterou budeme registrovat v create_app
 db = SQLAlchemy()
 # vytvoří instanci migrací, také registrovanou v create_app
 migrate = Migrate()
+
+
+def pricist(conn, table, klic, hodnoty):
+    """
+    Atomicky přičte hodnoty k agregačnímu řádku (col = col + :n).
+    - klic: dict se sloupci primárního klíče
+    - Postgres / SQLite: jeden INSERT ... ON CONFLICT DO UPDATE
+    - ostatní dialekty: UPDATE, a když nic nenašel, INSERT
+    """
+    dialekty = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+    if conn.dialect.name in dialekty:
+        stmt = dialekty[conn.dialect.name](table).values(**klic, **hodnoty)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(klic),
+            set_={k: table.c[k] + stmt.excluded[k] for k in hodnoty},
+        )
+        conn.execute(stmt)
+        return
+    podminka = [table.c[k] == v for k, v in klic.items()]
+    vysledek = conn.execute(
+        update(table).where(*podminka).values({k: table.c[k] + v for k, v in hodnoty.items()})
+    )
+    if vysledek.rowcount == 0:
+        conn.execute(insert(table).values(**klic, **hodnoty))
+
+
+def hodnoty_atributu(obj, atributy, stare=False):
+    """Vrátí hodnoty atributů – aktuální, nebo (stare=True) ty před změnou."""
+    stav = inspect(obj)
+    vysledek = {}
+    for a in atributy:
+        historie = stav.attrs[a].history
+        if stare and historie.deleted:
+            vysledek[a] = historie.deleted[0]
+        else:
+            vysledek[a] = getattr(obj, a)
+    return vysledek
+
+
+def zmeneno(obj, atributy):
+    stav = inspect(obj)
+    return any(stav.attrs[a].history.has_changes() for a in atributy)
+
+
+def aktivni_historie(model, atributy):
+    # u sledovaných sloupců chceme znát starou hodnotu i u expirovaného objektu
+    # (active_history=True ji před přepsáním načte)
+    for a in atributy:
+        event.listen(getattr(model, a), "set", lambda *args: None, active_history=True)
+
+
+def zneplatnit_pri_zmene(klic, *modely):
+    """
+    Cache uložená v current_app.extensions[klic] se zahodí po commitu,
+    který zapsal (vložil / změnil / smazal) instanci některého z modelů.
+    """
+    znacka = f"zmeneno:{klic}"
+
+    @event.listens_for(db.session, "after_flush")
+    def _oznacit(session, flush_context):
+        if any(isinstance(o, modely) for o in (*session.new, *session.dirty, *session.deleted)):
+            session.info[znacka] = True
+
+    @event.listens_for(db.session, "after_commit")
+    def _zahodit(session):
+        if session.info.pop(znacka, False) and has_app_context():
+            current_app.extensions.pop(klic, None)
+
+    @event.listens_for(db.session, "after_rollback")
+    def _zrusit(session):
+        session.info.pop(znacka, None)
+
+
+class Delty:
+    """Sčítá přírůstky po klíčích, aby se každý agregační řádek upravil jen jednou."""
+
+    def __init__(self):
+        self.data = defaultdict(lambda: defaultdict(int))
+
+    def pridat(self, model, klic, znamenko=1, **hodnoty):
+        zaznam = self.data[(model, tuple(klic.items()))]
+        for k, v in hodnoty.items():
+            zaznam[k] += znamenko * v
+
+    def zapsat(self, conn):
+        for (model, klic), hodnoty in self.data.items():
+            if any(hodnoty.values()):
+                pricist(conn, model.__table__, dict(klic), dict(hodnoty))
@@ -0,0 +1,127 @@
+# app/events.py
+
+"""
+Log událostí pro obrazovky kuchyně a obsluhy (Server-Sent Events).
+
+- after_flush zapíše pro každou vytvořenou / změněnou / smazanou Objednavku
+  a Rezervaci řádek Udalost – ve stejné transakci, takže je vidět až po commitu
+- na Postgresu se zápis událostí serializuje transakčním advisory zámkem:
+  id_udalost pak přibývají v pořadí commitů a čtenář, který pokračuje
+  od Last-Event-ID, nic nepřeskočí
+- čtení = jeden dotaz id_udalost > :posledni podle PK
+- otevřený stream drží vlákno workeru (gthread) až UDALOSTI_MAX_S; souběžných
+  streamů je v procesu nejvýš UDALOSTI_MAX_STREAMU (zabrat_stream), další
+  obrazovky dostanou jen jeden průchod a retry za UDALOSTI_POLL_S – long-poll,
+  který vlákno hned vrátí a EventSource se podle retry sám znovu připojí
+"""
+
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import delete, event, func, insert, select, text
+
+from .db import db, zmeneno
+from .models import Objednavka, Rezervace, Udalost
+
+# libovolná konstanta – klíč advisory zámku pro zápis událostí
+ZAMEK_UDALOSTI = 320_032
+
+SLEDOVANE = {
+    Objednavka: ("objednavka", "id_objednavky",
+                 ("datum_cas", "stav", "celkova_castka", "id_zakaznika")),
+    Rezervace:  ("rezervace", "id_rezervace",
+                 ("datum_cas", "pocet_osob", "stav_rezervace", "id_zakaznika",
+                  "id_stul", "id_salonek", "id_akce")),
+}
+
+
+def _udalost(obj, akce):
+    nazev, pk, atributy = SLEDOVANE[type(obj)]
+    data = {pk: getattr(obj, pk)}
+    if akce != "smazana":
+        data.update({a: getattr(obj, a) for a in atributy})
+    return {
+        "typ": f"{nazev}.{akce}",
+        "id_entity": data[pk],
+        "data": json.dumps(data, ensure_ascii=False, default=str),
+    }
+
+
+@event.listens_for(db.session, "after_flush")
+def _zapsat_udalosti(session, flush_context):
+    radky = [_udalost(o, "vytvorena") for o in session.new if type(o) in SLEDOVANE]
+    radky += [
+        _udalost(o, "zmenena") for o in session.dirty
+        if type(o) in SLEDOVANE and zmeneno(o, SLEDOVANE[type(o)][2])
+    ]
+    radky += [_udalost(o, "smazana") for o in session.deleted if type(o) in SLEDOVANE]
+    if not radky:
+        return
+    conn = session.connection()
+    if conn.dialect.name == "postgresql":
+        conn.execute(text("SELECT pg_advisory_xact_lock(:k)"), {"k": ZAMEK_UDALOSTI})
+    conn.execute(insert(Udalost), radky)
+
+
+def nacist_udalosti(po_id, limit=500):
+    """Události s id_udalost > po_id (jeden rozsahový dotaz podle PK)."""
+    return db.session.execute(
+        select(Udalost.id_udalost, Udalost.typ, Udalost.data)
+        .where(Udalost.id_udalost > po_id)
+        .order_by(Udalost.id_udalost)
+        .limit(limit)
+    ).all()
+
+
+def posledni_id():
+    return db.session.scalar(select(func.max(Udalost.id_udalost))) or 0
+
+
+def zabrat_stream():
+    """Zabere místo pro dlouhý stream; vrací funkci, která ho uvolní, nebo None (plno)."""
+    sloty = current_app.extensions.get("udalosti_sloty")
+    if sloty is None:
+        # jeden počet na proces; vzniká až při prvním streamu (po forku workeru)
+        sloty = current_app.extensions.setdefault(
+            "udalosti_sloty",
+            threading.BoundedSemaphore(current_app.config.get("UDALOSTI_MAX_STREAMU", 2)),
+        )
+    return sloty.release if sloty.acquire(blocking=False) else None
+
+
+def sse_stream(po_id, interval_s, ping_s, max_s, retry_s=None):
+    """
+    Generátor SSE zpráv. Mezi dotazy vrací spojení do poolu,
+    takže otevřené obrazovky nedrží DB připojení – jen socket.
+    retry_s = za kolik se má prohlížeč po konci streamu znovu připojit.
+    """
+    yield f"retry: {int((retry_s or interval_s) * 1000) or 1000}\n\n"
+    zacatek = posledni_ping = time.monotonic()
+    while True:
+        udalosti = nacist_udalosti(po_id)
+        db.session.close()
+        for u in udalosti:
+            po_id = u.id_udalost
+            yield f"id: {u.id_udalost}\nevent: {u.typ}\ndata: {u.data}\n\n"
+        ted = time.monotonic()
+        if udalosti:
+            posledni_ping = ted
+        elif ted - posledni_ping >= ping_s:
+            posledni_ping = ted
+            yield ": ping\n\n"
+        if ted - zacatek >= max_s:
+            return
+        if not udalosti:
+            time.sleep(interval_s)
+
+
+def smazat_stare_udalosti(dni=7):
+    """Log je jen pro živé obrazovky – starší záznamy lze smazat."""
+    vysledek = db.session.execute(
+        delete(Udalost).where(Udalost.datum < datetime.now() - timedelta(days=dni))
+    )
+    db.session.commit()
+    return vysledek.rowcount
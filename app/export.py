@@ -0,0 +1,192 @@
+# app/export.py
+
+"""
+Účetní export objednávek, položek objednávek a plateb.
+
+- jeden dotaz: UNION ALL (objednávka / položky / platby) seřazený podle id_objednavky
+- čte se přes server-side kurzor (stream_results + yield_per) → konstantní paměť
+- filtr na rozsah data (od včetně, do bez) a navázání přes po_id
+  (poslední už exportované id_objednavky)
+- archivní tabulky (app/archive.py) se čtou jen při od před hranicí archivu
+- výstup NDJSON (jeden objekt = jedna objednávka) nebo CSV (jeden řádek = jeden záznam)
+"""
+
+import csv
+import io
+import json
+from datetime import datetime, time
+from decimal import Decimal
+
+from sqlalchemy import cast, literal, null, select, union_all
+
+from .archive import cte_archiv
+from .db import db
+from .models import (
+    Objednavka, PolozkaObjednavky, Platba,
+    objednavka_archiv, polozka_objednavky_archiv, platba_archiv,
+)
+
+# pořadí sloupců v CSV (a zároveň názvy sloupců dotazu)
+SLOUPCE = [
+    "id_objednavky", "datum_cas", "stav", "celkova_castka", "id_zakaznika",
+    "druh", "id_zaznamu", "id_menu_polozka", "mnozstvi", "castka",
+    "typ_platby", "datum_platby",
+]
+
+# kolik řádků se najednou vytáhne ze server-side kurzoru
+VYCHOZI_DAVKA = 1000
+
+
+def _null(typ):
+    # typovaný NULL, aby UNION ALL prošel i na Postgresu
+    return cast(null(), typ)
+
+
+def _zakladni_sloupce(o, druh, poradi):
+    return (
+        o.c.id_objednavky,
+        o.c.datum_cas,
+        o.c.stav,
+        o.c.celkova_castka,
+        o.c.id_zakaznika,
+        literal(druh).label("druh"),
+        literal(poradi).label("poradi"),
+    )
+
+
+def _filtr(stmt, o, od=None, do=None, po_id=None):
+    if od is not None:
+        stmt = stmt.where(o.c.datum_cas >= datetime.combine(od, time.min))
+    if do is not None:
+        stmt = stmt.where(o.c.datum_cas < datetime.combine(do, time.min))
+    if po_id is not None:
+        stmt = stmt.where(o.c.id_objednavky > po_id)
+    return stmt
+
+
+def _casti(o, p, pl, od, do, po_id):
+    """Tři SELECTy (objednávky / položky / platby) nad jednou sadou tabulek."""
+    objednavky = select(
+        *_zakladni_sloupce(o, "objednavka", 0),
+        _null(db.Integer).label("id_zaznamu"),
+        _null(db.Integer).label("id_menu_polozka"),
+        _null(db.Integer).label("mnozstvi"),
+        _null(db.Numeric(8, 2)).label("castka"),
+        _null(db.String(20)).label("typ_platby"),
+        _null(db.DateTime).label("datum_platby"),
+    )
+    polozky = select(
+        *_zakladni_sloupce(o, "polozka", 1),
+        p.c.id_polozky_obj,
+        p.c.id_menu_polozka,
+        p.c.mnozstvi,
+        p.c.cena,
+        _null(db.String(20)),
+        _null(db.DateTime),
+    ).join(p, p.c.id_objednavky == o.c.id_objednavky)
+    platby = select(
+        *_zakladni_sloupce(o, "platba", 2),
+        pl.c.id_platba,
+        _null(db.Integer),
+        _null(db.Integer),
+        pl.c.castka,
+        pl.c.typ_platby,
+        pl.c.datum,
+    ).join(pl, pl.c.id_objednavky == o.c.id_objednavky)
+    return [_filtr(s, o, od, do, po_id) for s in (objednavky, polozky, platby)]
+
+
+def dotaz_exportu(od=None, do=None, po_id=None):
+    """
+    Sestaví jeden SELECT přes objednávky, jejich položky a platby.
+    Archivní tabulky se přidají jen když `od` sahá před hranici archivu.
+    """
+    casti = _casti(Objednavka.__table__, PolozkaObjednavky.__table__, Platba.__table__,
+                   od, do, po_id)
+    if cte_archiv(od):
+        casti += _casti(objednavka_archiv, polozka_objednavky_archiv, platba_archiv,
+                        od, do, po_id)
+    spojeno = union_all(*casti).subquery("export")
+    return (
+        select(*(spojeno.c[nazev] for nazev in SLOUPCE))
+        .order_by(spojeno.c.id_objednavky, spojeno.c.poradi, spojeno.c.id_zaznamu)
+    )
+
+
+def radky_exportu(od=None, do=None, po_id=None, davka=VYCHOZI_DAVKA):
+    """Generátor řádků exportu čtených po dávkách ze server-side kurzoru."""
+    vysledek = db.session.execute(
+        dotaz_exportu(od, do, po_id),
+        execution_options={"stream_results": True, "yield_per": davka},
+    )
+    try:
+        for radek in vysledek:
+            yield radek._mapping
+    finally:
+        vysledek.close()
+
+
+def _hodnota(v):
+    if isinstance(v, Decimal):
+        return str(v)
+    if isinstance(v, datetime):
+        return v.isoformat()
+    return v
+
+
+def export_ndjson(radky):
+    """
+    Poskládá řádky do jednoho JSON objektu na objednávku.
+    V paměti je vždy jen rozpracovaná objednávka (řádky chodí seřazené).
+    """
+    aktualni = None
+    for r in radky:
+        if aktualni is None or aktualni["id_objednavky"] != r["id_objednavky"]:
+            if aktualni is not None:
+                yield json.dumps(aktualni, ensure_ascii=False) + "\n"
+            aktualni = {
+                "id_objednavky":  r["id_objednavky"],
+                "datum_cas":      _hodnota(r["datum_cas"]),
+                "stav":           r["stav"],
+                "celkova_castka": _hodnota(r["celkova_castka"]),
+                "id_zakaznika":   r["id_zakaznika"],
+                "polozky":        [],
+                "platby":         [],
+            }
+        if r["druh"] == "polozka":
+            aktualni["polozky"].append({
+                "id_polozky_obj":  r["id_zaznamu"],
+                "id_menu_polozka": r["id_menu_polozka"],
+                "mnozstvi":        r["mnozstvi"],
+                "cena":            _hodnota(r["castka"]),
+            })
+        elif r["druh"] == "platba":
+            aktualni["platby"].append({
+                "id_platba":  r["id_zaznamu"],
+                "castka":     _hodnota(r["castka"]),
+                "typ_platby": r["typ_platby"],
+                "datum":      _hodnota(r["datum_platby"]),
+            })
+    if aktualni is not None:
+        yield json.dumps(aktualni, ensure_ascii=False) + "\n"
+
+
+def export_csv(radky):
+    """Plochý CSV – hlavička + jeden řádek na objednávku / položku / platbu."""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(SLOUPCE)
+    for r in radky:
+        writer.writerow([_hodnota(r[s]) for s in SLOUPCE])
+        # řádek hned odešleme a buffer vyprázdníme
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate(0)
+    if buf.tell():
+        yield buf.getvalue()
+
+
+FORMATY = {
+    "ndjson": (export_ndjson, "application/x-ndjson"),
+    "csv":    (export_csv,    "text/csv; charset=utf-8"),
+}
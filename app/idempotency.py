@@ -0,0 +1,138 @@
+# app/idempotency.py
+
+"""
+Idempotentní vytváření záznamů (hlavička Idempotency-Key).
+
+- @idempotentni na POST: první request s daným klíčem se provede a jeho
+  odpověď (status, tělo, hlavičky) se uloží na IDEMPOTENCE_TTL_S; opakování
+  ji jen přehraje (hlavička Idempotent-Replayed: true) – nic se nevytvoří znovu
+- klíč platí pro identitu z JWT + metodu + cestu (dva uživatelé se nepotkají)
+- souběžný duplikát čeká, až první request doběhne (nejvýš IDEMPOTENCE_CEKANI_S,
+  pak 409 s Retry-After); zámek je řádek v tabulce → platí napříč workery
+- stejný klíč s jiným tělem nebo jiným vyjednaným formátem odpovědi (Accept:
+  JSON / msgpack) → 422; výjimka nebo 5xx klíč uvolní (retry smí znovu)
+- zámek opuštěný spadlým workerem převezme další request po IDEMPOTENCE_ZAMEK_S
+- záznamy se zapisují vlastním spojením mimo db.session endpointu
+"""
+
+import hashlib
+import json
+import time
+from datetime import datetime, timedelta
+from functools import wraps
+
+from flask import Response, current_app, g, make_response, request
+from flask_jwt_extended import get_jwt_identity
+from flask_smorest import abort
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+from .db import db
+from .models import IdempotentniPozadavek
+
+HLAVICKA = "Idempotency-Key"
+INTERVAL_S = 0.05
+NEUKLADAT = {"Content-Length", "Set-Cookie"}
+
+_T = IdempotentniPozadavek.__table__
+
+
+def _sha(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _otisk():
+    # uložené tělo je už serializované → vyjednaný formát patří do otisku
+    # (JSON bez přípony – otisky uložené dřív zůstávají platné)
+    pripona = b"|msgpack" if g.get("odpoved_msgpack") else b""
+    return _sha(request.get_data() + pripona)
+
+
+def _odpoved(zaznam):
+    resp = Response(zaznam.telo, status=zaznam.status, headers=json.loads(zaznam.hlavicky or "{}"))
+    resp.headers["Idempotent-Replayed"] = "true"
+    return resp
+
+
+def _zabrat(klic, otisk):
+    """None = klíč patří tomuto requestu; jinak uložená odpověď k přehrání."""
+    config = current_app.config
+    konec = time.monotonic() + config.get("IDEMPOTENCE_CEKANI_S", 10)
+    while True:
+        ted = datetime.now()
+        opusteny = ted - timedelta(seconds=config.get("IDEMPOTENCE_ZAMEK_S", 60))
+        try:
+            with db.engine.begin() as conn:
+                zaznam = conn.execute(select(_T).where(_T.c.klic == klic)).first()
+                volny = (zaznam is None or zaznam.vyprsi < ted
+                         or zaznam.stav == "zpracovava" and zaznam.vytvoreno < opusteny)
+                if volny:
+                    if zaznam is not None:
+                        conn.execute(delete(_T).where(_T.c.klic == klic,
+                                                      _T.c.vytvoreno == zaznam.vytvoreno))
+                    conn.execute(insert(_T).values(
+                        klic=klic, otisk=otisk, stav="zpracovava", vytvoreno=ted,
+                        vyprsi=ted + timedelta(seconds=config.get("IDEMPOTENCE_TTL_S", 86400)),
+                    ))
+                    return None
+        except IntegrityError:      # souběžný request vložil zámek dřív → znovu přečíst
+            continue
+        if zaznam.otisk != otisk:
+            abort(422, message=f"{HLAVICKA} už byl použit s jiným tělem požadavku "
+                               "nebo jiným formátem odpovědi (Accept).")
+        if zaznam.stav == "hotovo":
+            return _odpoved(zaznam)
+        if time.monotonic() > konec:
+            abort(409, message="Požadavek se stejným klíčem se ještě zpracovává.",
+                  headers={"Retry-After": "1"})
+        time.sleep(INTERVAL_S)
+
+
+def _ulozit(klic, resp):
+    hlavicky = {k: v for k, v in resp.headers.items() if k not in NEUKLADAT}
+    with db.engine.begin() as conn:
+        conn.execute(update(_T).where(_T.c.klic == klic).values(
+            stav="hotovo", status=resp.status_code, telo=resp.get_data(),
+            hlavicky=json.dumps(hlavicky),
+        ))
+
+
+def _uvolnit(klic):
+    with db.engine.begin() as conn:
+        conn.execute(delete(_T).where(_T.c.klic == klic, _T.c.stav == "zpracovava"))
+
+
+def idempotentni(fn):
+    """Dekorátor POST metody (pod @jwt_required, nad @arguments / @response)."""
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        hodnota = request.headers.get(HLAVICKA)
+        if not hodnota:
+            return fn(*args, **kwargs)
+        if len(hodnota) > 255:
+            abort(400, message=f"{HLAVICKA} může mít nejvýš 255 znaků.")
+
+        klic = _sha(f"{get_jwt_identity()}|{request.method}|{request.path}|{hodnota}".encode())
+        ulozena = _zabrat(klic, _otisk())
+        if ulozena is not None:
+            return ulozena
+        try:
+            resp = make_response(fn(*args, **kwargs))
+        except BaseException:
+            _uvolnit(klic)
+            raise
+        if resp.status_code >= 500 or resp.is_streamed:
+            _uvolnit(klic)
+        else:
+            _ulozit(klic, resp)
+        return resp
+    return wrapper
+
+
+def vycistit():
+    """Smaže záznamy po TTL (přehrávat se už nebudou)."""
+    vysledek = db.session.execute(
+        delete(IdempotentniPozadavek).where(IdempotentniPozadavek.vyprsi < datetime.now())
+    )
+    db.session.commit()
+    return vysledek.rowcount
@@ -0,0 +1,158 @@
+# app/instrumentation.py
+
+"""
+Měření SQL po requestech (místo SQLALCHEMY_ECHO).
+
+- posluchače before/after_cursor_execute na Engine měří každý dotaz
+  a zapíšou ho do všech aktivních „sběrnic“ (ContextVar – request,
+  pytest hlídač, oboje zároveň)
+- SQL_INSTRUMENTACE=True → hlavičky X-Query-Count a Server-Timing
+- SQL_POMALY_REQUEST_MS > 0 → pomalý request se zaloguje i s dotazy
+  (seskupené podle tvaru, seřazené podle času v DB)
+- hlidat_dotazy(): kontext pro testy – selže při víc než N dotazech
+  nebo když se stejný tvar dotazu opakuje (N+1)
+"""
+
+import re
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from flask import current_app, g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_sbernice = ContextVar("sql_sbernice", default=())
+
+# (?, ?, ?) / (%(p_1)s, %(p_2)s) / ($1, $2) → (…) – rozbalené IN mají pořád stejný tvar
+_SEZNAM_PARAMETRU = re.compile(
+    r"\(\s*(?:\?|%\(\w+\)s|\$\d+)(?:\s*,\s*(?:\?|%\(\w+\)s|\$\d+))*\s*\)"
+)
+
+
+def tvar(statement):
+    return _SEZNAM_PARAMETRU.sub("(…)", " ".join(statement.split()))
+
+
+class Sbernice:
+    def __init__(self):
+        self.dotazy = []          # [(statement, sekundy)]
+
+    @property
+    def pocet(self):
+        return len(self.dotazy)
+
+    @property
+    def cas(self):
+        return sum(t for _, t in self.dotazy)
+
+    def opakovane(self, minimum=2):
+        """Tvary dotazů spuštěné aspoň `minimum`krát → {tvar: počet}."""
+        pocty = Counter(tvar(s) for s, _ in self.dotazy)
+        return {t: n for t, n in pocty.items() if n >= minimum}
+
+    def souhrn(self, limit=10):
+        skupiny = defaultdict(lambda: [0, 0.0])
+        for s, t in self.dotazy:
+            skupina = skupiny[tvar(s)]
+            skupina[0] += 1
+            skupina[1] += t
+        serazene = sorted(skupiny.items(), key=lambda kv: kv[1][1], reverse=True)[:limit]
+        return "\n".join(f"  {n}× {t * 1000:.1f} ms  {s[:300]}" for s, (n, t) in serazene)
+
+
+@contextmanager
+def sbirat():
+    """Po dobu bloku sbírá dotazy (vnořené sbernice dostanou dotaz všechny)."""
+    sbernice = Sbernice()
+    token = _sbernice.set((*_sbernice.get(), sbernice))
+    try:
+        yield sbernice
+    finally:
+        _sbernice.reset(token)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Posluchače enginu (registrují se jednou pro všechny enginy)
+# ──────────────────────────────────────────────────────────────────────────────
+@event.listens_for(Engine, "before_cursor_execute")
+def _zacatek(conn, cursor, statement, parameters, context, executemany):
+    if _sbernice.get():
+        conn.info.setdefault("sql_zacatky", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _konec(conn, cursor, statement, parameters, context, executemany):
+    sbernice = _sbernice.get()
+    zacatky = conn.info.get("sql_zacatky")
+    if not sbernice or not zacatky:
+        return
+    trvani = time.perf_counter() - zacatky.pop()
+    for s in sbernice:
+        s.dotazy.append((statement, trvani))
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Napojení na Flask
+# ──────────────────────────────────────────────────────────────────────────────
+def init_app(app):
+    @app.before_request
+    def _sql_zacatek():
+        config = current_app.config
+        if not (config.get("SQL_INSTRUMENTACE") or config.get("SQL_POMALY_REQUEST_MS")):
+            return
+        g._sql_kontext = sbirat()
+        g._sql = g._sql_kontext.__enter__()
+        g._sql_start = time.perf_counter()
+
+    @app.after_request
+    def _sql_hlavicky(resp):
+        sbernice = g.get("_sql")
+        if sbernice is None:
+            return resp
+        celkem_ms = (time.perf_counter() - g._sql_start) * 1000
+        db_ms = sbernice.cas * 1000
+        pomaly_ms = current_app.config.get("SQL_POMALY_REQUEST_MS")
+        if current_app.config.get("SQL_INSTRUMENTACE"):
+            resp.headers["X-Query-Count"] = str(sbernice.pocet)
+            # hlavičky musí být latin-1 → desc bez diakritiky
+            resp.headers["Server-Timing"] = (
+                f'db;dur={db_ms:.1f};desc="{sbernice.pocet} SQL", app;dur={celkem_ms:.1f}'
+            )
+        if pomaly_ms and celkem_ms >= pomaly_ms:
+            current_app.logger.warning(
+                "Pomalý request %s %s → %s: %.0f ms, %d dotazů (%.0f ms v DB)\n%s",
+                request.method, request.path, resp.status_code, celkem_ms,
+                sbernice.pocet, db_ms, sbernice.souhrn(),
+            )
+        return resp
+
+    @app.teardown_request
+    def _sql_konec(exc):
+        kontext = g.pop("_sql_kontext", None)
+        if kontext is not None:
+            kontext.__exit__(None, None, None)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Pomocník pro testy
+# ──────────────────────────────────────────────────────────────────────────────
+@contextmanager
+def hlidat_dotazy(max_dotazu=None, max_opakovani=None):
+    """
+    with hlidat_dotazy(max_dotazu=3, max_opakovani=1):
+        client.get("/api/menu")
+
+    max_opakovani = kolikrát smí běžet stejný tvar dotazu (1 = žádné N+1).
+    """
+    with sbirat() as sbernice:
+        yield sbernice
+    chyby = []
+    if max_dotazu is not None and sbernice.pocet > max_dotazu:
+        chyby.append(f"{sbernice.pocet} dotazů (povoleno {max_dotazu})")
+    if max_opakovani is not None:
+        for t, n in sbernice.opakovane(max_opakovani + 1).items():
+            chyby.append(f"{n}× stejný dotaz (povoleno {max_opakovani}): {t[:200]}")
+    if chyby:
+        raise AssertionError("; ".join(chyby) + "\n" + sbernice.souhrn())
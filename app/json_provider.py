@@ -0,0 +1,94 @@
+# app/json_provider.py
+
+"""
+Rychlejší JSON provider pro odpovědi API (orjson).
+
+- response() vrací bajtově stejný výstup jako Flask DefaultJSONProvider:
+  seřazené klíče, kompaktní mimo debug / odsazení 2 v debug, české znaky
+  neescapované (ensure_ascii=False); dumps() je vždy kompaktní (bez mezer)
+- Decimal, date, datetime, UUID, dataclass a __html__ se převádí stejně jako
+  dosud: datetime/date orjson nechá projít (OPT_PASSTHROUGH_DATETIME)
+  a zpracuje je Flaskový default → RFC 822, Decimal → str
+- volání s vlastními kwargs (cls, separators, …) a ensure_ascii=True
+  padají zpět na stdlib json
+- orjson je volitelný: bez něj se chová přesně jako výchozí provider
+- výběr přes config JSON_PROVIDER = "orjson" | "default"
+- MessagePack: když odpovědní vrstva (app/api/negotiation.py) nastaví
+  g.odpoved_msgpack, response() zabalí výstup schématu rovnou do msgpack –
+  žádné JSON mezi tím; převody (Decimal → str, datetime → RFC 822) jsou
+  stejné jako u JSON přes default()
+"""
+
+from flask import g, has_request_context
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover – orjson je volitelná závislost
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover – volitelná závislost
+    msgpack = None
+
+MSGPACK_MIMETYPE = "application/msgpack"
+
+
+class MsgpackMixin:
+    def _msgpack(self, args, kwargs):
+        """Odpověď v msgpack, pokud si ho request vyjednal (g.odpoved_msgpack), jinak None."""
+        if msgpack is None or not has_request_context() or not g.get("odpoved_msgpack"):
+            return None
+        obj = self._prepare_response_obj(args, kwargs)
+        data = msgpack.packb(obj, default=self.default, use_bin_type=True)
+        return self._app.response_class(data, mimetype=MSGPACK_MIMETYPE)
+
+
+class JsonProvider(MsgpackMixin, DefaultJSONProvider):
+    """Výchozí Flask provider + vyjednaný msgpack."""
+
+    def response(self, *args, **kwargs):
+        return self._msgpack(args, kwargs) or super().response(*args, **kwargs)
+
+
+class OrjsonProvider(MsgpackMixin, DefaultJSONProvider):
+    ensure_ascii = False
+
+    def _volby(self, odsadit=False):
+        volby = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            volby |= orjson.OPT_SORT_KEYS
+        if odsadit:
+            volby |= orjson.OPT_INDENT_2
+        return volby
+
+    def _lze(self, kwargs):
+        return orjson is not None and not kwargs and not self.ensure_ascii
+
+    def dumps(self, obj, **kwargs):
+        if not self._lze(kwargs):
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._volby()).decode()
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        odpoved = self._msgpack(args, kwargs)
+        if odpoved is not None:
+            return odpoved
+        if not self._lze({}):
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        odsadit = (self.compact is None and self._app.debug) or self.compact is False
+        data = orjson.dumps(obj, default=self.default, option=self._volby(odsadit)) + b"\n"
+        return self._app.response_class(data, mimetype=self.mimetype)
+
+
+JSON_PROVIDERY = {
+    "default": JsonProvider,
+    "orjson":  OrjsonProvider,
+}
@@ -0,0 +1,158 @@
+# app/loyalty.py
+
+"""
+Věrnostní body – kniha pohybů (BodovyPohyb) + průběžný stav VernostniUcet.body.
+
+- zápis Platba → after_flush dopočítá, kolik bodů má platba mít, porovná s už
+  připsanými pohyby a rozdíl zapíše jako nový pohyb (platba / storno)
+- stav účtu se mění jen atomicky: UPDATE vernostni_ucet SET body = body + :n
+  (žádné read-modify-write, souběžné požadavky se neztratí); zvedá i verzi účtu (ETag)
+- prepocitat_body(): jedním UPDATE přestaví všechny účty z knihy pohybů
+- pripsat_body_hromadne(): promo akce jedním INSERT … SELECT + jedním UPDATE
+"""
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, func, insert, literal, select, update
+from sqlalchemy.orm.util import identity_key
+
+from .db import db, zmeneno, aktivni_historie
+from .models import BodovyPohyb, Objednavka, Platba, Role, VernostniUcet, user_roles
+
+PLATBA_ATTRS = ("castka", "id_objednavky")
+
+aktivni_historie(Platba, PLATBA_ATTRS)
+
+
+def _kc_za_bod():
+    if has_app_context():
+        return current_app.config.get("VERNOST_KC_ZA_BOD", 10)
+    return 10
+
+
+def body_za_castku(castka):
+    """Kolik bodů náleží za zaplacenou částku (za každých celých N Kč jeden bod)."""
+    if castka is None or castka <= 0:
+        return 0
+    return int(castka // _kc_za_bod())
+
+
+def pripsat(conn, id_ucet, body, duvod, popis=None, id_platba=None):
+    """Zapíše pohyb do knihy a atomicky upraví stav účtu."""
+    if not body:
+        return
+    conn.execute(insert(BodovyPohyb).values(
+        id_ucet=id_ucet, body=body, duvod=duvod, popis=popis, id_platba=id_platba
+    ))
+    conn.execute(
+        update(VernostniUcet)
+        .where(VernostniUcet.id_ucet == id_ucet)
+        .values(body=VernostniUcet.body + body, verze=VernostniUcet.verze + 1)
+    )
+
+
+def _ucet_objednavky(conn, id_objednavky):
+    return conn.scalar(
+        select(VernostniUcet.id_ucet)
+        .join(Objednavka, Objednavka.id_zakaznika == VernostniUcet.id_zakaznika)
+        .where(Objednavka.id_objednavky == id_objednavky)
+    )
+
+
+def _srovnat_platbu(conn, id_platba, id_objednavky, castka, nova=False):
+    """Dorovná pohyby platby na cílový stav (0 u smazané platby), vrátí dotčené účty."""
+    cil_ucet = _ucet_objednavky(conn, id_objednavky) if id_objednavky else None
+    cil_body = body_za_castku(castka) if cil_ucet else 0
+
+    pripsano = {}
+    if not nova:
+        pripsano = dict(conn.execute(
+            select(BodovyPohyb.id_ucet, func.sum(BodovyPohyb.body))
+            .where(BodovyPohyb.id_platba == id_platba)
+            .group_by(BodovyPohyb.id_ucet)
+        ).all())
+
+    # body připsané jinému účtu (platba přesunuta k jiné objednávce) vrátíme
+    for id_ucet, body in pripsano.items():
+        if id_ucet != cil_ucet:
+            pripsat(conn, id_ucet, -body, "storno", id_platba=id_platba)
+    if cil_ucet:
+        rozdil = cil_body - pripsano.get(cil_ucet, 0)
+        pripsat(conn, cil_ucet, rozdil, "platba" if rozdil > 0 else "storno",
+                id_platba=id_platba)
+    return {*pripsano, cil_ucet} - {None}
+
+
+@event.listens_for(db.session, "after_flush")
+def _body_za_platby(session, flush_context):
+    conn = session.connection()
+    ucty = session.info.setdefault("vernost_ucty", set())
+    for obj in session.new:
+        if isinstance(obj, Platba):
+            ucty |= _srovnat_platbu(conn, obj.id_platba, obj.id_objednavky, obj.castka, nova=True)
+        elif isinstance(obj, VernostniUcet) and obj.body:
+            # počáteční stav založeného účtu musí být i v knize pohybů
+            conn.execute(insert(BodovyPohyb).values(
+                id_ucet=obj.id_ucet, body=obj.body, duvod="pocatecni_stav"
+            ))
+    for obj in session.dirty:
+        if isinstance(obj, Platba) and zmeneno(obj, PLATBA_ATTRS):
+            ucty |= _srovnat_platbu(conn, obj.id_platba, obj.id_objednavky, obj.castka)
+    for obj in session.deleted:
+        if isinstance(obj, Platba):
+            ucty |= _srovnat_platbu(conn, obj.id_platba, None, None)
+
+
+@event.listens_for(db.session, "after_flush_postexec")
+def _expirovat_ucty(session, flush_context):
+    # stav a verzi změnil UPDATE mimo ORM – načtený účet by jinak hlásil starou verzi
+    for id_ucet in session.info.pop("vernost_ucty", ()):
+        obj = session.identity_map.get(identity_key(VernostniUcet, id_ucet))
+        if obj is not None:
+            session.expire(obj, ["body", "verze"])
+
+
+@event.listens_for(db.session, "after_rollback")
+def _zahodit_ucty(session):
+    session.info.pop("vernost_ucty", None)
+
+
+def prepocitat_body():
+    """Jedním UPDATE nastaví body všech účtů na součet jejich pohybů."""
+    soucet = (
+        select(func.coalesce(func.sum(BodovyPohyb.body), 0))
+        .where(BodovyPohyb.id_ucet == VernostniUcet.id_ucet)
+        .scalar_subquery()
+    )
+    vysledek = db.session.execute(
+        update(VernostniUcet).values(body=soucet, verze=VernostniUcet.verze + 1))
+    db.session.commit()
+    return vysledek.rowcount
+
+
+def pripsat_body_hromadne(body, popis=None, role=None):
+    """
+    Promo akce: připíše body všem účtům (volitelně jen zákazníkům s rolí)
+    jedním INSERT … SELECT do knihy a jedním UPDATE stavů.
+    """
+    ucty = select(VernostniUcet.id_ucet)
+    if role:
+        ucty = (
+            ucty.join(user_roles, user_roles.c.zakaznik_id == VernostniUcet.id_zakaznika)
+            .join(Role, Role.id_role == user_roles.c.role_id)
+            .where(Role.name == role)
+        )
+    ucty = ucty.scalar_subquery()
+
+    db.session.execute(insert(BodovyPohyb).from_select(
+        ["id_ucet", "body", "duvod", "popis", "datum"],
+        select(VernostniUcet.id_ucet, literal(body), literal("promo"), literal(popis),
+               func.current_timestamp())
+        .where(VernostniUcet.id_ucet.in_(ucty))
+    ))
+    vysledek = db.session.execute(
+        update(VernostniUcet)
+        .where(VernostniUcet.id_ucet.in_(ucty))
+        .values(body=VernostniUcet.body + body, verze=VernostniUcet.verze + 1)
+    )
+    db.session.commit()
+    return vysledek.rowcount
@@ -0,0 +1,156 @@
+# app/metrics.py
+
+"""
+Metriky pro Prometheus (GET /metrics, textový formát).
+
+- latence (histogram) a počty odpovědí podle routy (šablona URL, ne konkrétní
+  cesta → omezený počet štítků), metody a stavu
+- pokusy o přihlášení podle výsledku, doba kontroly blocklistu JWT
+- requesty odmítnuté rate limitem / odlehčením (app/ratelimit.py)
+- DB pool: vypůjčená a otevřená spojení (posluchače checkout/checkin/connect/close)
+- víc workerů gunicornu: proměnná PROMETHEUS_MULTIPROC_DIR musí být nastavená
+  před importem prometheus_client (viz README); každý worker pak zapisuje do
+  souborů v adresáři a /metrics je při scrapu sečte za všechny workery;
+  po skončení workeru je nutné zavolat ukoncit_worker(pid)
+- prometheus_client je volitelný – bez něj jsou všechny funkce no-op
+  a /metrics vrací 503
+"""
+
+import os
+import time
+from contextlib import nullcontext
+
+from flask import Response, current_app, g, request
+from sqlalchemy import event
+
+from .db import db
+
+try:
+    import prometheus_client
+    from prometheus_client import multiprocess
+except ImportError:  # pragma: no cover – volitelná závislost
+    prometheus_client = None
+
+LATENCE_BUCKETY = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+if prometheus_client is not None:
+    LATENCE = prometheus_client.Histogram(
+        "http_request_duration_seconds", "Doba vyřízení requestu",
+        ["method", "route"], buckets=LATENCE_BUCKETY,
+    )
+    ODPOVEDI = prometheus_client.Counter(
+        "http_responses_total", "Počet odpovědí", ["method", "route", "status"],
+    )
+    PRIHLASENI = prometheus_client.Counter(
+        "auth_login_attempts_total", "Pokusy o přihlášení", ["result"],
+    )
+    ODMITNUTO = prometheus_client.Counter(
+        "http_rejected_total", "Requesty odmítnuté limitem nebo při přetížení", ["reason"],
+    )
+    BLOCKLIST = prometheus_client.Histogram(
+        "auth_blocklist_check_seconds", "Doba kontroly JWT v blocklistu",
+        buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1),
+    )
+    # livesum = součet přes běžící workery (mrtvé se nepočítají)
+    POOL_VYPUJCENO = prometheus_client.Gauge(
+        "db_pool_checked_out", "Spojení právě vypůjčená z poolu",
+        multiprocess_mode="livesum",
+    )
+    POOL_OTEVRENO = prometheus_client.Gauge(
+        "db_pool_connections", "Otevřená DB spojení",
+        multiprocess_mode="livesum",
+    )
+
+
+def zapnuto():
+    return prometheus_client is not None and current_app.config.get("METRIKY", True)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Zápis metrik (volají endpointy / create_app)
+# ──────────────────────────────────────────────────────────────────────────────
+def prihlaseni(vysledek):
+    """vysledek: "ok" | "neplatne_udaje" | "pretizeni"."""
+    if zapnuto():
+        PRIHLASENI.labels(vysledek).inc()
+
+
+def odmitnuti(duvod):
+    """duvod: "limit_ip" | "limit_identita" | "soubezne" | "fronta" | "db_pool"."""
+    if zapnuto():
+        ODMITNUTO.labels(duvod).inc()
+
+
+def kontrola_blocklistu():
+    """with kontrola_blocklistu(): … – změří dobu dotazu na blocklist."""
+    return BLOCKLIST.time() if zapnuto() else nullcontext()
+
+
+def _sledovat_pool(engine):
+    @event.listens_for(engine.pool, "connect")
+    def _pripojeno(dbapi_conn, zaznam):
+        POOL_OTEVRENO.inc()
+
+    @event.listens_for(engine.pool, "close")
+    def _zavreno(dbapi_conn, zaznam):
+        POOL_OTEVRENO.dec()
+
+    @event.listens_for(engine.pool, "close_detached")
+    def _zavreno_odpojene(dbapi_conn):
+        POOL_OTEVRENO.dec()
+
+    @event.listens_for(engine.pool, "checkout")
+    def _vypujceno(dbapi_conn, zaznam, proxy):
+        POOL_VYPUJCENO.inc()
+
+    @event.listens_for(engine.pool, "checkin")
+    def _vraceno(dbapi_conn, zaznam):
+        POOL_VYPUJCENO.dec()
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Napojení na Flask
+# ──────────────────────────────────────────────────────────────────────────────
+def _registr():
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        # registr jen pro tento scrape – sečte soubory všech workerů
+        registr = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registr)
+        return registr
+    return prometheus_client.REGISTRY
+
+
+def metriky_view():
+    if not zapnuto():
+        return {"message": "Metriky nejsou k dispozici (chybí prometheus_client)."}, 503
+    return Response(prometheus_client.generate_latest(_registr()),
+                    mimetype=prometheus_client.CONTENT_TYPE_LATEST)
+
+
+def init_app(app):
+    app.add_url_rule("/metrics", "metriky", metriky_view)
+    if prometheus_client is None or not app.config.get("METRIKY", True):
+        return
+
+    with app.app_context():
+        _sledovat_pool(db.engine)
+
+    @app.before_request
+    def _metriky_start():
+        g._metriky_start = time.perf_counter()
+
+    @app.after_request
+    def _metriky_konec(resp):
+        start = g.pop("_metriky_start", None)
+        if start is None or request.endpoint in ("metriky", "pripravenost"):
+            return resp
+        routa = request.url_rule.rule if request.url_rule else "<nenalezeno>"
+        LATENCE.labels(request.method, routa).observe(time.perf_counter() - start)
+        ODPOVEDI.labels(request.method, routa, str(resp.status_code)).inc()
+        return resp
+
+
+def ukoncit_worker(pid):
+    """gunicorn child_exit: odstraní živé gauge ukončeného workeru."""
+    if prometheus_client is not None and os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(pid)
@@ -1,11 +1,14 @@
 # app/models.py
 
 from .db import db                                    # db = SQLAlchemy instance
-from sqlalchemy import CheckConstraint                 # pro kontrolu podmínek na úrovni DB
-from werkzeug.security import generate_password_hash, check_password_hash  
-                                                      # pro hashování a ověřování hesel
+from sqlalchemy import CheckConstraint, column         # pro kontrolu podmínek na úrovni DB
+from sqlalchemy.orm import declared_attr                # mapper args v mixinu
+from . import passwords                               # pro hashování a ověřování hesel
 from datetime import datetime                         # pro časové razítko blacklistu
 
+# stavy objednávky, které ještě nejsou vyřízené (částečný index ix_objednavka_otevrene)
+OTEVRENE_STAVY = ("nová", "otevřená")
+
 # ──────────────────────────────────────────────────────────────────────────────
 # PARAMETRY:
 # - nullable=False → sloupec je NOT NULL (musíte zadat hodnotu)
@@ -14,6 +17,21 @@ from datetime import datetime                         # pro časové razítko bl
 # - lazy="dynamic" → vztah vrací Query objekt, data se načtou teprve při volání .all(), .filter() apod.
 # ──────────────────────────────────────────────────────────────────────────────
 
+# ——— optimistické zamykání ————————————————————————————————
+class Verzovany:
+    """
+    Mixin pro entity upravované přes PUT (ETag / If-Match, app/api/etag.py):
+    - verze roste při každém ORM UPDATE (version_id_col)
+    - UPDATE … WHERE pk = :id AND verze = :nactena → souběžná změna vyvolá
+      StaleDataError místo tichého přepsání; žádné zámky řádků
+    """
+    verze = db.Column(db.Integer, nullable=False, default=1, server_default="1")
+
+    @declared_attr.directive
+    def __mapper_args__(cls):
+        return {"version_id_col": cls.__table__.c.verze}
+
+
 # ——— spojka Zakaznik ↔ Role —————————————————————————————
 user_roles = db.Table(
     "user_roles",
@@ -21,10 +39,12 @@ user_roles = db.Table(
               db.ForeignKey("zakaznik.id_zakaznika"), primary_key=True),
     db.Column("role_id",     db.Integer,
               db.ForeignKey("role.id_role"),           primary_key=True),
+    # PK (zakaznik_id, role_id) obslouží jen hledání podle zákazníka
+    db.Index("ix_user_roles_role_id", "role_id"),
 )
 
 
-class Zakaznik(db.Model):
+class Zakaznik(Verzovany, db.Model):
     """
     Zákazník:
     - při vytvoření musíte zadat jmeno, prijmeni, email a password
@@ -73,19 +93,20 @@ class Zakaznik(db.Model):
 
     @password.setter
     def password(self, raw_password: str):
-        # vytvoří hash z raw_password a uloží ho do _password
-        self._password = generate_password_hash(raw_password)
+        # vytvoří hash z raw_password (metoda z HESLA_METODA) a uloží ho do _password
+        self._password = passwords.hashovat(raw_password)
 
     def check_password(self, raw_password: str) -> bool:
         # porovná raw_password s uloženým hashem
-        return check_password_hash(self._password, raw_password)
+        return passwords.overit(self._password, raw_password)
 
 
-class VernostniUcet(db.Model):
+class VernostniUcet(Verzovany, db.Model):
     """
     Věrnostní účet:
     - vytvoří se automaticky při přidání Zakaznik (v routes.py)
-    - body   (int, default 0)
+    - body   (int, default 0) – průběžný stav; pravdou je kniha pohybů BodovyPohyb
+      (mění se jen atomickým UPDATE body = body + :n, viz app/loyalty.py)
     - datum_zalozeni (date, NOT NULL)
     - vztah 1:1 zpět na Zakaznik
     """
@@ -96,16 +117,42 @@ class VernostniUcet(db.Model):
     id_zakaznika   = db.Column(
         db.Integer,
         db.ForeignKey("zakaznik.id_zakaznika", ondelete="CASCADE"),
-        nullable=False
+        nullable=False,
+        index=True
     )
 
     zakaznik = db.relationship("Zakaznik", back_populates="ucet")
+    pohyby   = db.relationship("BodovyPohyb", back_populates="ucet", lazy="dynamic",
+                               cascade="all, delete-orphan")
 
     def __repr__(self):
         return f"<VernostniUcet {self.id_ucet} body={self.body}>"
 
 
-class Rezervace(db.Model):
+class BodovyPohyb(db.Model):
+    """
+    BodovyPohyb (kniha věrnostních bodů):
+    - body (kladné i záporné), duvod, datum povinné
+    - duvod: "platba", "storno", "pocatecni_stav", "uprava", "promo"
+    - id_platba jen odkaz (bez FK) – pohyb zůstane i po smazání platby
+    """
+    __tablename__ = "bodovy_pohyb"
+    id_pohyb  = db.Column(db.Integer, primary_key=True)
+    id_ucet   = db.Column(db.Integer, db.ForeignKey("vernostni_ucet.id_ucet", ondelete="CASCADE"),
+                          nullable=False, index=True)
+    body      = db.Column(db.Integer, nullable=False)
+    duvod     = db.Column(db.String(20), nullable=False)
+    popis     = db.Column(db.Text, nullable=True)
+    id_platba = db.Column(db.Integer, nullable=True, index=True)
+    datum     = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    ucet = db.relationship("VernostniUcet", back_populates="pohyby")
+
+    def __repr__(self):
+        return f"<BodovyPohyb {self.id_pohyb} {self.body:+d} {self.duvod}>"
+
+
+class Rezervace(Verzovany, db.Model):
     __tablename__ = "rezervace"
     __table_args__ = (
         CheckConstraint(
@@ -114,14 +161,14 @@ class Rezervace(db.Model):
         ),
     )
     id_rezervace   = db.Column(db.Integer, primary_key=True)
-    datum_cas      = db.Column(db.DateTime, nullable=False)
+    datum_cas      = db.Column(db.DateTime, nullable=False, index=True)   # rozsahové dotazy plánovače připomínek
     pocet_osob     = db.Column(db.Integer,  nullable=False)
     stav_rezervace = db.Column(db.String(20), nullable=False, default="čekající")
     sleva          = db.Column(db.Numeric(5, 2), nullable=True)
-    id_zakaznika   = db.Column(db.Integer, db.ForeignKey("zakaznik.id_zakaznika", ondelete="CASCADE"), nullable=False)
-    id_stul        = db.Column(db.Integer, db.ForeignKey("stul.id_stul"),      nullable=True)
-    id_salonek     = db.Column(db.Integer, db.ForeignKey("salonek.id_salonek"), nullable=True)
-    id_akce        = db.Column(db.Integer, db.ForeignKey("podnikova_akce.id_akce"), nullable=True)
+    id_zakaznika   = db.Column(db.Integer, db.ForeignKey("zakaznik.id_zakaznika", ondelete="CASCADE"), nullable=False, index=True)
+    id_stul        = db.Column(db.Integer, db.ForeignKey("stul.id_stul"),      nullable=True, index=True)
+    id_salonek     = db.Column(db.Integer, db.ForeignKey("salonek.id_salonek"), nullable=True, index=True)
+    id_akce        = db.Column(db.Integer, db.ForeignKey("podnikova_akce.id_akce"), nullable=True, index=True)
 
     zakaznik   = db.relationship("Zakaznik", back_populates="rezervace")
     stul       = db.relationship("Stul",      back_populates="rezervace")
@@ -133,7 +180,7 @@ class Rezervace(db.Model):
         return f"<Rezervace {self.id_rezervace} {self.datum_cas}>"
 
 
-class Stul(db.Model):
+class Stul(Verzovany, db.Model):
     """
     Stůl:
     - cislo, kapacita jsou povinné
@@ -152,7 +199,7 @@ class Stul(db.Model):
         return f"<Stul {self.cislo} cap={self.kapacita}>"
 
 
-class Salonek(db.Model):
+class Salonek(Verzovany, db.Model):
     """
     Salónek:
     - nazev, kapacita povinné; popis volitelný
@@ -171,14 +218,14 @@ class Salonek(db.Model):
         return f"<Salonek {self.nazev} cap={self.kapacita}>"
 
 
-class PodnikovaAkce(db.Model):
+class PodnikovaAkce(Verzovany, db.Model):
     __tablename__ = "podnikova_akce"
     id_akce    = db.Column(db.Integer, primary_key=True)
     nazev      = db.Column(db.String(100), nullable=False)
     popis      = db.Column(db.Text,           nullable=True)
     datum      = db.Column(db.Date,           nullable=False)
     cas        = db.Column(db.Time,           nullable=False)
-    id_salonek = db.Column(db.Integer, db.ForeignKey("salonek.id_salonek"), nullable=False)
+    id_salonek = db.Column(db.Integer, db.ForeignKey("salonek.id_salonek"), nullable=False, index=True)
 
     salonek   = db.relationship("Salonek",   back_populates="akce")
     rezervace = db.relationship("Rezervace", back_populates="akce", lazy="dynamic")
@@ -187,21 +234,28 @@ class PodnikovaAkce(db.Model):
         return f"<PodnikovaAkce {self.nazev} {self.datum}>"
 
 
-class Objednavka(db.Model):
+class Objednavka(Verzovany, db.Model):
     """
     Objednavka:
     - datum_cas, id_zakaznika povinné; stav, celkova_castka volitelné
     - vztahy: PolozkaObjednavky, Platba, Hodnoceni, Notifikace
     """
     __tablename__ = "objednavka"
+    __table_args__ = (
+        # částečný index: otevřených objednávek je zlomek, kuchyň a obsluha čtou jen je
+        db.Index("ix_objednavka_otevrene", "datum_cas",
+                 postgresql_where=column("stav").in_(OTEVRENE_STAVY),
+                 sqlite_where=column("stav").in_(OTEVRENE_STAVY)),
+    )
     id_objednavky  = db.Column(db.Integer, primary_key=True)
-    datum_cas      = db.Column(db.DateTime, nullable=False)
-    stav           = db.Column(db.String(20), nullable=True)
+    datum_cas      = db.Column(db.DateTime, nullable=False, index=True)
+    stav           = db.Column(db.String(20), nullable=True, index=True)
     celkova_castka = db.Column(db.Numeric(8, 2), nullable=True)
     id_zakaznika   = db.Column(
         db.Integer,
         db.ForeignKey("zakaznik.id_zakaznika", ondelete="CASCADE"),
-        nullable=False
+        nullable=False,
+        index=True
     )
 
     zakaznik   = db.relationship("Zakaznik", back_populates="objednavky")
@@ -214,7 +268,7 @@ class Objednavka(db.Model):
         return f"<Objednavka {self.id_objednavky}>"
 
 
-class PolozkaObjednavky(db.Model):
+class PolozkaObjednavky(Verzovany, db.Model):
     """
     PolozkaObjednavky:
     - mnozstvi, cena, id_objednavky, id_menu_polozka povinné
@@ -223,8 +277,8 @@ class PolozkaObjednavky(db.Model):
     id_polozky_obj  = db.Column(db.Integer, primary_key=True)
     mnozstvi        = db.Column(db.Integer, nullable=False)
     cena            = db.Column(db.Numeric(8, 2), nullable=False)
-    id_objednavky   = db.Column(db.Integer, db.ForeignKey("objednavka.id_objednavky"), nullable=False)
-    id_menu_polozka = db.Column(db.Integer, db.ForeignKey("polozka_menu.id_menu_polozka"), nullable=False)
+    id_objednavky   = db.Column(db.Integer, db.ForeignKey("objednavka.id_objednavky"), nullable=False, index=True)
+    id_menu_polozka = db.Column(db.Integer, db.ForeignKey("polozka_menu.id_menu_polozka"), nullable=False, index=True)
 
     objednavka   = db.relationship("Objednavka",        back_populates="polozky")
     menu_polozka = db.relationship("PolozkaMenu",        back_populates="objednavky")
@@ -233,7 +287,7 @@ class PolozkaObjednavky(db.Model):
         return f"<PolozkaObjednavky {self.id_polozky_obj} qty={self.mnozstvi}>"
 
 
-class Platba(db.Model):
+class Platba(Verzovany, db.Model):
     """
     Platba:
     - castka, typ_platby, datum, id_objednavky povinné
@@ -242,8 +296,8 @@ class Platba(db.Model):
     id_platba     = db.Column(db.Integer, primary_key=True)
     castka        = db.Column(db.Numeric(8, 2), nullable=False)
     typ_platby    = db.Column(db.String(20),    nullable=False)
-    datum         = db.Column(db.DateTime,      nullable=False)
-    id_objednavky = db.Column(db.Integer, db.ForeignKey("objednavka.id_objednavky"), nullable=False)
+    datum         = db.Column(db.DateTime,      nullable=False, index=True)
+    id_objednavky = db.Column(db.Integer, db.ForeignKey("objednavka.id_objednavky"), nullable=False, index=True)
 
     objednavka = db.relationship("Objednavka", back_populates="platby")
 
@@ -251,7 +305,7 @@ class Platba(db.Model):
         return f"<Platba {self.id_platba} amt={self.castka}>"
 
 
-class Hodnoceni(db.Model):
+class Hodnoceni(Verzovany, db.Model):
     """
     Hodnoceni:
     - hodnoceni, datum, id_objednavky, id_zakaznika povinné; komentar volitelný
@@ -261,8 +315,8 @@ class Hodnoceni(db.Model):
     hodnoceni      = db.Column(db.SmallInteger, nullable=False)
     komentar       = db.Column(db.Text,           nullable=True)
     datum          = db.Column(db.DateTime,       nullable=False)
-    id_objednavky  = db.Column(db.Integer, db.ForeignKey("objednavka.id_objednavky"), nullable=False)
-    id_zakaznika   = db.Column(db.Integer, db.ForeignKey("zakaznik.id_zakaznika", ondelete="CASCADE"), nullable=False)
+    id_objednavky  = db.Column(db.Integer, db.ForeignKey("objednavka.id_objednavky"), nullable=False, index=True)
+    id_zakaznika   = db.Column(db.Integer, db.ForeignKey("zakaznik.id_zakaznika", ondelete="CASCADE"), nullable=False, index=True)
 
     objednavka = db.relationship("Objednavka", back_populates="hodnoceni")
     zakaznik   = db.relationship("Zakaznik",    back_populates="hodnoceni")
@@ -271,16 +325,24 @@ class Hodnoceni(db.Model):
         return f"<Hodnoceni {self.id_hodnoceni} score={self.hodnoceni}>"
 
 
-class PolozkaMenu(db.Model):
+class PolozkaMenu(Verzovany, db.Model):
     __tablename__ = "polozka_menu"
+    __table_args__ = (
+        # trigramový index pro hledání bez diakritiky (app/search.py); mimo Postgres běžný index
+        db.Index("ix_polozka_menu_hledani_trgm", "hledani",
+                 postgresql_using="gin", postgresql_ops={"hledani": "gin_trgm_ops"}),
+    )
 
     id_menu_polozka = db.Column(db.Integer, primary_key=True)
-    nazev           = db.Column(db.String(100), nullable=False)
+    nazev           = db.Column(db.String(100), nullable=False, index=True)
     popis           = db.Column(db.Text,           nullable=True)
     cena            = db.Column(db.Numeric(8, 2),  nullable=False)
     obrazek_url     = db.Column(db.String,         nullable=True)
     kategorie       = db.Column(db.String(20),     nullable=False)  # 'týdenní' nebo 'víkendové'
     den             = db.Column(db.String(10),     nullable=False)  # 'Pondělí' … 'Neděle'
+    hledani         = db.Column(db.Text,           nullable=True)   # nazev + popis bez diakritiky (app/search.py)
+    alergeny_maska  = db.Column(db.BigInteger,     nullable=False, default=0, server_default="0")
+                                                   # bit 1 << (id_alergenu - 1) za každou vazbu (app/allergens.py)
 
     objednavky = db.relationship(
         "PolozkaObjednavky",
@@ -297,6 +359,14 @@ class PolozkaMenu(db.Model):
         back_populates="menu_polozka",
         lazy="dynamic",
     )
+    # předpočítaná statistika hodnocení (viz app/ratings.py)
+    statistika_hodnoceni = db.relationship(
+        "HodnoceniStatistika",
+        primaryjoin="foreign(HodnoceniStatistika.id_menu_polozka) == PolozkaMenu.id_menu_polozka",
+        uselist=False,
+        viewonly=True,
+        lazy="selectin",
+    )
 
     def __repr__(self):
         return f"<PolozkaMenu {self.nazev}>"
@@ -305,7 +375,7 @@ class PolozkaMenu(db.Model):
 class PolozkaMenuAlergen(db.Model):
     __tablename__ = "polozka_menu_alergen"
     id_menu_polozka = db.Column(db.Integer, db.ForeignKey("polozka_menu.id_menu_polozka"), primary_key=True)
-    id_alergenu     = db.Column(db.Integer, db.ForeignKey("alergen.id_alergenu"),           primary_key=True)
+    id_alergenu     = db.Column(db.Integer, db.ForeignKey("alergen.id_alergenu"),           primary_key=True, index=True)
 
     menu_polozka = db.relationship("PolozkaMenu", back_populates="alergeny")
     alergen      = db.relationship("Alergen",      back_populates="polozky")
@@ -315,7 +385,7 @@ class PolozkaMenuAlergen(db.Model):
 
 
 
-class JidelniPlan(db.Model):
+class JidelniPlan(Verzovany, db.Model):
     """
     JidelniPlan:
     - nazev, platny_od povinné; platny_do volitelné
@@ -333,17 +403,17 @@ class JidelniPlan(db.Model):
         return f"<JidelniPlan {self.nazev}>"
 
 
-class PolozkaJidelnihoPlanu(db.Model):
+class PolozkaJidelnihoPlanu(Verzovany, db.Model):
     """
     PolozkaJidelnihoPlanu:
     - den, poradi, id_plan, id_menu_polozka povinné
     """
     __tablename__ = "polozka_jidelniho_planu"
     id_polozka_jid_pl = db.Column(db.Integer, primary_key=True)
-    den               = db.Column(db.Date,    nullable=False)
+    den               = db.Column(db.Date,    nullable=False, index=True)
     poradi            = db.Column(db.Integer, nullable=False)
-    id_plan           = db.Column(db.Integer, db.ForeignKey("jidelni_plan.id_plan"),            nullable=False)
-    id_menu_polozka   = db.Column(db.Integer, db.ForeignKey("polozka_menu.id_menu_polozka"),     nullable=False)
+    id_plan           = db.Column(db.Integer, db.ForeignKey("jidelni_plan.id_plan"),            nullable=False, index=True)
+    id_menu_polozka   = db.Column(db.Integer, db.ForeignKey("polozka_menu.id_menu_polozka"),     nullable=False, index=True)
 
     plan         = db.relationship("JidelniPlan", back_populates="polozky")
     menu_polozka = db.relationship("PolozkaMenu", back_populates="plany")
@@ -352,7 +422,7 @@ class PolozkaJidelnihoPlanu(db.Model):
         return f"<PolozkaJidelnihoPlanu {self.id_polozka_jid_pl}>"
 
 
-class Alergen(db.Model):
+class Alergen(Verzovany, db.Model):
     __tablename__ = "alergen"
     id_alergenu = db.Column(db.Integer, primary_key=True)
     nazev       = db.Column(db.String(100), nullable=False)
@@ -368,19 +438,30 @@ class Alergen(db.Model):
     def __repr__(self):
         return f"<Alergen {self.nazev}>"
 
-class Notifikace(db.Model):
+class Notifikace(Verzovany, db.Model):
     """
-    Notifikace:
+    Notifikace (zároveň fronta k odeslání – outbox, viz app/outbox.py):
     - typ, datum_cas povinné; text, id_rezervace, id_objednavky volitelné
+    - stav: cekajici → odesilani → odeslano | chyba
+    - pokusy, dalsi_pokus (kdy zkusit znovu / do kdy drží zámek worker),
+      odeslano (čas doručení), chyba (poslední chybová hláška)
     - vztahy: Rezervace, Objednavka
     """
     __tablename__    = "notifikace"
+    __table_args__   = (
+        db.Index("ix_notifikace_fronta", "stav", "dalsi_pokus"),
+    )
     id_notifikace    = db.Column(db.Integer, primary_key=True)
     typ              = db.Column(db.String(20), nullable=False)
     datum_cas        = db.Column(db.DateTime, nullable=False)
     text             = db.Column(db.Text,     nullable=True)
-    id_rezervace     = db.Column(db.Integer,  db.ForeignKey("rezervace.id_rezervace"), nullable=True)
-    id_objednavky    = db.Column(db.Integer,  db.ForeignKey("objednavka.id_objednavky"), nullable=True)
+    id_rezervace     = db.Column(db.Integer,  db.ForeignKey("rezervace.id_rezervace"), nullable=True, index=True)
+    id_objednavky    = db.Column(db.Integer,  db.ForeignKey("objednavka.id_objednavky"), nullable=True, index=True)
+    stav             = db.Column(db.String(20), nullable=False, default="cekajici", server_default="cekajici")
+    pokusy           = db.Column(db.Integer,  nullable=False, default=0, server_default="0")
+    dalsi_pokus      = db.Column(db.DateTime, nullable=True)
+    odeslano         = db.Column(db.DateTime, nullable=True)
+    chyba            = db.Column(db.Text,     nullable=True)
 
     rezervace   = db.relationship("Rezervace",   back_populates="notifikace")
     objednavka  = db.relationship("Objednavka",  back_populates="notifikace")
@@ -416,3 +497,170 @@ class TokenBlacklist(db.Model):
     id          = db.Column(db.Integer, primary_key=True)
     jti         = db.Column(db.String(36), unique=True, nullable=False)
     created_at  = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# AGREGACE PRO REPORTY (udržované inkrementálně v app/reporting.py)
+# ──────────────────────────────────────────────────────────────────────────────
+
+class DenniTrzba(db.Model):
+    """
+    DenniTrzba:
+    - den (PK)
+    - trzba, pocet_plateb   – z Platba podle Platba.datum
+    - pocet_objednavek      – z Objednavka podle Objednavka.datum_cas
+    """
+    __tablename__    = "agregace_denni_trzba"
+    den              = db.Column(db.Date, primary_key=True)
+    trzba            = db.Column(db.Numeric(12, 2), nullable=False, default=0)
+    pocet_plateb     = db.Column(db.Integer, nullable=False, default=0)
+    pocet_objednavek = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<DenniTrzba {self.den} {self.trzba}>"
+
+
+class DenniProdejPolozky(db.Model):
+    """
+    DenniProdejPolozky:
+    - (den, id_menu_polozka) PK – den podle Objednavka.datum_cas
+    - mnozstvi = součet PolozkaObjednavky.mnozstvi, trzba = součet cena * mnozstvi
+    """
+    __tablename__   = "agregace_prodej_polozky"
+    den             = db.Column(db.Date, primary_key=True)
+    id_menu_polozka = db.Column(db.Integer, primary_key=True)
+    mnozstvi        = db.Column(db.Integer, nullable=False, default=0)
+    trzba           = db.Column(db.Numeric(12, 2), nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<DenniProdejPolozky {self.den} {self.id_menu_polozka} qty={self.mnozstvi}>"
+
+
+class DenniMixPlateb(db.Model):
+    """
+    DenniMixPlateb:
+    - (den, typ_platby) PK – den podle Platba.datum
+    - pocet, castka
+    """
+    __tablename__ = "agregace_mix_plateb"
+    den           = db.Column(db.Date, primary_key=True)
+    typ_platby    = db.Column(db.String(20), primary_key=True)
+    pocet         = db.Column(db.Integer, nullable=False, default=0)
+    castka        = db.Column(db.Numeric(12, 2), nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<DenniMixPlateb {self.den} {self.typ_platby}>"
+
+
+class HodnoceniStatistika(db.Model):
+    """
+    HodnoceniStatistika (udržovaná inkrementálně v app/ratings.py):
+    - id_menu_polozka (PK) – 0 = všechna hodnocení dohromady
+    - pocet, soucet, h1 … h5 (histogram hodnot 1–5)
+    - hodnocení objednávky se započítá každé (různé) položce menu v objednávce
+    """
+    __tablename__   = "hodnoceni_statistika"
+    id_menu_polozka = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    pocet           = db.Column(db.Integer, nullable=False, default=0)
+    soucet          = db.Column(db.Integer, nullable=False, default=0)
+    h1              = db.Column(db.Integer, nullable=False, default=0)
+    h2              = db.Column(db.Integer, nullable=False, default=0)
+    h3              = db.Column(db.Integer, nullable=False, default=0)
+    h4              = db.Column(db.Integer, nullable=False, default=0)
+    h5              = db.Column(db.Integer, nullable=False, default=0)
+
+    @property
+    def prumer(self):
+        return round(self.soucet / self.pocet, 2) if self.pocet else None
+
+    @property
+    def rozlozeni(self):
+        return {str(i): getattr(self, f"h{i}") for i in range(1, 6)}
+
+    def __repr__(self):
+        return f"<HodnoceniStatistika {self.id_menu_polozka} n={self.pocet}>"
+
+
+class PlanovacZnacka(db.Model):
+    """
+    PlanovacZnacka – high-water mark plánovačů (app/reminders.py):
+    - nazev (PK), např. "pripominka_24h"
+    - hodnota = do kdy (čas odeslání) už jsou notifikace vytvořené
+    """
+    __tablename__ = "planovac_znacka"
+    nazev   = db.Column(db.String(50), primary_key=True)
+    hodnota = db.Column(db.DateTime,   nullable=False)
+
+    def __repr__(self):
+        return f"<PlanovacZnacka {self.nazev} {self.hodnota}>"
+
+
+class Udalost(db.Model):
+    """
+    Udalost – append-only log změn objednávek a rezervací (app/events.py):
+    - id_udalost roste v pořadí commitů → slouží jako SSE id / Last-Event-ID
+    - typ ("objednavka.vytvorena", "rezervace.zmenena", …), id_entity
+    - data = JSON se stručným stavem entity (ne celé vnořené vztahy)
+    """
+    __tablename__ = "udalost"
+    id_udalost = db.Column(db.Integer,    primary_key=True)
+    typ        = db.Column(db.String(40), nullable=False)
+    id_entity  = db.Column(db.Integer,    nullable=False)
+    data       = db.Column(db.Text,       nullable=False)
+    datum      = db.Column(db.DateTime,   nullable=False, default=datetime.now, index=True)
+
+    def __repr__(self):
+        return f"<Udalost {self.id_udalost} {self.typ}>"
+
+
+class IdempotentniPozadavek(db.Model):
+    """
+    IdempotentniPozadavek – uložená odpověď na POST s hlavičkou Idempotency-Key
+    (app/idempotency.py):
+    - klic = sha256(identita | metoda | cesta | Idempotency-Key)
+    - otisk = sha256 těla requestu (stejný klíč s jiným tělem → 422)
+    - stav "zpracovava" drží první request, ostatní čekají; "hotovo" = odpověď uložená
+    - po čase vyprsi se záznam ignoruje a promaže (flask idempotence-cisteni)
+    """
+    __tablename__ = "idempotentni_pozadavek"
+    klic      = db.Column(db.String(64),  primary_key=True)
+    otisk     = db.Column(db.String(64),  nullable=False)
+    stav      = db.Column(db.String(12),  nullable=False, default="zpracovava")
+    status    = db.Column(db.Integer,     nullable=True)
+    telo      = db.Column(db.LargeBinary, nullable=True)
+    hlavicky  = db.Column(db.Text,        nullable=True)    # JSON {název: hodnota}
+    vytvoreno = db.Column(db.DateTime,    nullable=False, default=datetime.now)
+    vyprsi    = db.Column(db.DateTime,    nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<IdempotentniPozadavek {self.klic[:12]} {self.stav}>"
+
+
+# ——— archiv starých objednávek, plateb a notifikací (app/archive.py) —————————
+def _archivni_tabulka(model, sloupec_casu, *navic):
+    """
+    Kopie sloupců provozní tabulky bez cizích klíčů, indexů a výchozích hodnot.
+    Na Postgresu je tabulka rozdělená po měsících (RANGE podle sloupce času),
+    proto je čas součástí PK; měsíční oddíly zakládá archivace.
+    """
+    sloupce = [
+        db.Column(c.name, c.type, nullable=c.nullable,
+                  primary_key=c.primary_key or c.name == sloupec_casu, autoincrement=False)
+        for c in model.__table__.columns
+    ]
+    return db.Table(f"{model.__tablename__}_archiv", *sloupce, *navic,
+                    postgresql_partition_by=f"RANGE ({sloupec_casu})")
+
+
+objednavka_archiv         = _archivni_tabulka(Objednavka, "datum_cas")
+# položka nemá vlastní čas → nese datum_cas své objednávky (klíč rozdělení)
+polozka_objednavky_archiv = _archivni_tabulka(
+    PolozkaObjednavky, "datum_cas",
+    db.Column("datum_cas", db.DateTime, primary_key=True),
+    db.Index("ix_polozka_objednavky_archiv_id_objednavky", "id_objednavky"),
+)
+platba_archiv             = _archivni_tabulka(
+    Platba, "datum",
+    db.Index("ix_platba_archiv_id_objednavky", "id_objednavky"),
+)
+notifikace_archiv         = _archivni_tabulka(Notifikace, "datum_cas")
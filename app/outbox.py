@@ -0,0 +1,291 @@
+# app/outbox.py
+
+"""
+Outbox notifikací – doručování mimo request.
+
+- nová Rezervace / Objednavka → before_flush přidá Notifikace (stav "cekajici")
+  do téže transakce; request tedy nic neodesílá a nic nečeká
+- worker (flask outbox-worker) zabírá dávky přes SELECT … FOR UPDATE SKIP LOCKED
+  (víc workerů se nepřekrývá), zprávy odesílá paralelně v ThreadPoolExecutoru
+  a výsledek zapíše jedním hromadným UPDATE podle PK
+- neúspěch → další pokus s exponenciálním odstupem, po OUTBOX_MAX_POKUSU
+  (nebo u trvalé chyby hned) stav "chyba"
+- zabraná dávka má zámek do dalsi_pokus; spadne-li worker, převezme ji jiný
+  (zabrání se počítá jako pokus, výsledek se zapíše jen s platným zámkem)
+- transporty jsou zásuvné: TRANSPORTY[nazev] = třída s metodou odeslat(zprava)
+"""
+
+import json
+import logging
+import os
+import random
+import smtplib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+
+from flask import current_app
+from sqlalchemy import bindparam, event, func, or_, select, update
+
+from .db import db
+from .models import Notifikace, Rezervace, Objednavka, Zakaznik
+
+log = logging.getLogger(__name__)
+
+CEKAJICI, ODESILANI, ODESLANO, CHYBA = "cekajici", "odesilani", "odeslano", "chyba"
+
+
+class TrvalaChyba(Exception):
+    """Chyba, kterou opakování nespraví (chybí příjemce, neznámý typ…)."""
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Zařazení do fronty – ve stejné transakci jako rezervace / objednávka
+# ──────────────────────────────────────────────────────────────────────────────
+def _cas(hodnota):
+    return hodnota.strftime("%d.%m.%Y %H:%M") if isinstance(hodnota, datetime) else str(hodnota)
+
+
+@event.listens_for(db.session, "before_flush")
+def _zaradit_notifikace(session, flush_context, instances):
+    for obj in list(session.new):
+        if isinstance(obj, Rezervace):
+            session.add(Notifikace(
+                typ="email", datum_cas=datetime.now(), rezervace=obj,
+                text=f"Rezervace na {_cas(obj.datum_cas)} pro {obj.pocet_osob} os. byla přijata."
+            ))
+        elif isinstance(obj, Objednavka):
+            session.add(Notifikace(
+                typ="email", datum_cas=datetime.now(), objednavka=obj,
+                text="Vaše objednávka byla přijata."
+            ))
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Transporty
+# ──────────────────────────────────────────────────────────────────────────────
+class SouborovyTransport:
+    """Lokální náhrada: každou zprávu připíše jako JSON řádek do OUTBOX_SOUBOR."""
+
+    def __init__(self, config):
+        self.cesta = config["OUTBOX_SOUBOR"]
+        self._zamek = threading.Lock()
+
+    def odeslat(self, zprava):
+        radek = json.dumps(zprava, ensure_ascii=False, default=str)
+        with self._zamek:
+            os.makedirs(os.path.dirname(os.path.abspath(self.cesta)), exist_ok=True)
+            with open(self.cesta, "a", encoding="utf-8") as f:
+                f.write(radek + "\n")
+
+
+class SmtpTransport:
+    """E-mail přes SMTP (lokálně ladicí server: python -m aiosmtpd -n -l localhost:1025)."""
+
+    def __init__(self, config):
+        self.host = config["OUTBOX_SMTP_HOST"]
+        self.port = config["OUTBOX_SMTP_PORT"]
+        self.odesilatel = config["OUTBOX_ODESILATEL"]
+
+    def odeslat(self, zprava):
+        msg = EmailMessage()
+        msg["Subject"] = "Restaurace – oznámení"
+        msg["From"] = self.odesilatel
+        msg["To"] = zprava["prijemce"]
+        msg.set_content(zprava["text"] or "")
+        with smtplib.SMTP(self.host, self.port, timeout=10) as smtp:
+            smtp.send_message(msg)
+
+
+class LogTransport:
+    """Zprávu jen zaloguje (vývoj, suché běhy)."""
+
+    def __init__(self, config):
+        pass
+
+    def odeslat(self, zprava):
+        log.info("notifikace %(id_notifikace)s [%(typ)s] → %(prijemce)s: %(text)s", zprava)
+
+
+TRANSPORTY = {
+    "soubor": SouborovyTransport,
+    "smtp":   SmtpTransport,
+    "log":    LogTransport,
+}
+
+
+def vytvorit_transporty(config):
+    """typ notifikace → instance transportu podle OUTBOX_TRANSPORTY."""
+    return {typ: TRANSPORTY[nazev](config) for typ, nazev in config["OUTBOX_TRANSPORTY"].items()}
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Worker
+# ──────────────────────────────────────────────────────────────────────────────
+def _prijemce(typ, email, telefon, id_zakaznika):
+    if typ == "email":
+        return email
+    if typ == "sms":
+        return telefon
+    if typ == "push":
+        return f"zakaznik:{id_zakaznika}" if id_zakaznika else "vsichni"
+    return None
+
+
+def zabrat_davku(limit, zamek_s, max_pokusu=None):
+    """
+    Zabere až `limit` zpráv k odeslání a vrátí je jako slovníky.
+    SKIP LOCKED přeskočí řádky, které právě zabírá jiný worker
+    (na SQLite se FOR UPDATE ignoruje – tam běží jeden worker).
+
+    Zabrání se počítá jako pokus (pokusy + 1) a zámek (dalsi_pokus) slouží
+    zároveň jako značka zabrání pro zapsat_vysledky. Zpráva, jejíž zámek
+    vypršel po posledním povoleném pokusu (worker spadl uprostřed odesílání),
+    se už znovu nezabere a skončí ve stavu "chyba".
+    """
+    ted = datetime.now()
+    zamek = ted + timedelta(seconds=zamek_s)
+    ids = db.session.scalars(
+        select(Notifikace.id_notifikace)
+        .where(Notifikace.stav.in_((CEKAJICI, ODESILANI)))
+        .where(or_(Notifikace.dalsi_pokus.is_(None), Notifikace.dalsi_pokus <= ted))
+        .order_by(Notifikace.id_notifikace)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    ).all()
+    if not ids:
+        db.session.commit()
+        return []
+
+    if max_pokusu is not None:
+        db.session.execute(
+            update(Notifikace)
+            .where(Notifikace.id_notifikace.in_(ids))
+            .where(Notifikace.stav == ODESILANI, Notifikace.pokusy >= max_pokusu)
+            .values(stav=CHYBA, dalsi_pokus=None, verze=Notifikace.verze + 1,
+                    chyba="Odesílání nedokončeno (vypršel zámek workeru)."),
+            execution_options={"synchronize_session": False},
+        )
+    db.session.execute(
+        update(Notifikace)
+        .where(Notifikace.id_notifikace.in_(ids))
+        .where(Notifikace.stav.in_((CEKAJICI, ODESILANI)))
+        .values(stav=ODESILANI, pokusy=Notifikace.pokusy + 1, dalsi_pokus=zamek,
+                verze=Notifikace.verze + 1),
+        execution_options={"synchronize_session": False},
+    )
+    radky = db.session.execute(
+        select(Notifikace.id_notifikace, Notifikace.typ, Notifikace.text, Notifikace.pokusy,
+               Zakaznik.email, Zakaznik.telefon, Zakaznik.id_zakaznika)
+        .outerjoin(Rezervace, Rezervace.id_rezervace == Notifikace.id_rezervace)
+        .outerjoin(Objednavka, Objednavka.id_objednavky == Notifikace.id_objednavky)
+        .outerjoin(Zakaznik, Zakaznik.id_zakaznika == func.coalesce(
+            Rezervace.id_zakaznika, Objednavka.id_zakaznika))
+        .where(Notifikace.id_notifikace.in_(ids))
+        .where(Notifikace.stav == ODESILANI, Notifikace.dalsi_pokus == zamek)
+        .order_by(Notifikace.id_notifikace)
+    ).all()
+    db.session.commit()
+    return [
+        {"id_notifikace": r.id_notifikace, "typ": r.typ, "text": r.text, "pokusy": r.pokusy,
+         "zamek": zamek, "prijemce": _prijemce(r.typ, r.email, r.telefon, r.id_zakaznika)}
+        for r in radky
+    ]
+
+
+_INTERNI = ("pokusy", "zamek")
+
+
+def _odeslat(transporty, zprava):
+    """Běží ve vlákně poolu – nesahá na DB, jen vrací chybu (nebo None)."""
+    try:
+        transport = transporty.get(zprava["typ"])
+        if transport is None:
+            raise TrvalaChyba(f"Pro typ '{zprava['typ']}' není nastaven transport.")
+        if not zprava["prijemce"]:
+            raise TrvalaChyba("Notifikace nemá příjemce.")
+        transport.odeslat({k: v for k, v in zprava.items() if k not in _INTERNI})
+        return None
+    except Exception as e:  # noqa: BLE001 – každá chyba se zapíše ke zprávě
+        return e
+
+
+def odstup(pokusy, zaklad_s):
+    """Exponenciální odstup s rozptylem, aby se opakování nesešla najednou."""
+    zpozdeni = min(zaklad_s * 2 ** (pokusy - 1), 3600)
+    return timedelta(seconds=zpozdeni * random.uniform(0.5, 1.0))
+
+
+_ZAPSAT_VYSLEDEK = (
+    update(Notifikace.__table__)
+    .where(Notifikace.__table__.c.id_notifikace == bindparam("b_id"))
+    # jen dokud zprávu drží tento worker – po převzetí jiným se výsledek zahodí
+    .where(Notifikace.__table__.c.stav == ODESILANI)
+    .where(Notifikace.__table__.c.dalsi_pokus == bindparam("b_zamek"))
+    .values(stav=bindparam("b_stav"), pokusy=bindparam("b_pokusy"),
+            odeslano=bindparam("b_odeslano"), dalsi_pokus=bindparam("b_dalsi_pokus"),
+            chyba=bindparam("b_chyba"),
+            verze=Notifikace.__table__.c.verze + 1)   # ETag: worker změnil záznam
+)
+
+
+def zapsat_vysledky(vysledky, max_pokusu, zaklad_s):
+    """
+    Výsledky dávky jedním hromadným UPDATE podle PK (executemany).
+    Pokus už započítalo zabrání; řádky, jejichž zámek mezitím vypršel
+    a zprávu převzal jiný worker, UPDATE nezasáhne.
+    """
+    ted = datetime.now()
+    zmeny = []
+    for zprava, chyba in vysledky:
+        pokusy = zprava["pokusy"]
+        zmena = {"b_id": zprava["id_notifikace"], "b_zamek": zprava["zamek"],
+                 "b_pokusy": pokusy, "b_odeslano": None,
+                 "b_dalsi_pokus": None, "b_chyba": None if chyba is None else str(chyba)}
+        if chyba is None:
+            zmena.update(b_stav=ODESLANO, b_odeslano=ted)
+        elif isinstance(chyba, TrvalaChyba) or pokusy >= max_pokusu:
+            zmena.update(b_stav=CHYBA)
+        else:
+            zmena.update(b_stav=CEKAJICI, b_dalsi_pokus=ted + odstup(pokusy, zaklad_s))
+        zmeny.append(zmena)
+    if zmeny:
+        vysledek = db.session.execute(_ZAPSAT_VYSLEDEK, zmeny)
+        if (db.session.get_bind().dialect.supports_sane_multi_rowcount
+                and vysledek.rowcount < len(zmeny)):
+            log.warning("outbox: %d výsledků zahozeno – zámek převzal jiný worker",
+                        len(zmeny) - vysledek.rowcount)
+    db.session.commit()
+
+
+def zpracovat_davku(pool, transporty, config):
+    """Zabrat → odeslat paralelně → zapsat. Vrací počet zpracovaných zpráv."""
+    zpravy = zabrat_davku(config["OUTBOX_DAVKA"], config["OUTBOX_ZAMEK_S"],
+                          config["OUTBOX_MAX_POKUSU"])
+    if not zpravy:
+        return 0
+    chyby = pool.map(lambda z: _odeslat(transporty, z), zpravy)
+    zapsat_vysledky(list(zip(zpravy, chyby)), config["OUTBOX_MAX_POKUSU"], config["OUTBOX_BACKOFF_S"])
+    return len(zpravy)
+
+
+def spustit_worker(vlakna=None, interval=2.0, vyprazdnit=False, stop=None):
+    """
+    Smyčka workeru (v aplikačním kontextu).
+    vyprazdnit=True → skončí, jakmile není co odeslat (cron, testy).
+    stop = threading.Event pro řízené ukončení (SIGTERM).
+    """
+    config = current_app.config
+    transporty = vytvorit_transporty(config)
+    stop = stop or threading.Event()
+    celkem = 0
+    with ThreadPoolExecutor(max_workers=vlakna or config["OUTBOX_VLAKNA"]) as pool:
+        while not stop.is_set():
+            pocet = zpracovat_davku(pool, transporty, config)
+            celkem += pocet
+            if pocet == 0:
+                if vyprazdnit:
+                    break
+                stop.wait(interval)
+    return celkem
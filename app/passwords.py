@@ -0,0 +1,90 @@
+# app/passwords.py
+
+"""
+Hashování a ověřování hesel.
+
+- algoritmus a cena z konfigurace HESLA_METODA (formát werkzeug, např.
+  "scrypt:32768:8:1" nebo "pbkdf2:sha256:600000")
+- uložený hash s jinou metodou / cenou se po úspěšném přihlášení přepočítá
+  (potreba_prehashovat) – změna HESLA_METODA se tak projeví postupně
+- ověření (v_poolu) běží v omezeném poolu vláken (HESLA_VLAKNA, výchozí
+  polovina GUNICORN_THREADS): hashlib při výpočtu pouští GIL, takže vlákna
+  počítají paralelně; přihlášení nad VLAKNA + FRONTA (výchozí fronta 0)
+  dostane po HESLA_CEKANI_S (výchozí 50 ms) 503 – nával přihlášení tak
+  nezabere všechna vlákna workeru a zbytek API odpovídá dál
+- paměť: scrypt:32768:8 si na jeden hash vezme ~32 MiB (128 × N × r bajtů),
+  pool tak zároveň omezuje špičku RAM workeru na HESLA_VLAKNA × 32 MiB
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from flask import current_app, has_app_context
+from werkzeug.security import check_password_hash, generate_password_hash
+
+VYCHOZI_METODA = "scrypt"
+
+
+class PretizeniHesel(Exception):
+    """Fronta na ověření hesla je plná – volající má vrátit 503."""
+
+
+def _metoda():
+    if has_app_context():
+        return current_app.config.get("HESLA_METODA", VYCHOZI_METODA)
+    return VYCHOZI_METODA
+
+
+@lru_cache(maxsize=8)
+def _uplna_metoda(metoda):
+    # "scrypt" → "scrypt:32768:8:1" (doplní výchozí parametry werkzeug)
+    return generate_password_hash("", metoda).split("$", 1)[0]
+
+
+def metoda():
+    """Metoda z konfigurace – vlákna poolu nemají app context, předává se jim."""
+    return _metoda()
+
+
+def hashovat(heslo, metoda=None):
+    return generate_password_hash(heslo, metoda or _metoda())
+
+
+def overit(ulozeny_hash, heslo):
+    return bool(ulozeny_hash) and check_password_hash(ulozeny_hash, heslo)
+
+
+def potreba_prehashovat(ulozeny_hash):
+    return ulozeny_hash.split("$", 1)[0] != _uplna_metoda(_metoda())
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Pool pro ověřování
+# ──────────────────────────────────────────────────────────────────────────────
+class _Pool:
+    def __init__(self, vlakna, fronta):
+        self.executor = ThreadPoolExecutor(max_workers=vlakna, thread_name_prefix="hesla")
+        self.mista = threading.BoundedSemaphore(vlakna + fronta)
+
+
+def _pool():
+    # jeden pool na proces; vzniká až při prvním přihlášení (po forku workeru)
+    pool = current_app.extensions.get("hesla_pool")
+    if pool is None:
+        config = current_app.config
+        pool = current_app.extensions.setdefault(
+            "hesla_pool", _Pool(config.get("HESLA_VLAKNA", 2), config.get("HESLA_FRONTA", 0)),
+        )
+    return pool
+
+
+def v_poolu(funkce, *args):
+    """v_poolu(overit, hash, heslo) – spustí výpočet v omezeném poolu; při zahlcení PretizeniHesel."""
+    pool = _pool()
+    if not pool.mista.acquire(timeout=current_app.config.get("HESLA_CEKANI_S", 0.05)):
+        raise PretizeniHesel()
+    try:
+        return pool.executor.submit(funkce, *args).result()
+    finally:
+        pool.mista.release()
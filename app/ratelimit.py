@@ -0,0 +1,242 @@
+# app/ratelimit.py
+
+"""
+Omezení počtu requestů (token bucket) a odlehčení při přetížení.
+
+- limity podle JWT identity a podle IP, konfigurace RATE_LIMITY:
+  klíč = endpoint ("auth.LoginResource"), blueprint ("api") nebo "*";
+  platí nejkonkrétnější pravidlo, hodnota {"ip": "10/60", "identita": "120/60"}
+  = kapacita / za kolik sekund se celá doplní
+- identita se bere jen z platného tokenu (podpis + expirace, bez dotazu
+  na blocklist – ten udělá až endpoint); anonymní requesty omezuje jen IP
+- IP = request.remote_addr; za load balancerem ji z X-Forwarded-For doplní
+  ProxyFix podle PROXY_POCET (app/__init__.py), jinak mají všichni jednu IP
+- počítadla v paměti workeru; RATE_LIMIT_BACKEND="redis://…" je sdílí mezi
+  workery (atomický Lua skript, při výpadku Redisu se padá zpět do paměti)
+- odlehčení (503 ještě před endpointem): moc souběžných requestů ve workeru,
+  request čekal ve frontě proxy déle než ZATEZ_MAX_FRONTA_MS (hlavička
+  X-Request-Start), DB pool vyčerpaný nad ZATEZ_POOL_PODIL
+- překročení limitu → 429, odlehčení → 503; obojí s Retry-After
+"""
+
+import math
+import threading
+import time
+
+from flask import current_app, g, request
+from flask_jwt_extended import decode_token
+from flask_smorest import abort
+
+from . import metrics
+from .db import db
+
+try:
+    import redis
+except ImportError:  # pragma: no cover – volitelná závislost
+    redis = None
+
+VYJIMKY = {"metriky", "pripravenost", "static"}
+MAX_KLICU = 100_000
+
+
+def parsovat_limit(text):
+    """"10/60" → (kapacita 10, doplnění tokenů za sekundu)."""
+    pocet, sekund = text.split("/")
+    return int(pocet), int(pocet) / float(sekund)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Backendy: vzit(klíč, kapacita, rychlost) → (povoleno, zbývá, za kolik s další)
+# ──────────────────────────────────────────────────────────────────────────────
+class PametovyBackend:
+    def __init__(self):
+        self.kbeliky = {}        # klíč → [tokeny, čas poslední změny]
+        self.zamek = threading.Lock()
+
+    def vzit(self, klic, kapacita, rychlost, ted=None):
+        ted = time.monotonic() if ted is None else ted
+        with self.zamek:
+            kbelik = self.kbeliky.get(klic)
+            if kbelik is None:
+                if len(self.kbeliky) >= MAX_KLICU:
+                    self._uklidit(ted)
+                kbelik = self.kbeliky[klic] = [kapacita, ted]
+            tokeny = min(kapacita, kbelik[0] + (ted - kbelik[1]) * rychlost)
+            povoleno = tokeny >= 1
+            if povoleno:
+                tokeny -= 1
+            kbelik[0], kbelik[1] = tokeny, ted
+        return povoleno, tokeny, 0 if povoleno else (1 - tokeny) / rychlost
+
+    def _uklidit(self, ted):
+        # kbeliky, které by už byly plné, nic nenesou → smazat
+        for klic, (tokeny, kdy) in list(self.kbeliky.items()):
+            if ted - kdy > 3600 or tokeny >= 1 and ted - kdy > 60:
+                del self.kbeliky[klic]
+
+
+_LUA = """
+local kapacita = tonumber(ARGV[1])
+local rychlost = tonumber(ARGV[2])
+local ted = tonumber(ARGV[3])
+local stav = redis.call('HMGET', KEYS[1], 't', 'ts')
+local tokeny = tonumber(stav[1]) or kapacita
+local kdy = tonumber(stav[2]) or ted
+tokeny = math.min(kapacita, tokeny + math.max(0, ted - kdy) * rychlost)
+local povoleno = 0
+if tokeny >= 1 then
+    tokeny = tokeny - 1
+    povoleno = 1
+end
+redis.call('HSET', KEYS[1], 't', tostring(tokeny), 'ts', tostring(ted))
+redis.call('EXPIRE', KEYS[1], math.ceil(kapacita / rychlost) + 1)
+return {povoleno, tostring(tokeny)}
+"""
+
+
+class RedisBackend:
+    def __init__(self, url):
+        self.klient = redis.Redis.from_url(url)
+        self.skript = self.klient.register_script(_LUA)
+        self.zaloha = PametovyBackend()
+
+    def vzit(self, klic, kapacita, rychlost):
+        try:
+            povoleno, tokeny = self.skript(keys=[f"rl:{klic}"], args=[kapacita, rychlost, time.time()])
+        except redis.RedisError:
+            current_app.logger.warning("Rate limit: Redis nedostupný, počítá se v paměti workeru.")
+            return self.zaloha.vzit(klic, kapacita, rychlost)
+        tokeny = float(tokeny)
+        return bool(povoleno), tokeny, 0 if povoleno else (1 - tokeny) / rychlost
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Stav workeru
+# ──────────────────────────────────────────────────────────────────────────────
+class _Stav:
+    def __init__(self, backend):
+        self.backend = backend
+        self.aktivni = 0
+        self.zamek = threading.Lock()
+
+
+def _vytvorit_backend(url):
+    if url and url.startswith(("redis://", "rediss://", "unix://")):
+        if redis is None:
+            raise RuntimeError("RATE_LIMIT_BACKEND vyžaduje balíček redis.")
+        return RedisBackend(url)
+    return PametovyBackend()
+
+
+def _stav():
+    return current_app.extensions["ratelimit"]
+
+
+def pravidlo():
+    """Nejkonkrétnější pravidlo pro aktuální request → (název, {druh: limit})."""
+    limity = current_app.config.get("RATE_LIMITY", {})
+    for nazev in (request.endpoint, request.blueprint, "*"):
+        if nazev in limity:
+            return nazev, limity[nazev]
+    return None, {}
+
+
+def _identita():
+    hlavicka = request.headers.get("Authorization", "")
+    if not hlavicka.startswith("Bearer "):
+        return None
+    try:
+        return decode_token(hlavicka[7:])[current_app.config.get("JWT_IDENTITY_CLAIM", "sub")]
+    except Exception:       # neplatný / prošlý token – endpoint vrátí 401 sám
+        return None
+
+
+def _cas_ve_fronte_ms():
+    # X-Request-Start: "t=1718000000.123" (nginx $msec) nebo ms / µs od epochy
+    hodnota = request.headers.get("X-Request-Start", "").removeprefix("t=")
+    try:
+        zacatek = float(hodnota)
+    except ValueError:
+        return None
+    if zacatek > 1e14:
+        zacatek /= 1e6
+    elif zacatek > 1e11:
+        zacatek /= 1e3
+    return (time.time() - zacatek) * 1000
+
+
+def _pool_vycerpan(podil):
+    pool = db.engine.pool
+    if not hasattr(pool, "checkedout") or getattr(pool, "_max_overflow", -1) < 0:
+        return False
+    return pool.checkedout() >= (pool.size() + pool._max_overflow) * podil
+
+
+def _odlehcit(duvod):
+    metrics.odmitnuti(duvod)
+    abort(503, message="Server je přetížený, zkuste to za chvíli.", headers={"Retry-After": "1"})
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Napojení na Flask
+# ──────────────────────────────────────────────────────────────────────────────
+def init_app(app):
+    app.extensions["ratelimit"] = _Stav(_vytvorit_backend(app.config.get("RATE_LIMIT_BACKEND")))
+
+    @app.before_request
+    def _omezit():
+        config = current_app.config
+        if request.endpoint in VYJIMKY or request.method == "OPTIONS":
+            return
+
+        stav = _stav()
+        max_soubeznych = config.get("ZATEZ_MAX_SOUBEZNYCH", 0)
+        with stav.zamek:
+            if max_soubeznych and stav.aktivni >= max_soubeznych:
+                pretizeno = True
+            else:
+                pretizeno = False
+                stav.aktivni += 1
+                g._rl_aktivni = True
+        if pretizeno:
+            _odlehcit("soubezne")
+        max_fronta = config.get("ZATEZ_MAX_FRONTA_MS", 0)
+        if max_fronta and (_cas_ve_fronte_ms() or 0) > max_fronta:
+            _odlehcit("fronta")
+        podil = config.get("ZATEZ_POOL_PODIL", 0)
+        if podil and _pool_vycerpan(podil):
+            _odlehcit("db_pool")
+
+        if not config.get("RATE_LIMIT", True):
+            return
+        nazev, limity = pravidlo()
+        klice = []
+        if "ip" in limity:
+            klice.append(("ip", request.remote_addr or "?"))
+        if "identita" in limity:
+            identita = _identita()
+            if identita is not None:
+                klice.append(("identita", identita))
+        for druh, hodnota in klice:
+            kapacita, rychlost = parsovat_limit(limity[druh])
+            povoleno, zbyva, cekat = stav.backend.vzit(f"{nazev}:{druh}:{hodnota}", kapacita, rychlost)
+            g._rl_zbyva = min(g.get("_rl_zbyva", kapacita), int(zbyva))
+            if not povoleno:
+                metrics.odmitnuti(f"limit_{druh}")
+                abort(429, message="Příliš mnoho požadavků.",
+                      headers={"Retry-After": str(max(1, math.ceil(cekat))),
+                               "X-RateLimit-Remaining": "0"})
+
+    @app.after_request
+    def _hlavicky(resp):
+        zbyva = g.get("_rl_zbyva")
+        if zbyva is not None:
+            resp.headers["X-RateLimit-Remaining"] = str(zbyva)
+        return resp
+
+    @app.teardown_request
+    def _konec(exc):
+        if g.pop("_rl_aktivni", False):
+            stav = _stav()
+            with stav.zamek:
+                stav.aktivni -= 1
@@ -0,0 +1,166 @@
+# app/ratings.py
+
+"""
+Průběžná statistika hodnocení (HodnoceniStatistika).
+
+- after_flush: nové / změněné / smazané Hodnoceni → delta (pocet, soucet, h1–h5)
+  pro souhrn (id_menu_polozka = 0) a pro každou různou položku menu objednávky
+- přidání / odebrání položky hodnocené objednávky mění množinu jejích položek
+  menu → hodnocení se přičtou nově přibylým a odečtou zmizelým položkám;
+  stará hodnota změněného / smazaného hodnocení se odečítá od množiny
+  položek před flushem, nová přičítá k té po flushi
+- prepocitat_hodnoceni(): set-based přestavba celé tabulky (INSERT … SELECT)
+- čtení (PolozkaMenuSchema, /api/hodnoceni/statistiky) už nic neagreguje
+"""
+
+from collections import Counter
+
+from sqlalchemy import case, delete, event, func, insert, literal, select
+
+from .db import db, Delty, hodnoty_atributu, zmeneno, aktivni_historie
+from .models import Hodnoceni, HodnoceniStatistika, PolozkaObjednavky
+
+# klíč souhrnného řádku přes všechna hodnocení
+CELKEM = 0
+HODNOCENI_ATTRS = ("hodnoceni", "id_objednavky")
+POLOZKA_ATTRS = ("id_objednavky", "id_menu_polozka")
+
+aktivni_historie(Hodnoceni, HODNOCENI_ATTRS)
+aktivni_historie(PolozkaObjednavky, POLOZKA_ATTRS)
+
+
+class _Polozky:
+    """Různé položky menu objednávky po flushi a (pred=True) před ním."""
+
+    def __init__(self, session):
+        self.session = session
+        self.po = {}
+        # (id_objednavky, id_menu) → o kolik řádků flush počet změnil
+        self.zmeny = Counter()
+
+    def zmena(self, h, znamenko):
+        if h["id_objednavky"] is not None:
+            self.zmeny[(h["id_objednavky"], h["id_menu_polozka"])] += znamenko
+
+    def objednavky(self):
+        return {o for (o, _), n in self.zmeny.items() if n}
+
+    def _pocty(self, id_objednavky):
+        if id_objednavky not in self.po:
+            self.po[id_objednavky] = Counter(dict(self.session.connection().execute(
+                select(PolozkaObjednavky.id_menu_polozka, func.count())
+                .where(PolozkaObjednavky.id_objednavky == id_objednavky)
+                .group_by(PolozkaObjednavky.id_menu_polozka)
+            ).all()))
+        return self.po[id_objednavky]
+
+    def __call__(self, id_objednavky, pred=False):
+        pocty = Counter(self._pocty(id_objednavky))
+        if pred:
+            for (o, id_menu), n in self.zmeny.items():
+                if o == id_objednavky:
+                    pocty[id_menu] -= n
+        return {id_menu for id_menu, n in pocty.items() if n > 0}
+
+
+def _hodnoceni(delty, h, znamenko, polozky, souhrn=True):
+    hodnota = h["hodnoceni"]
+    if hodnota is None or not 1 <= int(hodnota) <= 5:
+        return
+    hodnota = int(hodnota)
+    zmena = {"pocet": 1, "soucet": hodnota, f"h{hodnota}": 1}
+    for id_menu in ((CELKEM, *polozky) if souhrn else polozky):
+        delty.pridat(HodnoceniStatistika, {"id_menu_polozka": id_menu}, znamenko, **zmena)
+
+
+@event.listens_for(db.session, "after_flush")
+def _aktualizovat_statistiku(session, flush_context):
+    polozky = _Polozky(session)
+    for obj in session.new:
+        if isinstance(obj, PolozkaObjednavky):
+            polozky.zmena(hodnoty_atributu(obj, POLOZKA_ATTRS), 1)
+    for obj in session.dirty:
+        if isinstance(obj, PolozkaObjednavky) and zmeneno(obj, POLOZKA_ATTRS):
+            polozky.zmena(hodnoty_atributu(obj, POLOZKA_ATTRS, stare=True), -1)
+            polozky.zmena(hodnoty_atributu(obj, POLOZKA_ATTRS), 1)
+    for obj in session.deleted:
+        if isinstance(obj, PolozkaObjednavky):
+            polozky.zmena(hodnoty_atributu(obj, POLOZKA_ATTRS, stare=True), -1)
+
+    delty = Delty()
+    zmenena = set()
+    for obj in session.new:
+        if isinstance(obj, Hodnoceni):
+            zmenena.add(obj.id_hodnoceni)
+            h = hodnoty_atributu(obj, HODNOCENI_ATTRS)
+            _hodnoceni(delty, h, 1, polozky(h["id_objednavky"]))
+    for obj in session.dirty:
+        if isinstance(obj, Hodnoceni) and zmeneno(obj, HODNOCENI_ATTRS):
+            zmenena.add(obj.id_hodnoceni)
+            h = hodnoty_atributu(obj, HODNOCENI_ATTRS, stare=True)
+            _hodnoceni(delty, h, -1, polozky(h["id_objednavky"], pred=True))
+            h = hodnoty_atributu(obj, HODNOCENI_ATTRS)
+            _hodnoceni(delty, h, 1, polozky(h["id_objednavky"]))
+    for obj in session.deleted:
+        if isinstance(obj, Hodnoceni):
+            zmenena.add(obj.id_hodnoceni)
+            h = hodnoty_atributu(obj, HODNOCENI_ATTRS, stare=True)
+            _hodnoceni(delty, h, -1, polozky(h["id_objednavky"], pred=True))
+
+    # nezměněná hodnocení objednávek, kterým flush změnil položky
+    objednavky = polozky.objednavky()
+    if objednavky:
+        for id_hodnoceni, id_objednavky, hodnota in session.connection().execute(
+            select(Hodnoceni.id_hodnoceni, Hodnoceni.id_objednavky, Hodnoceni.hodnoceni)
+            .where(Hodnoceni.id_objednavky.in_(objednavky))
+        ):
+            if id_hodnoceni in zmenena:
+                continue
+            pred, po = polozky(id_objednavky, pred=True), polozky(id_objednavky)
+            h = {"hodnoceni": hodnota, "id_objednavky": id_objednavky}
+            # souhrn se nemění – jen položky, které přibyly / zmizely
+            _hodnoceni(delty, h, 1, po - pred, souhrn=False)
+            _hodnoceni(delty, h, -1, pred - po, souhrn=False)
+    delty.zapsat(session.connection())
+
+
+def prepocitat_hodnoceni():
+    """Přestaví celou statistiku dvěma INSERT … SELECT (souhrn + po položkách)."""
+    conn = db.session.connection()
+    conn.execute(delete(HodnoceniStatistika))
+
+    platne = Hodnoceni.hodnoceni.between(1, 5)
+    sloupce = [
+        func.count(Hodnoceni.id_hodnoceni),
+        func.coalesce(func.sum(Hodnoceni.hodnoceni), 0),
+        *(func.coalesce(func.sum(case((Hodnoceni.hodnoceni == i, 1), else_=0)), 0)
+          for i in range(1, 6)),
+    ]
+    cile = ["id_menu_polozka", "pocet", "soucet", "h1", "h2", "h3", "h4", "h5"]
+
+    conn.execute(insert(HodnoceniStatistika).from_select(
+        cile, select(literal(CELKEM), *sloupce).where(platne)
+    ))
+
+    polozky = (
+        select(PolozkaObjednavky.id_objednavky, PolozkaObjednavky.id_menu_polozka)
+        .distinct()
+        .subquery()
+    )
+    conn.execute(insert(HodnoceniStatistika).from_select(
+        cile,
+        select(polozky.c.id_menu_polozka, *sloupce)
+        .join_from(Hodnoceni, polozky, polozky.c.id_objednavky == Hodnoceni.id_objednavky)
+        .where(platne)
+        .group_by(polozky.c.id_menu_polozka)
+    ))
+    db.session.commit()
+
+
+def statistika_dict(stat, id_menu_polozka=CELKEM):
+    """Serializace pro API – chybějící řádek = zatím žádné hodnocení."""
+    if stat is None:
+        return {"id_menu_polozka": id_menu_polozka, "pocet": 0, "prumer": None,
+                "rozlozeni": {str(i): 0 for i in range(1, 6)}}
+    return {"id_menu_polozka": stat.id_menu_polozka, "pocet": stat.pocet,
+            "prumer": stat.prumer, "rozlozeni": stat.rozlozeni}
@@ -0,0 +1,123 @@
+# app/reminders.py
+
+"""
+Připomínky rezervací (24 h e-mailem, 2 h SMS před datum_cas).
+
+- pro každý druh připomínky si PlanovacZnacka pamatuje, do jakého času odeslání
+  už jsou notifikace vytvořené; běh zpracuje jen úsek (znacka, ted + okno]
+- výběr je jeden rozsahový dotaz nad indexem rezervace.datum_cas
+- všechny nové Notifikace jdou jedním hromadným INSERT; odeslání naplánuje
+  dalsi_pokus (outbox worker je nevezme dřív)
+- opakovaný běh nad stejným úsekem nic nevytvoří → žádné duplicity
+- rezervace vytvořená nebo přesunutá do úseku, který už plánovač prošel
+  (čas odeslání mezi teď a značkou), dostane připomínku hned v before_flush
+  téže transakce (jako outbox); při přesunu / zrušení se čekající připomínky
+  ke starému času smažou
+"""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, insert, select
+
+from .db import db, zmeneno
+from .models import Notifikace, PlanovacZnacka, Rezervace, Zakaznik
+from .outbox import CEKAJICI
+
+# (název značky, předstih před rezervací, kanál)
+PRIPOMINKY = (
+    ("pripominka_24h", timedelta(hours=24), "email"),
+    ("pripominka_2h",  timedelta(hours=2),  "sms"),
+)
+ZRUSENA = "zrušená"
+PREFIX = "Připomínka:"
+TEXT = PREFIX + " rezervace {:%d.%m.%Y %H:%M} pro {} os."
+
+
+def _pripominka(datum_cas, pocet_osob, telefon, predstih, kanal, **dalsi):
+    kdy = datum_cas - predstih
+    return {
+        # bez telefonu pošleme i krátkou připomínku e-mailem
+        "typ": kanal if kanal != "sms" or telefon else "email",
+        "datum_cas": kdy,
+        "dalsi_pokus": kdy,
+        "text": TEXT.format(datum_cas, pocet_osob),
+        **dalsi,
+    }
+
+
+def _znacka(nazev):
+    # FOR UPDATE: souběžný běh plánovače počká, nezpracuje stejný úsek dvakrát
+    return db.session.scalars(
+        select(PlanovacZnacka).where(PlanovacZnacka.nazev == nazev).with_for_update()
+    ).one_or_none()
+
+
+def naplanovat_pripominky(ted=None, okno=timedelta(hours=1)):
+    """Vytvoří notifikace pro připomínky s časem odeslání do ted + okno. Vrací jejich počet."""
+    ted = ted or datetime.now()
+    do = ted + okno
+    radky = []
+
+    for nazev, predstih, kanal in PRIPOMINKY:
+        znacka = _znacka(nazev)
+        od = znacka.hodnota if znacka else ted        # první běh nezačíná minulostí
+        if od >= do:
+            continue
+
+        rezervace = db.session.execute(
+            select(Rezervace.id_rezervace, Rezervace.datum_cas, Rezervace.pocet_osob,
+                   Zakaznik.telefon)
+            .join(Zakaznik, Zakaznik.id_zakaznika == Rezervace.id_zakaznika)
+            .where(Rezervace.datum_cas > max(od + predstih, ted),
+                   Rezervace.datum_cas <= do + predstih)
+            .where(Rezervace.stav_rezervace != ZRUSENA)
+        ).all()
+
+        for r in rezervace:
+            radky.append(_pripominka(r.datum_cas, r.pocet_osob, r.telefon, predstih, kanal,
+                                     id_rezervace=r.id_rezervace))
+
+        if znacka:
+            znacka.hodnota = do
+        else:
+            db.session.add(PlanovacZnacka(nazev=nazev, hodnota=do))
+
+    if radky:
+        db.session.execute(insert(Notifikace), radky)
+    db.session.commit()
+    return len(radky)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Rezervace v úseku, který plánovač už prošel
+# ──────────────────────────────────────────────────────────────────────────────
+@event.listens_for(db.session, "before_flush")
+def _dohnat_pripominky(session, flush_context, instances):
+    zmenene = [
+        o for o in session.dirty
+        if isinstance(o, Rezervace) and zmeneno(o, ("datum_cas", "pocet_osob", "stav_rezervace"))
+    ]
+    nove = [o for o in session.new if isinstance(o, Rezervace)]
+    if not zmenene and not nove:
+        return
+
+    with session.no_autoflush:
+        # čekající připomínky ke starému času / počtu osob už neplatí
+        for rez in zmenene:
+            for n in rez.notifikace:
+                if n.stav == CEKAJICI and (n.text or "").startswith(PREFIX):
+                    session.delete(n)
+
+        ted = datetime.now()
+        znacky = {z.nazev: z.hodnota for z in session.scalars(
+            select(PlanovacZnacka).where(PlanovacZnacka.nazev.in_([p[0] for p in PRIPOMINKY])))}
+        for rez in nove + zmenene:
+            if rez.stav_rezervace == ZRUSENA or rez.datum_cas is None:
+                continue
+            for nazev, predstih, kanal in PRIPOMINKY:
+                # pozdější čas odeslání vezme běžný běh plánovače
+                if not ted < rez.datum_cas - predstih <= znacky.get(nazev, ted):
+                    continue
+                zakaznik = rez.zakaznik or session.get(Zakaznik, rez.id_zakaznika)
+                session.add(Notifikace(rezervace=rez, **_pripominka(
+                    rez.datum_cas, rez.pocet_osob, zakaznik and zakaznik.telefon, predstih, kanal)))
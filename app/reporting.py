@@ -0,0 +1,254 @@
+# app/reporting.py
+
+"""
+Agregace tržeb pro reporty (DenniTrzba, DenniProdejPolozky, DenniMixPlateb).
+
+- inkrementálně: posluchač after_flush přepočítá jen delty zapsaných
+  Objednavka / PolozkaObjednavky / Platba a přičte je jedním UPSERTem
+  ve stejné transakci
+- dávkově: prepocitat_agregace(od, do) přestaví agregace pro rozsah dní
+  z grupovaných SELECTů (po hromadném importu mimo ORM, opravách dat…)
+- čtení reportu pak stojí O(počet dní), ne O(celá historie)
+"""
+
+from datetime import datetime, time, date
+from decimal import Decimal
+
+from sqlalchemy import delete, event, func, select, union_all
+from sqlalchemy.orm.util import identity_key
+
+from .archive import archivovano_do
+from .db import db, pricist, Delty, hodnoty_atributu, zmeneno, aktivni_historie
+from .models import (
+    Objednavka, PolozkaObjednavky, Platba,
+    DenniTrzba, DenniProdejPolozky, DenniMixPlateb, platba_archiv
+)
+
+
+def _den(hodnota):
+    if isinstance(hodnota, datetime):
+        return hodnota.date()
+    if isinstance(hodnota, date):
+        return hodnota
+    return datetime.fromisoformat(str(hodnota)).date()
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Delty jednotlivých entit
+# ──────────────────────────────────────────────────────────────────────────────
+PLATBA_ATTRS = ("castka", "typ_platby", "datum")
+POLOZKA_ATTRS = ("mnozstvi", "cena", "id_menu_polozka", "id_objednavky")
+
+aktivni_historie(Platba, PLATBA_ATTRS)
+aktivni_historie(PolozkaObjednavky, POLOZKA_ATTRS)
+aktivni_historie(Objednavka, ("datum_cas",))
+
+
+def _platba(delty, h, znamenko):
+    den = _den(h["datum"])
+    castka = Decimal(str(h["castka"]))
+    delty.pridat(DenniTrzba, {"den": den}, znamenko, trzba=castka, pocet_plateb=1)
+    delty.pridat(DenniMixPlateb, {"den": den, "typ_platby": h["typ_platby"]}, znamenko,
+                 castka=castka, pocet=1)
+
+
+def _den_objednavky(session, id_objednavky, cache):
+    # nejdřív zkusíme objednávku v session, teprve potom DB
+    if id_objednavky not in cache:
+        obj = session.identity_map.get(identity_key(Objednavka, id_objednavky))
+        if obj is not None:
+            cache[id_objednavky] = _den(obj.datum_cas)
+        else:
+            datum = session.connection().scalar(
+                select(Objednavka.datum_cas).where(Objednavka.id_objednavky == id_objednavky)
+            )
+            cache[id_objednavky] = _den(datum) if datum is not None else None
+    return cache[id_objednavky]
+
+
+def _polozka(delty, session, h, znamenko, cache):
+    den = _den_objednavky(session, h["id_objednavky"], cache)
+    if den is None:
+        return
+    delty.pridat(DenniProdejPolozky, {"den": den, "id_menu_polozka": h["id_menu_polozka"]},
+                 znamenko, mnozstvi=h["mnozstvi"], trzba=Decimal(str(h["cena"])) * h["mnozstvi"])
+
+
+def _presun_objednavky(delty, session, obj, novy_den, stary_den):
+    """Objednávka změnila datum → přesuneme počet i tržby jejích položek."""
+    delty.pridat(DenniTrzba, {"den": stary_den}, -1, pocet_objednavek=1)
+    delty.pridat(DenniTrzba, {"den": novy_den}, 1, pocet_objednavek=1)
+    # položky nové v tomto flushi už jsou započtené k novému dni
+    nove = [o.id_polozky_obj for o in session.new if isinstance(o, PolozkaObjednavky)]
+    radky = session.connection().execute(
+        select(
+            PolozkaObjednavky.id_menu_polozka,
+            func.sum(PolozkaObjednavky.mnozstvi),
+            func.sum(PolozkaObjednavky.cena * PolozkaObjednavky.mnozstvi),
+        )
+        .where(PolozkaObjednavky.id_objednavky == obj.id_objednavky)
+        .where(PolozkaObjednavky.id_polozky_obj.notin_(nove))
+        .group_by(PolozkaObjednavky.id_menu_polozka)
+    )
+    for id_menu, mnozstvi, trzba in radky:
+        for den, znamenko in ((stary_den, -1), (novy_den, 1)):
+            delty.pridat(DenniProdejPolozky, {"den": den, "id_menu_polozka": id_menu},
+                         znamenko, mnozstvi=mnozstvi, trzba=Decimal(str(trzba)))
+
+
+@event.listens_for(db.session, "after_flush")
+def _aktualizovat_agregace(session, flush_context):
+    delty = Delty()
+    # den objednávek mazaných v tomto flushi už z DB nezjistíme
+    dny = {
+        obj.id_objednavky: _den(obj.datum_cas)
+        for obj in session.deleted if isinstance(obj, Objednavka)
+    }
+
+    for obj in session.new:
+        if isinstance(obj, Objednavka):
+            delty.pridat(DenniTrzba, {"den": _den(obj.datum_cas)}, pocet_objednavek=1)
+        elif isinstance(obj, Platba):
+            _platba(delty, hodnoty_atributu(obj, PLATBA_ATTRS), 1)
+        elif isinstance(obj, PolozkaObjednavky):
+            _polozka(delty, session, hodnoty_atributu(obj, POLOZKA_ATTRS), 1, dny)
+
+    for obj in session.dirty:
+        if isinstance(obj, Platba) and zmeneno(obj, PLATBA_ATTRS):
+            _platba(delty, hodnoty_atributu(obj, PLATBA_ATTRS, stare=True), -1)
+            _platba(delty, hodnoty_atributu(obj, PLATBA_ATTRS), 1)
+        elif isinstance(obj, PolozkaObjednavky) and zmeneno(obj, POLOZKA_ATTRS):
+            _polozka(delty, session, hodnoty_atributu(obj, POLOZKA_ATTRS, stare=True), -1, dny)
+            _polozka(delty, session, hodnoty_atributu(obj, POLOZKA_ATTRS), 1, dny)
+        elif isinstance(obj, Objednavka) and zmeneno(obj, ("datum_cas",)):
+            stary = _den(hodnoty_atributu(obj, ("datum_cas",), stare=True)["datum_cas"])
+            novy = _den(obj.datum_cas)
+            if stary != novy:
+                _presun_objednavky(delty, session, obj, novy, stary)
+
+    for obj in session.deleted:
+        if isinstance(obj, Objednavka):
+            delty.pridat(DenniTrzba, {"den": _den(obj.datum_cas)}, -1, pocet_objednavek=1)
+        elif isinstance(obj, Platba):
+            _platba(delty, hodnoty_atributu(obj, PLATBA_ATTRS, stare=True), -1)
+        elif isinstance(obj, PolozkaObjednavky):
+            _polozka(delty, session, hodnoty_atributu(obj, POLOZKA_ATTRS, stare=True), -1, dny)
+
+    delty.zapsat(session.connection())
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Dávkový přepočet
+# ──────────────────────────────────────────────────────────────────────────────
+def _rozsah(sloupec, od, do):
+    podminky = []
+    if od is not None:
+        podminky.append(sloupec >= datetime.combine(od, time.min))
+    if do is not None:
+        podminky.append(sloupec < datetime.combine(do, time.min))
+    return podminky
+
+
+def _rozsah_dni(model, od, do):
+    podminky = []
+    if od is not None:
+        podminky.append(model.den >= od)
+    if do is not None:
+        podminky.append(model.den < do)
+    return podminky
+
+
+def prepocitat_agregace(od=None, do=None):
+    """
+    Přestaví agregace pro dny v [od, do) (bez rozsahu = celá historie).
+    Zdrojová data se grupují v DB, do Pythonu jde jen řádek na den (a položku / typ).
+    Dny před hranicí archivu (app/archive.py) se nepřestavují – jejich data už
+    v provozních tabulkách nejsou a agregace z doby před archivací platí dál.
+    Platby archivovaných objednávek mohou být i po hranici → čtou se i z platba_archiv
+    (objednávky a jejich položky v archivu jsou všechny před hranicí).
+    """
+    hranice = archivovano_do()
+    if hranice is not None and (od is None or od < hranice.date()):
+        od = hranice.date()
+    platby = Platba.__table__
+    if hranice is not None:
+        platby = union_all(
+            select(platby.c.datum, platby.c.typ_platby, platby.c.castka),
+            select(platba_archiv.c.datum, platba_archiv.c.typ_platby, platba_archiv.c.castka),
+        ).subquery()
+    conn = db.session.connection()
+    for model in (DenniTrzba, DenniProdejPolozky, DenniMixPlateb):
+        conn.execute(delete(model).where(*_rozsah_dni(model, od, do)))
+
+    den_platby = func.date(platby.c.datum)
+    for den, typ, pocet, castka in conn.execute(
+        select(den_platby, platby.c.typ_platby, func.count(), func.sum(platby.c.castka))
+        .where(*_rozsah(platby.c.datum, od, do))
+        .group_by(den_platby, platby.c.typ_platby)
+    ):
+        castka = Decimal(str(castka))
+        pricist(conn, DenniMixPlateb.__table__, {"den": _den(den), "typ_platby": typ},
+                {"pocet": pocet, "castka": castka})
+        pricist(conn, DenniTrzba.__table__, {"den": _den(den)},
+                {"trzba": castka, "pocet_plateb": pocet, "pocet_objednavek": 0})
+
+    den_obj = func.date(Objednavka.datum_cas)
+    for den, pocet in conn.execute(
+        select(den_obj, func.count())
+        .where(*_rozsah(Objednavka.datum_cas, od, do))
+        .group_by(den_obj)
+    ):
+        pricist(conn, DenniTrzba.__table__, {"den": _den(den)},
+                {"trzba": Decimal("0"), "pocet_plateb": 0, "pocet_objednavek": pocet})
+
+    for den, id_menu, mnozstvi, trzba in conn.execute(
+        select(den_obj, PolozkaObjednavky.id_menu_polozka,
+               func.sum(PolozkaObjednavky.mnozstvi),
+               func.sum(PolozkaObjednavky.cena * PolozkaObjednavky.mnozstvi))
+        .join(Objednavka, Objednavka.id_objednavky == PolozkaObjednavky.id_objednavky)
+        .where(*_rozsah(Objednavka.datum_cas, od, do))
+        .group_by(den_obj, PolozkaObjednavky.id_menu_polozka)
+    ):
+        pricist(conn, DenniProdejPolozky.__table__, {"den": _den(den), "id_menu_polozka": id_menu},
+                {"mnozstvi": mnozstvi, "trzba": Decimal(str(trzba))})
+    db.session.commit()
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Čtení reportů – jen z agregačních tabulek
+# ──────────────────────────────────────────────────────────────────────────────
+def report_trzeb(od, do):
+    """Denní tržby v [od, do) včetně rozpadu podle typu platby."""
+    dny = {
+        r.den: {
+            "den": r.den, "trzba": r.trzba,
+            "pocet_plateb": r.pocet_plateb, "pocet_objednavek": r.pocet_objednavek,
+            "platby": [],
+        }
+        for r in db.session.scalars(
+            select(DenniTrzba).where(*_rozsah_dni(DenniTrzba, od, do)).order_by(DenniTrzba.den)
+        )
+    }
+    for r in db.session.scalars(
+        select(DenniMixPlateb).where(*_rozsah_dni(DenniMixPlateb, od, do))
+        .order_by(DenniMixPlateb.den, DenniMixPlateb.typ_platby)
+    ):
+        if r.den in dny and r.pocet:
+            dny[r.den]["platby"].append(
+                {"typ_platby": r.typ_platby, "pocet": r.pocet, "castka": r.castka}
+            )
+    return list(dny.values())
+
+
+def report_polozek(od, do):
+    """Prodané množství a tržba po položkách menu za [od, do)."""
+    mnozstvi = func.sum(DenniProdejPolozky.mnozstvi)
+    stmt = (
+        select(DenniProdejPolozky.id_menu_polozka, mnozstvi.label("mnozstvi"),
+               func.sum(DenniProdejPolozky.trzba).label("trzba"))
+        .where(*_rozsah_dni(DenniProdejPolozky, od, do))
+        .group_by(DenniProdejPolozky.id_menu_polozka)
+        .having(mnozstvi != 0)
+        .order_by(mnozstvi.desc())
+    )
+    return [dict(r._mapping) for r in db.session.execute(stmt)]
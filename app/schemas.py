@@ -2,6 +2,9 @@
 
 from marshmallow import Schema, fields, validate, validates_schema, ValidationError, post_dump
 
+from .ratings import statistika_dict
+from .allergens import MAX_ID, dekodovat
+
 # — LOGIN schéma —
 class LoginSchema(Schema):
     email = fields.Email(required=True)
@@ -102,7 +105,7 @@ class ZakaznikCreateSchema(Schema):
 # — Vernostní účet —
 class VernostniUcetSchema(Schema):
     id_ucet = fields.Int(dump_only=True)
-    body = fields.Int()
+    body = fields.Int(dump_only=True)   # mění se jen přes knihu pohybů (POST /ucet/<id>/body)
     datum_zalozeni = fields.Date()
     zakaznik = fields.Nested(ZakaznikSummarySchema, dump_only=True)
 
@@ -111,6 +114,18 @@ class VernostniUcetCreateSchema(Schema):
     datum_zalozeni = fields.Date(required=True)
     id_zakaznika = fields.Int(required=True)
 
+class BodovyPohybSchema(Schema):
+    id_pohyb  = fields.Int(dump_only=True)
+    body      = fields.Int()
+    duvod     = fields.Str()
+    popis     = fields.Str(allow_none=True)
+    id_platba = fields.Int(allow_none=True)
+    datum     = fields.DateTime()
+
+class BodyUpravaSchema(Schema):
+    body  = fields.Int(required=True, validate=validate.NoneOf([0], error="Úprava nesmí být nulová."))
+    popis = fields.Str()
+
 # — Rezervace —
 class RezervaceSchema(Schema):
     id_rezervace = fields.Int(dump_only=True)
@@ -245,19 +260,29 @@ class PlatbaCreateSchema(Schema):
 # — Hodnocení —
 class HodnoceniSchema(Schema):
     id_hodnoceni = fields.Int(dump_only=True)
-    hodnoceni = fields.Int()
+    hodnoceni = fields.Int(validate=validate.Range(min=1, max=5))
     komentar = fields.Str()
     datum = fields.DateTime()
     zakaznik = fields.Nested(ZakaznikSummarySchema, dump_only=True)
     objednavka = fields.Nested(ObjednavkaSummarySchema, dump_only=True)
 
 class HodnoceniCreateSchema(Schema):
-    hodnoceni = fields.Int(required=True)
+    hodnoceni = fields.Int(required=True, validate=validate.Range(min=1, max=5))
     komentar = fields.Str()
     datum = fields.DateTime(required=True)
     id_objednavky = fields.Int(required=True)
     id_zakaznika = fields.Int(required=True)
 
+class HodnoceniStatistikaSchema(Schema):
+    id_menu_polozka = fields.Int()
+    pocet           = fields.Int()
+    prumer          = fields.Float(allow_none=True)
+    rozlozeni       = fields.Dict(keys=fields.Str(), values=fields.Int())
+
+class HodnoceniPrehledSchema(Schema):
+    celkem  = fields.Nested(HodnoceniStatistikaSchema)
+    polozky = fields.Nested(HodnoceniStatistikaSchema, many=True)
+
 # — Položka menu —
 class PolozkaMenuSchema(Schema):
     id_menu_polozka = fields.Int(dump_only=True)
@@ -268,12 +293,26 @@ class PolozkaMenuSchema(Schema):
     kategorie       = fields.Str()  # "týdenní","víkendové" nebo "stálá nabídka"
     den             = fields.Str(allow_none=True)
     alergeny        = fields.Method("get_alergeny", dump_only=True)
+    hodnoceni       = fields.Method("get_hodnoceni", dump_only=True)
 
     def get_alergeny(self, obj):
-        return [
-            {"id_alergenu": link.id_alergenu, "nazev": link.alergen.nazev}
-            for link in obj.alergeny
-        ]
+        # dekódujeme bitovou masku – na vazby PolozkaMenuAlergen se nesahá
+        return dekodovat(obj.alergeny_maska)
+
+    def get_hodnoceni(self, obj):
+        # předpočítaná statistika – při serializaci se nic neagreguje
+        stat = statistika_dict(obj.statistika_hodnoceni, obj.id_menu_polozka)
+        del stat["id_menu_polozka"]
+        return stat
+
+class DnesniPolozkaSchema(PolozkaMenuSchema):
+    sekce  = fields.Str(dump_only=True)   # "plan" | "den" | "stala"
+    poradi = fields.Int(dump_only=True, allow_none=True)
+
+class DnesniMenuSchema(Schema):
+    den       = fields.Date()
+    den_tydne = fields.Str()
+    polozky   = fields.List(fields.Nested(DnesniPolozkaSchema))
 
 class PolozkaMenuCreateSchema(Schema):
     nazev       = fields.Str(required=True)
@@ -297,7 +336,7 @@ class PolozkaMenuAlergenSchema(Schema):
 
 class PolozkaMenuAlergenCreateSchema(Schema):
     id_menu_polozka = fields.Int(required=True)
-    id_alergenu = fields.Int(required=True)
+    id_alergenu = fields.Int(required=True, validate=validate.Range(min=1, max=MAX_ID))
 
 # — Jídelní plán —
 class JidelniPlanSchema(Schema):
@@ -346,6 +385,10 @@ class NotifikaceSchema(Schema):
     typ = fields.Str()
     datum_cas = fields.DateTime()
     text = fields.Str()
+    stav = fields.Str(dump_only=True)
+    pokusy = fields.Int(dump_only=True)
+    odeslano = fields.DateTime(dump_only=True, allow_none=True)
+    chyba = fields.Str(dump_only=True, allow_none=True)
     rezervace = fields.Nested(RezervaceSummarySchema, dump_only=True, allow_none=True)
     objednavka = fields.Nested(ObjednavkaSummarySchema, dump_only=True, allow_none=True)
 
@@ -364,3 +407,44 @@ class RoleSchema(Schema):
 
 class UserRoleAssignSchema(Schema):
     role_id = fields.Int(required=True)
+
+# — Hledání v menu (app/search.py) —
+class HledaniArgsSchema(Schema):
+    q            = fields.Str(required=True, validate=validate.Length(min=1, max=100))
+    limit        = fields.Int(load_default=20, validate=validate.Range(min=1, max=100))
+    bez_alergenu = fields.Str()
+
+# — Filtr menu („bez Lepek,Ořechy“ – názvy nebo id alergenů oddělené čárkou) —
+class MenuArgsSchema(Schema):
+    bez_alergenu = fields.Str()
+
+# — Seznamy: stránkování (?limit=&offset=) a celkový počet (?pocet=, app/api/counting.py) —
+class SeznamArgsSchema(Schema):
+    limit  = fields.Int(validate=validate.Range(min=1, max=1000))   # bez limitu = celý seznam
+    offset = fields.Int(load_default=0, validate=validate.Range(min=0))
+    pocet  = fields.Str(validate=validate.OneOf(("presny", "odhad", "cache")))
+
+class ZakaznikSeznamArgsSchema(SeznamArgsSchema):
+    role = fields.Str()
+
+# — Reporty (čtou jen z agregačních tabulek) —
+class ReportArgsSchema(Schema):
+    od = fields.Date()   # včetně, výchozí = před 30 dny
+    do = fields.Date()   # bez, výchozí = zítra
+
+class MixPlatebSchema(Schema):
+    typ_platby = fields.Str()
+    pocet      = fields.Int()
+    castka     = fields.Decimal(as_string=True)
+
+class DenniTrzbaSchema(Schema):
+    den              = fields.Date()
+    trzba            = fields.Decimal(as_string=True)
+    pocet_plateb     = fields.Int()
+    pocet_objednavek = fields.Int()
+    platby           = fields.Nested(MixPlatebSchema, many=True)
+
+class ProdejPolozkySchema(Schema):
+    id_menu_polozka = fields.Int()
+    mnozstvi        = fields.Int()
+    trzba           = fields.Decimal(as_string=True)
@@ -0,0 +1,186 @@
+# app/search.py
+
+"""
+Hledání v menu bez ohledu na diakritiku („svickova“ najde „svíčková“).
+
+- PolozkaMenu.hledani = složený text (nazev + popis bez diakritiky, malými),
+  udržovaný before_flush; složení v Pythonu je stejné pro všechny DB
+  (na Postgresu tak netřeba unaccent() – ten není IMMUTABLE a do indexu nejde)
+- Postgres: kandidáti přes regex začátku slova (~ '\\mtoken') nad GIN
+  trigramovým indexem (pg_trgm); skóre se počítá už v SQL a LIMIT se
+  uplatní až po ORDER BY – dobré shody se neztratí mezi náhodnými řádky
+- ostatní DB (SQLite v testech): invertovaný index v paměti procesu –
+  seřazený seznam slov pro prefixové hledání přes bisect, slovo → id položek;
+  zneplatní se po commitu, který měnil PolozkaMenu (+ TTL pro víc procesů)
+- řazení je v obou případech stejné: shoda v názvu > v popisu,
+  celé slovo > prefix, název začínající dotazem navrch
+"""
+
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left
+
+from flask import current_app
+from sqlalchemy import DDL, case, event, func, literal, select
+
+from .db import db, zmeneno, zneplatnit_pri_zmene
+from .models import PolozkaMenu
+
+SLOVO = re.compile(r"\w+")
+INDEX_TTL_S = 60
+_zamek = threading.Lock()
+
+
+def slozit(text):
+    """Bez diakritiky a malými písmeny: 'Svíčková na smetaně' → 'svickova na smetane'."""
+    rozlozeno = unicodedata.normalize("NFKD", text or "")
+    return "".join(z for z in rozlozeno if not unicodedata.combining(z)).casefold()
+
+
+def slova(text):
+    return SLOVO.findall(slozit(text))
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Údržba sloupce hledani + trigramový index na Postgresu
+# ──────────────────────────────────────────────────────────────────────────────
+event.listen(
+    PolozkaMenu.__table__, "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+
+@event.listens_for(db.session, "before_flush")
+def _slozit_hledani(session, flush_context, instances):
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, PolozkaMenu) and (obj in session.new or zmeneno(obj, ("nazev", "popis"))):
+            obj.hledani = slozit(f"{obj.nazev} {obj.popis or ''}")
+
+
+zneplatnit_pri_zmene("hledani_menu", PolozkaMenu)
+
+
+def prepocitat_hledani(davka=500):
+    """Doplní / přepočítá sloupec hledani u všech položek (po importu mimo ORM)."""
+    pocet = 0
+    for obj in db.session.scalars(select(PolozkaMenu).execution_options(yield_per=davka)):
+        obj.hledani = slozit(f"{obj.nazev} {obj.popis or ''}")
+        pocet += 1
+    db.session.commit()
+    return pocet
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Invertovaný index v paměti (fallback mimo Postgres)
+# ──────────────────────────────────────────────────────────────────────────────
+class InvertovanyIndex:
+    def __init__(self, polozky):
+        """polozky: iterovatelné (id, nazev, popis)."""
+        self.texty = {}
+        mapa = {}
+        for id_, nazev, popis in polozky:
+            self.texty[id_] = (slova(nazev), slova(popis))
+            for s in set(self.texty[id_][0] + self.texty[id_][1]):
+                mapa.setdefault(s, set()).add(id_)
+        self.slova = sorted(mapa)
+        self.mapa = mapa
+        self.vytvoren = time.monotonic()
+
+    def _prefix(self, token):
+        ids = set()
+        i = bisect_left(self.slova, token)
+        while i < len(self.slova) and self.slova[i].startswith(token):
+            ids |= self.mapa[self.slova[i]]
+            i += 1
+        return ids
+
+    def hledat(self, tokeny):
+        kandidati = None
+        for t in tokeny:
+            nalezeno = self._prefix(t)
+            kandidati = nalezeno if kandidati is None else kandidati & nalezeno
+            if not kandidati:
+                return set()
+        return kandidati or set()
+
+
+def _index():
+    ext = current_app.extensions
+    idx = ext.get("hledani_menu")
+    if idx is None or time.monotonic() - idx.vytvoren > INDEX_TTL_S:
+        with _zamek:
+            idx = ext.get("hledani_menu")
+            if idx is None or time.monotonic() - idx.vytvoren > INDEX_TTL_S:
+                idx = InvertovanyIndex(db.session.execute(
+                    select(PolozkaMenu.id_menu_polozka, PolozkaMenu.nazev, PolozkaMenu.popis)
+                ).all())
+                ext["hledani_menu"] = idx
+    return idx
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Hledání a řazení
+# ──────────────────────────────────────────────────────────────────────────────
+def skore(tokeny, slova_nazvu, slova_popisu):
+    """None = některý token nesedí jako prefix žádného slova."""
+    celkem = 0.0
+    for t in tokeny:
+        if t in slova_nazvu:
+            celkem += 3
+        elif any(s.startswith(t) for s in slova_nazvu):
+            celkem += 2
+        elif t in slova_popisu:
+            celkem += 1
+        elif any(s.startswith(t) for s in slova_popisu):
+            celkem += 0.5
+        else:
+            return None
+    if slova_nazvu and slova_nazvu[0].startswith(tokeny[0]):
+        celkem += 1
+    return celkem
+
+
+def _kandidati_postgres(tokeny, limit):
+    """
+    Stejné skóre jako skore(), jen v SQL. Název je začátek sloupce hledani
+    (složení zachovává délku), takže „v názvu“ = shoda v prvních length(nazev) znacích.
+    """
+    nazev = func.substr(PolozkaMenu.hledani, 1, func.length(PolozkaMenu.nazev))
+    skore_sql = case((PolozkaMenu.hledani.startswith(tokeny[0]), 1), else_=0)
+    stmt = select(PolozkaMenu.id_menu_polozka, PolozkaMenu.nazev, PolozkaMenu.popis)
+    for t in tokeny:
+        # tokeny jsou jen \w+ → v regexu je není třeba escapovat
+        slovo, prefix = rf"\m{t}\M", rf"\m{t}"
+        # jen prefix slova – jiné shody by skore() stejně zahodilo
+        stmt = stmt.where(PolozkaMenu.hledani.regexp_match(prefix))
+        skore_sql = skore_sql + case(
+            (nazev.regexp_match(slovo), 3),
+            (nazev.regexp_match(prefix), 2),
+            (PolozkaMenu.hledani.regexp_match(slovo), 1),
+            else_=literal(0.5),
+        )
+    stmt = stmt.order_by(skore_sql.desc(), PolozkaMenu.hledani).limit(limit)
+    radky = db.session.execute(stmt).all()
+    return {r.id_menu_polozka: (slova(r.nazev), slova(r.popis)) for r in radky}
+
+
+def hledat_menu(dotaz, limit=20):
+    """Vrátí seřazená id_menu_polozka odpovídající dotazu."""
+    tokeny = slova(dotaz)
+    if not tokeny:
+        return []
+    if db.session.get_bind().dialect.name == "postgresql":
+        texty = _kandidati_postgres(tokeny, limit * 2)
+    else:
+        idx = _index()
+        texty = {i: idx.texty[i] for i in idx.hledat(tokeny)}
+
+    hodnocene = []
+    for id_, (nazev, popis) in texty.items():
+        s = skore(tokeny, nazev, popis)
+        if s is not None:
+            hodnocene.append((-s, " ".join(nazev), id_))
+    hodnocene.sort()
+    return [id_ for _, _, id_ in hodnocene[:limit]]
@@ -0,0 +1,236 @@
+# app/seed_large.py
+
+"""
+Generátor velkých syntetických dat (flask seed-large) pro kapacitní testy.
+
+- data jsou referenčně konzistentní a reprodukovatelná ze seedu: zákazníci
+  s rolí user a věrnostním účtem, rezervace, objednávky s položkami, platby
+  s pohyby bodů, hodnocení a odeslané notifikace
+- nic se nemaže – id navazují na stávající maxima, e-maily obsahují id
+- generuje se po dávkách zákazníků (paměť nezávisí na objemu); každá dávka
+  se nahraje tabulku po tabulce v pořadí cizích klíčů:
+  Postgres COPY … FROM STDIN, ostatní DB dávkové INSERTy (executemany)
+- hromadné nahrání obchází session události → agregace tržeb, statistiky
+  hodnocení a stavy bodů se na konci přestaví dávkovými přepočty
+- všichni generovaní zákazníci mají heslo HESLO (hash se počítá jednou)
+"""
+
+import csv
+import io
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select, text
+
+from .db import db
+from .loyalty import body_za_castku, prepocitat_body
+from .passwords import hashovat
+from .models import (
+    BodovyPohyb, Hodnoceni, Notifikace, Objednavka, Platba, PolozkaMenu,
+    PolozkaObjednavky, Rezervace, Role, Stul, VernostniUcet, Zakaznik, user_roles,
+)
+from .ratings import prepocitat_hodnoceni
+from .reporting import prepocitat_agregace
+
+HESLO = "heslo123"
+DAVKA_INSERT = 5000
+
+JMENA = ("Petr", "Jana", "Lukáš", "Eva", "Tomáš", "Marie", "Jakub", "Tereza", "Martin", "Lucie")
+PRIJMENI = ("Novák", "Svobodová", "Dvořák", "Černá", "Procházka", "Kučerová", "Veselý", "Horáková")
+STAVY_REZERVACE = ("potvrzená", "potvrzená", "potvrzená", "čekající", "zrušená")
+TYPY_PLATBY = ("karta", "karta", "hotovost", "online")
+KOMENTARE = (None, None, "Výborné!", "Příště zase.", "Trochu pomalá obsluha.", "Skvělá svíčková.")
+
+# tabulka → sloupce v pořadí, v jakém je generátor skládá do n-tic
+SLOUPCE = {
+    Zakaznik.__table__:          ("id_zakaznika", "jmeno", "prijmeni", "telefon", "email", "password"),
+    user_roles:                  ("zakaznik_id", "role_id"),
+    VernostniUcet.__table__:     ("id_ucet", "body", "datum_zalozeni", "id_zakaznika"),
+    Rezervace.__table__:         ("id_rezervace", "datum_cas", "pocet_osob", "stav_rezervace",
+                                  "id_zakaznika", "id_stul"),
+    Objednavka.__table__:        ("id_objednavky", "datum_cas", "stav", "celkova_castka", "id_zakaznika"),
+    PolozkaObjednavky.__table__: ("id_polozky_obj", "mnozstvi", "cena", "id_objednavky", "id_menu_polozka"),
+    Platba.__table__:            ("id_platba", "castka", "typ_platby", "datum", "id_objednavky"),
+    BodovyPohyb.__table__:       ("id_pohyb", "id_ucet", "body", "duvod", "id_platba", "datum"),
+    Hodnoceni.__table__:         ("id_hodnoceni", "hodnoceni", "komentar", "datum",
+                                  "id_objednavky", "id_zakaznika"),
+    Notifikace.__table__:        ("id_notifikace", "typ", "datum_cas", "text", "id_rezervace",
+                                  "id_objednavky", "stav", "pokusy", "odeslano"),
+}
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Nahrávání
+# ──────────────────────────────────────────────────────────────────────────────
+def _copy(conn, tabulka, sloupce, radky):
+    raw = conn.connection.dbapi_connection
+    prikaz = f"COPY {tabulka.name} ({', '.join(sloupce)}) FROM STDIN"
+    with raw.cursor() as cur:
+        if conn.dialect.driver == "psycopg":
+            with cur.copy(prikaz) as copy:
+                for r in radky:
+                    copy.write_row(r)
+        else:  # psycopg2
+            buf = io.StringIO()
+            csv.writer(buf).writerows(radky)      # None → prázdné pole = NULL
+            buf.seek(0)
+            cur.copy_expert(prikaz + " WITH (FORMAT csv)", buf)
+
+
+def nahrat(conn, tabulka, radky):
+    """Nahraje n-tice ve sloupcích SLOUPCE[tabulka]."""
+    if not radky:
+        return
+    sloupce = SLOUPCE[tabulka]
+    if conn.dialect.name == "postgresql":
+        _copy(conn, tabulka, sloupce, radky)
+        return
+    for i in range(0, len(radky), DAVKA_INSERT):
+        conn.execute(tabulka.insert(), [dict(zip(sloupce, r)) for r in radky[i:i + DAVKA_INSERT]])
+
+
+def _srovnat_sekvence(conn):
+    """Po COPY s explicitními id posune sekvence PK za maxima (jen Postgres)."""
+    if conn.dialect.name != "postgresql":
+        return
+    for tabulka in SLOUPCE:
+        pk = list(tabulka.primary_key.columns)
+        if len(pk) != 1:
+            continue
+        conn.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{tabulka.name}', '{pk[0].name}'), "
+            f"COALESCE((SELECT max({pk[0].name}) FROM {tabulka.name}), 0) + 1, false)"
+        ))
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Generování
+# ──────────────────────────────────────────────────────────────────────────────
+def _rozdelit(celkem, pocet, index):
+    """Kolik z `celkem` připadne `index`-tému z `pocet` (rovnoměrně, součet sedí)."""
+    return celkem // pocet + (1 if index < celkem % pocet else 0)
+
+
+def _dalsi_id(conn, sloupec):
+    return (conn.scalar(select(func.max(sloupec))) or 0) + 1
+
+
+def email_zakaznika(id_zakaznika):
+    return f"zakaznik{id_zakaznika}@example.com"
+
+
+def generovat(zakazniku, objednavek, rezervaci, seed=42, davka=10_000,
+              polozek_max=4, podil_hodnoceni=0.3, dni_historie=365, prubeh=None):
+    """
+    Vygeneruje a nahraje data, na konci přepočítá odvozené tabulky.
+    prubeh(tabulka → počet) se volá po každé dávce. Vrací celkové počty řádků.
+    """
+    conn = db.session.connection()
+    role_user = conn.scalar(select(Role.id_role).where(Role.name == "user"))
+    if role_user is None:
+        role_user = conn.execute(Role.__table__.insert().values(
+            name="user", description="Koncový zákazník")).inserted_primary_key[0]
+    if not conn.scalar(select(func.count()).select_from(Stul)):
+        cislo = _dalsi_id(conn, Stul.cislo)
+        conn.execute(Stul.__table__.insert(), [
+            {"cislo": cislo + i, "kapacita": (2, 4, 4, 6, 8)[i % 5]} for i in range(40)
+        ])
+    stoly = conn.scalars(select(Stul.id_stul)).all()
+    menu = conn.execute(select(PolozkaMenu.id_menu_polozka, PolozkaMenu.cena)).all()
+    if not menu:
+        raise ValueError("Menu je prázdné – objednávky nemají z čeho vybírat.")
+
+    ids = {t: _dalsi_id(conn, t.c[SLOUPCE[t][0]]) for t in SLOUPCE if t is not user_roles}
+    hash_hesla = hashovat(HESLO)
+    ted = datetime.now().replace(microsecond=0)
+    zacatek_historie = ted - timedelta(days=dni_historie)
+    celkem = dict.fromkeys((t.name for t in SLOUPCE), 0)
+
+    def nove_id(tabulka):
+        hodnota = ids[tabulka]
+        ids[tabulka] += 1
+        return hodnota
+
+    for cislo_davky, od in enumerate(range(0, zakazniku, davka)):
+        # generátor se seeduje po dávkách: stejný seed + davka = stejná data
+        rnd = random.Random(seed * 1_000_003 + cislo_davky)
+        radky = {t: [] for t in SLOUPCE}
+
+        for i in range(od, min(od + davka, zakazniku)):
+            id_zak = nove_id(Zakaznik.__table__)
+            radky[Zakaznik.__table__].append((
+                id_zak, rnd.choice(JMENA), rnd.choice(PRIJMENI),
+                f"+420{rnd.randint(600_000_000, 799_999_999)}", email_zakaznika(id_zak), hash_hesla,
+            ))
+            radky[user_roles].append((id_zak, role_user))
+            zalozeni = zacatek_historie + timedelta(days=rnd.randint(0, dni_historie // 2))
+            id_ucet = nove_id(VernostniUcet.__table__)
+            radky[VernostniUcet.__table__].append((id_ucet, 0, zalozeni.date(), id_zak))
+
+            for _ in range(_rozdelit(rezervaci, zakazniku, i)):
+                id_rez = nove_id(Rezervace.__table__)
+                kdy = zalozeni + timedelta(minutes=rnd.randint(0, (dni_historie + 30) * 24 * 60))
+                kdy = kdy.replace(minute=kdy.minute // 15 * 15, second=0)
+                radky[Rezervace.__table__].append((
+                    id_rez, kdy, rnd.randint(1, 8), rnd.choice(STAVY_REZERVACE), id_zak, rnd.choice(stoly),
+                ))
+                radky[Notifikace.__table__].append((
+                    nove_id(Notifikace.__table__), "email", kdy - timedelta(days=1),
+                    "Rezervace byla přijata.", id_rez, None, "odeslano", 1, kdy - timedelta(days=1),
+                ))
+
+            for _ in range(_rozdelit(objednavek, zakazniku, i)):
+                id_obj = nove_id(Objednavka.__table__)
+                kdy = zalozeni + timedelta(seconds=rnd.randint(0, dni_historie * 86_400 // 2))
+                castka = 0
+                for id_menu, cena in rnd.sample(menu, k=min(len(menu), rnd.randint(1, polozek_max))):
+                    mnozstvi = rnd.choice((1, 1, 1, 2, 2, 3))
+                    castka += mnozstvi * cena
+                    radky[PolozkaObjednavky.__table__].append((
+                        nove_id(PolozkaObjednavky.__table__), mnozstvi, cena, id_obj, id_menu,
+                    ))
+                zaplaceno = rnd.random() < 0.95
+                radky[Objednavka.__table__].append((
+                    id_obj, kdy, "zaplacená" if zaplaceno else "nová", castka, id_zak,
+                ))
+                radky[Notifikace.__table__].append((
+                    nove_id(Notifikace.__table__), "email", kdy, "Vaše objednávka byla přijata.",
+                    None, id_obj, "odeslano", 1, kdy,
+                ))
+                if not zaplaceno:
+                    continue
+                id_platba = nove_id(Platba.__table__)
+                platba_kdy = kdy + timedelta(minutes=rnd.randint(20, 120))
+                radky[Platba.__table__].append((id_platba, castka, rnd.choice(TYPY_PLATBY),
+                                                platba_kdy, id_obj))
+                body = body_za_castku(castka)
+                if body:
+                    radky[BodovyPohyb.__table__].append((
+                        nove_id(BodovyPohyb.__table__), id_ucet, body, "platba", id_platba, platba_kdy,
+                    ))
+                if rnd.random() < podil_hodnoceni:
+                    radky[Hodnoceni.__table__].append((
+                        nove_id(Hodnoceni.__table__), rnd.choices((1, 2, 3, 4, 5), (1, 1, 3, 6, 9))[0],
+                        rnd.choice(KOMENTARE), platba_kdy + timedelta(hours=2), id_obj, id_zak,
+                    ))
+
+        for tabulka, seznam in radky.items():      # SLOUPCE je v pořadí cizích klíčů
+            nahrat(conn, tabulka, seznam)
+            celkem[tabulka.name] += len(seznam)
+        db.session.commit()
+        conn = db.session.connection()
+        if prubeh:
+            prubeh(celkem)
+
+    _srovnat_sekvence(conn)
+    db.session.commit()
+
+    # odvozené tabulky (hromadné nahrání neprošlo session událostmi)
+    prepocitat_agregace()
+    prepocitat_hodnoceni()
+    db.session.commit()
+    prepocitat_body()
+    if db.session.get_bind().dialect.name == "postgresql":
+        db.session.execute(text("ANALYZE"))
+        db.session.commit()
+    return celkem
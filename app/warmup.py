@@ -0,0 +1,133 @@
+# app/warmup.py
+
+"""
+Zahřátí workeru před přijímáním provozu a připravenost (GET /ready).
+
+- zahrat(app): otevře WARMUP_SPOJENI spojení DB poolu, vytvoří instance všech
+  schémat z app/schemas.py a projde reprezentativní dotazy (seznamy se
+  serializací, dnešní menu, hledání, kontrola blocklistu JWT) → naplní se
+  cache SQL kompilace, lazy importy dialektu, cache menu a index hledání
+- gunicorn (gunicorn.conf.py): zahřeje se master po preloadu (workery zdědí
+  cache forkem), pak každý worker v post_worker_init (vlastní spojení poolu)
+- GET /ready vrací 503, dokud zahřátí v tomto procesu neproběhlo; pokud
+  selhalo (DB ještě neběží) nebo ho nikdo nespustil (flask run), zkusí ho
+  probe znovu nejvýš jednou za WARMUP_OPAKOVANI_S
+- WARMUP=False → /ready je připravené hned (testy)
+"""
+
+import threading
+import time
+
+from flask import current_app
+from marshmallow import Schema
+from sqlalchemy import select, text
+
+from . import schemas
+from .daily_menu import dnesni_nabidka
+from .db import db
+from .models import Notifikace, Objednavka, PolozkaMenu, Rezervace, TokenBlacklist, Zakaznik
+from .search import hledat_menu
+
+# model → schéma seznamu, jak je vrací API
+SEZNAMY = (
+    (Zakaznik,    schemas.ZakaznikSchema),
+    (Rezervace,   schemas.RezervaceSchema),
+    (Objednavka,  schemas.ObjednavkaSchema),
+    (PolozkaMenu, schemas.PolozkaMenuSchema),
+    (Notifikace,  schemas.NotifikaceSchema),
+)
+
+
+class _Stav:
+    def __init__(self):
+        self.pripraveno = threading.Event()
+        self.zamek = threading.Lock()
+        self.posledni_pokus = None
+
+
+def _stav(app=None):
+    return (app or current_app).extensions["warmup"]
+
+
+def _naplnit_pool(pocet):
+    spojeni = []
+    try:
+        for _ in range(pocet):
+            conn = db.engine.connect()
+            spojeni.append(conn)
+            conn.execute(text("SELECT 1"))
+    finally:
+        for conn in spojeni:
+            conn.close()
+
+
+def _schemata():
+    for hodnota in vars(schemas).values():
+        if isinstance(hodnota, type) and issubclass(hodnota, Schema) and hodnota is not Schema:
+            hodnota()
+            hodnota(many=True)
+
+
+def _dotazy(radku):
+    for model, schema in SEZNAMY:
+        polozky = db.session.scalars(select(model).limit(radku)).all()
+        current_app.json.dumps(schema(many=True).dump(polozky))
+    dnesni_nabidka(schemas.PolozkaMenuSchema())
+    hledat_menu("pizza")
+    db.session.query(TokenBlacklist).filter_by(jti="").first()
+
+
+def zahrat(app):
+    """Zahřeje proces; True = připraveno. Souběžné volání nečeká a vrací False."""
+    stav = _stav(app)
+    if not stav.zamek.acquire(blocking=False):
+        return False
+    try:
+        stav.posledni_pokus = time.monotonic()
+        zacatek = time.perf_counter()
+        with app.app_context():
+            pool = db.engine.pool
+            pocet = app.config.get("WARMUP_SPOJENI") or getattr(pool, "size", lambda: 1)()
+            try:
+                _naplnit_pool(pocet)
+                _schemata()
+                _dotazy(app.config.get("WARMUP_RADKU", 20))
+            except Exception as exc:
+                # detail (adresa DB, chyba ovladače) jen do logu, /ready ho neukazuje
+                app.logger.warning("Zahřátí selhalo: %r", exc)
+                return False
+            finally:
+                db.session.remove()
+        stav.pripraveno.set()
+        app.logger.info("Zahřáto za %.0f ms (%d spojení).",
+                        (time.perf_counter() - zacatek) * 1000, pocet)
+        return True
+    finally:
+        stav.zamek.release()
+
+
+def po_forku(app):
+    """gunicorn post_fork: worker nesmí sdílet spojení mastera a musí se zahřát sám."""
+    with app.app_context():
+        db.engine.dispose(close=False)
+    stav = _stav(app)
+    stav.pripraveno.clear()
+    stav.posledni_pokus = None
+
+
+def pripravenost_view():
+    stav = _stav()
+    if not stav.pripraveno.is_set():
+        opakovat_s = current_app.config.get("WARMUP_OPAKOVANI_S", 5)
+        if stav.posledni_pokus is None or time.monotonic() - stav.posledni_pokus >= opakovat_s:
+            zahrat(current_app._get_current_object())
+    if not stav.pripraveno.is_set():
+        return {"status": "zahrivani"}, 503, {"Retry-After": "1"}
+    return {"status": "pripraveno"}
+
+
+def init_app(app):
+    app.extensions["warmup"] = stav = _Stav()
+    if not app.config.get("WARMUP", True):
+        stav.pripraveno.set()
+    app.add_url_rule("/ready", "pripravenost", pripravenost_view)
@@ -0,0 +1,215 @@
+# benchmarks/bench_endpoints.py
+
+"""
+Benchmark hlavních endpointů přes Flask test client.
+
+    python -m benchmarks.bench_endpoints run [--zakazniku 500] [--opakovani 20]
+                                            [--db URL] [--vystup vysledky.json]
+    python -m benchmarks.bench_endpoints compare zaklad.json vysledky.json [--prah 0.2]
+
+run: naplní databázi (výchozí dočasná SQLite) generátorem app/seed_large.py
+a pro každý scénář změří latenci (p50 / p95 / p99), propustnost a počet
+SQL dotazů na request.
+compare: porovná dva výsledky a skončí kódem 1, pokud některý scénář
+zpomalil o víc než --prah (a aspoň o --min-ms) nebo přibyly dotazy.
+
+Základ se ukládá z hlavní větve na stejném stroji, např.
+benchmarks/vysledky/zaklad.json (adresář vysledky/ není v gitu).
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")   # import app.config to vyžaduje
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import create_engine
+
+from app import create_app
+from app.config import TestingConfig
+from app.db import db
+from app.instrumentation import sbirat
+from app.seed_large import HESLO, email_zakaznika, generovat
+
+# (název, metoda, cesta, tělo) – seznamy generované register_crud jsou na konci
+SCENARE = [
+    ("menu",            "GET",  "/api/menu", None),
+    ("menu_dnes",       "GET",  "/api/menu/dnes", None),
+    ("menu_hledat",     "GET",  "/api/menu/hledat?q=svickova", None),
+    ("rezervace",       "GET",  "/api/rezervace", None),
+    ("objednavka",      "GET",  "/api/objednavka", None),
+    ("zakaznik",        "GET",  "/api/zakaznik", None),
+    ("login",           "POST", "/api/auth/login", {"email": email_zakaznika(1), "password": HESLO}),
+    *[(f"crud_{r}", "GET", f"/api/{r}", None) for r in (
+        "ucet", "stul", "salonek", "akce", "polozka-objednavky", "platba",
+        "hodnoceni", "notifikace", "jidelni-plan", "polozka-planu", "alergen",
+    )],
+]
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Měření
+# ──────────────────────────────────────────────────────────────────────────────
+def percentil(hodnoty, p):
+    serazene = sorted(hodnoty)
+    return serazene[min(len(serazene) - 1, int(round(p / 100 * (len(serazene) - 1))))]
+
+
+def zmerit(client, metoda, cesta, telo, hlavicky, opakovani, zahrati=3):
+    for _ in range(zahrati):
+        client.open(cesta, method=metoda, json=telo, headers=hlavicky)
+    casy, dotazy, stavy = [], [], set()
+    zacatek = time.perf_counter()
+    for _ in range(opakovani):
+        with sbirat() as sbernice:
+            t0 = time.perf_counter()
+            resp = client.open(cesta, method=metoda, json=telo, headers=hlavicky)
+            resp.get_data()
+            casy.append(time.perf_counter() - t0)
+        dotazy.append(sbernice.pocet)
+        stavy.add(resp.status_code)
+    celkem = time.perf_counter() - zacatek
+    return {
+        "p50_ms": round(percentil(casy, 50) * 1000, 3),
+        "p95_ms": round(percentil(casy, 95) * 1000, 3),
+        "p99_ms": round(percentil(casy, 99) * 1000, 3),
+        "prumer_ms": round(statistics.fmean(casy) * 1000, 3),
+        "rps": round(opakovani / celkem, 1),
+        "dotazu": int(statistics.median(dotazy)),
+        "status": sorted(stavy),
+        "velikost_b": len(resp.get_data()),
+    }
+
+
+def vytvorit_aplikaci(uri):
+    # create_app při startu seeduje menu → schéma musí existovat napřed
+    engine = create_engine(uri)
+    db.metadata.create_all(engine)
+    engine.dispose()
+
+    class Cfg(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = uri
+        JWT_SECRET_KEY = "bench-secret-klic-jen-pro-mereni-endpointu"
+        SQL_INSTRUMENTACE = False
+        SQL_POMALY_REQUEST_MS = 0
+
+    return create_app("testing", config_override=Cfg)
+
+
+def spustit(args):
+    uri = args.db or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.sqlite')}"
+    app = vytvorit_aplikaci(uri)
+    vysledky = {}
+    with app.app_context():
+        if not args.bez_seedu:
+            t0 = time.perf_counter()
+            generovat(args.zakazniku, objednavek=args.zakazniku * 3, rezervaci=args.zakazniku * 2)
+            print(f"data: {args.zakazniku} zákazníků za {time.perf_counter() - t0:.1f} s", file=sys.stderr)
+        token = create_access_token(identity="1", additional_claims={"roles": ["staff", "admin"]})
+        hlavicky = {"Authorization": f"Bearer {token}"}
+        client = app.test_client()
+        for nazev, metoda, cesta, telo in SCENARE:
+            if args.jen and nazev not in args.jen:
+                continue
+            opakovani = max(3, args.opakovani // 5) if nazev == "login" else args.opakovani
+            vysledky[nazev] = zmerit(client, metoda, cesta, telo, hlavicky, opakovani)
+            v = vysledky[nazev]
+            print(f"{nazev:>26}: p50 {v['p50_ms']:8.2f} ms  p95 {v['p95_ms']:8.2f} ms  "
+                  f"{v['rps']:7.1f} req/s  {v['dotazu']:3d} dotazů  {v['status']}", file=sys.stderr)
+        dialekt = db.engine.dialect.name
+
+    vystup = {
+        "meta": {
+            "cas": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "stroj": platform.node(),
+            "db": dialekt,
+            "zakazniku": args.zakazniku,
+            "opakovani": args.opakovani,
+        },
+        "vysledky": vysledky,
+    }
+    text = json.dumps(vystup, ensure_ascii=False, indent=2)
+    if args.vystup:
+        os.makedirs(os.path.dirname(os.path.abspath(args.vystup)), exist_ok=True)
+        with open(args.vystup, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Porovnání
+# ──────────────────────────────────────────────────────────────────────────────
+def porovnat(zaklad, novy, prah=0.2, min_ms=1.0):
+    """Vrací [(scénář, metrika, základ, nová hodnota)] pro zhoršení nad práh."""
+    regrese = []
+    for nazev, n in novy["vysledky"].items():
+        z = zaklad["vysledky"].get(nazev)
+        if z is None:
+            continue
+        for metrika in ("p50_ms", "p95_ms"):
+            if n[metrika] > z[metrika] * (1 + prah) and n[metrika] - z[metrika] >= min_ms:
+                regrese.append((nazev, metrika, z[metrika], n[metrika]))
+        if n["dotazu"] > z["dotazu"]:
+            regrese.append((nazev, "dotazu", z["dotazu"], n["dotazu"]))
+    return regrese
+
+
+def compare(args):
+    with open(args.zaklad, encoding="utf-8") as f:
+        zaklad = json.load(f)
+    with open(args.novy, encoding="utf-8") as f:
+        novy = json.load(f)
+    if zaklad["meta"].get("zakazniku") != novy["meta"].get("zakazniku"):
+        print("Pozor: výsledky jsou z různě velkých dat.", file=sys.stderr)
+
+    for nazev, n in novy["vysledky"].items():
+        z = zaklad["vysledky"].get(nazev)
+        if z is None:
+            print(f"{nazev:>26}: nový scénář")
+            continue
+        zmena = (n["p50_ms"] - z["p50_ms"]) / z["p50_ms"] * 100 if z["p50_ms"] else 0
+        print(f"{nazev:>26}: p50 {z['p50_ms']:8.2f} → {n['p50_ms']:8.2f} ms ({zmena:+6.1f} %)  "
+              f"dotazů {z['dotazu']} → {n['dotazu']}")
+
+    regrese = porovnat(zaklad, novy, args.prah, args.min_ms)
+    for nazev, metrika, puvodni, nove in regrese:
+        print(f"REGRESE {nazev} {metrika}: {puvodni} → {nove}")
+    return 1 if regrese else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    prikazy = parser.add_subparsers(dest="prikaz", required=True)
+
+    run = prikazy.add_parser("run", help="naplnit data a změřit endpointy")
+    run.add_argument("--zakazniku", type=int, default=500)
+    run.add_argument("--opakovani", type=int, default=20)
+    run.add_argument("--db", help="URI databáze (výchozí dočasná SQLite)")
+    run.add_argument("--bez-seedu", action="store_true", help="databáze už je naplněná")
+    run.add_argument("--jen", nargs="*", help="jen vybrané scénáře")
+    run.add_argument("--vystup", help="kam uložit JSON (jinak stdout)")
+
+    cmp_ = prikazy.add_parser("compare", help="porovnat výsledek se základem")
+    cmp_.add_argument("zaklad")
+    cmp_.add_argument("novy")
+    cmp_.add_argument("--prah", type=float, default=0.2, help="povolené zpomalení (0.2 = 20 %%)")
+    cmp_.add_argument("--min-ms", type=float, default=1.0, help="menší rozdíly jsou šum")
+
+    args = parser.parse_args()
+    if args.prikaz == "run":
+        spustit(args)
+    else:
+        sys.exit(compare(args))
+
+
+if __name__ == "__main__":
+    main()
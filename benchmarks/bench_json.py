@@ -0,0 +1,83 @@
+# benchmarks/bench_json.py
+
+"""
+Srovnání JSON providerů na odpovědi velikosti „velké menu / seznam objednávek“.
+
+    python -m benchmarks.bench_json [--polozek 2000] [--opakovani 50]
+
+Měří app.json.response() (to volá jsonify i flask-smorest) pro Flask
+DefaultJSONProvider a OrjsonProvider a ověří, že oba vrací stejné bajty.
+"""
+
+import argparse
+import os
+import statistics
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")   # import app.config to vyžaduje
+
+from flask import Flask
+
+from app.json_provider import JSON_PROVIDERY
+
+
+def payload(polozek):
+    """Data ve tvaru po marshmallow dumpu + pár hodnot, které převádí až provider."""
+    zacatek = datetime(2025, 1, 1, 12)
+    return [
+        {
+            "id_menu_polozka": i,
+            "nazev": f"Svíčková na smetaně č. {i}",
+            "popis": "hovězí svíčková, domácí houskový knedlík, brusinky, smetanová omáčka",
+            "cena": f"{199 + i % 300}.00",
+            "kategorie": "stálá nabídka",
+            "den": "Čtvrtek",
+            "alergeny": [{"id_alergenu": 1, "nazev": "Lepek"}, {"id_alergenu": 2, "nazev": "Mléko"}],
+            "hodnoceni": {"pocet": i % 40, "prumer": 4.25,
+                          "rozlozeni": {str(h): i % (h + 2) for h in range(1, 6)}},
+            "celkova_castka": Decimal("1234.50") + i,
+            "datum_cas": zacatek + timedelta(minutes=i),
+            "den_objednavky": date(2025, 1, 1) + timedelta(days=i % 30),
+        }
+        for i in range(polozek)
+    ]
+
+
+def zmerit(provider_cls, data, opakovani):
+    app = Flask(__name__)
+    app.json = provider_cls(app)
+    app.json.ensure_ascii = False
+    casy = []
+    with app.app_context():
+        vystup = app.json.response(data).get_data()
+        for _ in range(opakovani):
+            t0 = time.perf_counter()
+            app.json.response(data).get_data()
+            casy.append(time.perf_counter() - t0)
+    return vystup, casy
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--polozek", type=int, default=2000)
+    parser.add_argument("--opakovani", type=int, default=50)
+    args = parser.parse_args()
+
+    data = payload(args.polozek)
+    vysledky = {nazev: zmerit(cls, data, args.opakovani) for nazev, cls in JSON_PROVIDERY.items()}
+
+    vystupy = {v for v, _ in vysledky.values()}
+    print(f"položek: {args.polozek}, velikost: {len(next(iter(vystupy))) / 1024:.0f} KiB, "
+          f"shodný výstup: {'ano' if len(vystupy) == 1 else 'NE'}")
+    zaklad = statistics.median(vysledky["default"][1])
+    for nazev, (_, casy) in vysledky.items():
+        median = statistics.median(casy)
+        print(f"{nazev:>8}: medián {median * 1000:7.2f} ms, p95 "
+              f"{sorted(casy)[int(len(casy) * 0.95) - 1] * 1000:7.2f} ms, "
+              f"zrychlení {zaklad / median:4.1f}×")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,356 @@
+# benchmarks/replay.py
+
+"""
+Přehrávání zaznamenaného provozu (zátěžový test).
+
+    python -m benchmarks.replay generovat [--pocet 3000] [--delka 120] > obed.jsonl
+    python -m benchmarks.replay prehrat obed.jsonl [--url http://localhost:8000]
+                                [--vlakna 16] [--rychlost 50 | --zrychleni 2]
+                                [--ucet staff=email:heslo] [--token admin=admin_token.txt]
+                                [--vystup zprava.json]
+
+Záznam = JSONL, jeden request na řádek:
+    {"t": 0.35, "method": "GET", "path": "/api/menu", "role": "anon"}
+    {"t": 0.41, "method": "POST", "path": "/api/auth/login", "role": "user",
+     "body": {"email": "{{email}}", "password": "{{heslo}}"}}
+- t = sekundy od začátku záznamu (volitelné), role = anon | user | staff | admin
+- {{email}} / {{heslo}} v těle se nahradí přihlašovacími údaji role
+- autorizace se nenahrává – každá role dostane čerstvý token:
+  in-process se podepíše klíčem aplikace, přes HTTP se role přihlásí
+  (výchozí účty z flask seed-db) nebo se token vezme ze souboru (--token)
+
+Režimy:
+- bez --url: in-process přes Flask test client (každé vlákno vlastní client)
+  nad dočasnou SQLite naplněnou app/seed_large.py, nebo nad --db
+- s --url: HTTP proti běžící instanci (gunicorn), spojení keep-alive po vláknech
+Tempo: --rychlost = pevný počet req/s, --zrychleni = časy ze záznamu / X,
+jinak co nejrychleji (uzavřená smyčka s --vlakna souběžnými klienty).
+Zpráva: propustnost, percentily latence celkem i po endpointech, mix stavů
+a chyb, zpoždění oproti plánu (ukáže, že nestíhá generátor, ne server).
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")   # import app.config to vyžaduje
+
+from benchmarks.bench_endpoints import percentil, vytvorit_aplikaci
+
+# výchozí účty z `flask seed-db` pro přihlášení přes HTTP
+UCTY_SEED_DB = {
+    "user":  ("petr.svoboda@example.cz", "tajneheslo1"),
+    "staff": ("anna.staff@example.com", "heslo123"),
+    "admin": ("admin@example.com", "rootpass"),
+}
+ROLE = ("anon", "user", "staff", "admin")
+_ID_V_CESTE = re.compile(r"/\d+(?=/|$)")
+
+
+def endpoint(zaznam):
+    """GET /api/menu/12?x=1 → GET /api/menu/{id} (skupina pro zprávu)."""
+    cesta = _ID_V_CESTE.sub("/{id}", zaznam["path"].split("?", 1)[0])
+    return f"{zaznam['method']} {cesta}"
+
+
+def nacist(cesta):
+    with open(cesta, encoding="utf-8") as f:
+        return [json.loads(radek) for radek in f if radek.strip()]
+
+
+def _dosadit(telo, email, heslo):
+    if telo is None:
+        return None
+    text = json.dumps(telo, ensure_ascii=False)
+    return json.loads(text.replace("{{email}}", email or "").replace("{{heslo}}", heslo or ""))
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Syntetický záznam „polední špička“
+# ──────────────────────────────────────────────────────────────────────────────
+# (váha, role, metoda, cesta, tělo)
+MIX_OBED = [
+    (30, "anon",  "GET",  "/api/menu/dnes", None),
+    (15, "anon",  "GET",  "/api/menu", None),
+    (8,  "anon",  "GET",  "/api/menu/hledat?q={hledani}", None),
+    (6,  "anon",  "GET",  "/api/menu/{id_menu}", None),
+    (8,  "user",  "POST", "/api/auth/login", {"email": "{{email}}", "password": "{{heslo}}"}),
+    (6,  "user",  "GET",  "/api/auth/me", None),
+    (6,  "user",  "GET",  "/api/rezervace", None),
+    (4,  "user",  "POST", "/api/rezervace", "rezervace"),
+    (8,  "staff", "GET",  "/api/objednavka", None),
+    (4,  "staff", "GET",  "/api/rezervace", None),
+    (3,  "staff", "GET",  "/api/hodnoceni/statistiky", None),
+    (2,  "admin", "GET",  "/api/reporty/trzby", None),
+]
+HLEDANI = ("svickova", "burger", "salat", "pizza", "rizek", "brownies", "kulajda")
+
+
+def generovat_obed(pocet, delka_s, seed=1):
+    """Příchody podle Poissonova procesu s náběhem a doběhem špičky."""
+    rnd = random.Random(seed)
+    vahy = [m[0] for m in MIX_OBED]
+    zaznamy, t = [], 0.0
+    for i in range(pocet):
+        # intenzita od 40 % průměru roste do poloviny na 160 % a zase klesá;
+        # průměr = pocet / delka
+        spicka = 2 * min(i, pocet - 1 - i) / max(pocet - 1, 1)
+        t += rnd.expovariate(pocet / delka_s * (0.4 + 1.2 * spicka))
+        _, role, metoda, cesta, telo = rnd.choices(MIX_OBED, vahy)[0]
+        cesta = cesta.format(hledani=rnd.choice(HLEDANI), id_menu=rnd.randint(1, 21))
+        if telo == "rezervace":
+            kdy = datetime.now().replace(minute=0, second=0, microsecond=0) + timedelta(
+                days=rnd.randint(1, 14), hours=rnd.randint(0, 8))
+            telo = {"datum_cas": kdy.isoformat(), "pocet_osob": rnd.randint(1, 6),
+                    "id_stul": rnd.randint(1, 10)}
+        zaznam = {"t": round(t, 3), "method": metoda, "path": cesta, "role": role}
+        if telo is not None:
+            zaznam["body"] = telo
+        zaznamy.append(zaznam)
+    return zaznamy
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Cíle: in-process a HTTP
+# ──────────────────────────────────────────────────────────────────────────────
+class InProcess:
+    def __init__(self, app, id_uzivatele):
+        from flask_jwt_extended import create_access_token
+        from app.seed_large import HESLO, email_zakaznika
+
+        self.app = app
+        self._lokalni = threading.local()
+        self.hlavicky, self.ucty = {}, {}
+        with app.app_context():
+            for role in ROLE[1:]:
+                id_ = id_uzivatele if role == "user" else 1
+                token = create_access_token(identity=str(id_), additional_claims={"roles": [role]})
+                self.hlavicky[role] = {"Authorization": f"Bearer {token}"}
+                self.ucty[role] = (email_zakaznika(id_), HESLO)
+        self.hlavicky["anon"], self.ucty["anon"] = {}, (None, None)
+
+    def poslat(self, metoda, cesta, telo, role):
+        client = getattr(self._lokalni, "client", None)
+        if client is None:
+            client = self._lokalni.client = self.app.test_client()
+        resp = client.open(cesta, method=metoda, json=telo, headers=self.hlavicky[role])
+        resp.get_data()
+        return resp.status_code
+
+
+class Http:
+    def __init__(self, url, ucty, tokeny, timeout=30):
+        casti = urlsplit(url)
+        self.https = casti.scheme == "https"
+        self.host = casti.netloc
+        self.timeout = timeout
+        self._lokalni = threading.local()
+        self.ucty = {"anon": (None, None), **UCTY_SEED_DB, **ucty}
+        self.hlavicky = {"anon": {}}
+        for role in ROLE[1:]:
+            if role in tokeny:
+                token = tokeny[role]
+            else:
+                email, heslo = self.ucty[role]
+                status, telo = self._pozadavek("POST", "/api/auth/login",
+                                               {"email": email, "password": heslo}, {})
+                if status != 200:
+                    raise SystemExit(f"Přihlášení role {role} ({email}) selhalo: {status}")
+                token = json.loads(telo)["access_token"]
+            self.hlavicky[role] = {"Authorization": f"Bearer {token}"}
+
+    def _spojeni(self):
+        conn = getattr(self._lokalni, "conn", None)
+        if conn is None:
+            trida = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+            conn = self._lokalni.conn = trida(self.host, timeout=self.timeout)
+        return conn
+
+    def _pozadavek(self, metoda, cesta, telo, hlavicky):
+        data = None
+        hlavicky = dict(hlavicky)
+        if telo is not None:
+            data = json.dumps(telo).encode()
+            hlavicky["Content-Type"] = "application/json"
+        conn = self._spojeni()
+        try:
+            conn.request(metoda, cesta, body=data, headers=hlavicky)
+            resp = conn.getresponse()
+        except (http.client.HTTPException, OSError):
+            # server spojení zavřel (keep-alive timeout) → jeden nový pokus
+            conn.close()
+            self._lokalni.conn = None
+            conn = self._spojeni()
+            conn.request(metoda, cesta, body=data, headers=hlavicky)
+            resp = conn.getresponse()
+        return resp.status, resp.read()
+
+    def poslat(self, metoda, cesta, telo, role):
+        return self._pozadavek(metoda, cesta, telo, self.hlavicky[role])[0]
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Přehrání a zpráva
+# ──────────────────────────────────────────────────────────────────────────────
+def prehrat(cil, zaznamy, vlakna=8, rychlost=None, zrychleni=None):
+    """Vrátí [(endpoint, status | název výjimky, latence_s, zpozdeni_s)]."""
+    if rychlost:
+        plan = [i / rychlost for i in range(len(zaznamy))]
+    elif zrychleni:
+        t0 = zaznamy[0].get("t", 0) if zaznamy else 0
+        plan = [(z.get("t", 0) - t0) / zrychleni for z in zaznamy]
+    else:
+        plan = None
+    vysledky = [None] * len(zaznamy)
+    start = time.perf_counter()
+
+    def jeden(i):
+        z = zaznamy[i]
+        zpozdeni = 0.0
+        if plan is not None:
+            cekat = start + plan[i] - time.perf_counter()
+            if cekat > 0:
+                time.sleep(cekat)
+            else:
+                zpozdeni = -cekat
+        role = z.get("role", "anon")
+        telo = _dosadit(z.get("body"), *cil.ucty[role])
+        t0 = time.perf_counter()
+        try:
+            status = cil.poslat(z["method"], z["path"], telo, role)
+        except Exception as e:  # noqa: BLE001 – chyby patří do zprávy
+            status = type(e).__name__
+        vysledky[i] = (endpoint(z), status, time.perf_counter() - t0, zpozdeni)
+
+    with ThreadPoolExecutor(max_workers=vlakna) as pool:
+        list(pool.map(jeden, range(len(zaznamy))))
+    return vysledky, time.perf_counter() - start
+
+
+def _latence(casy):
+    if not casy:    # prázdný záznam / filtr → nuly místo ValueError
+        return dict.fromkeys(("p50_ms", "p90_ms", "p95_ms", "p99_ms", "max_ms"), 0.0)
+    return {f"p{p}_ms": round(percentil(casy, p) * 1000, 2) for p in (50, 90, 95, 99)} | {
+        "max_ms": round(max(casy) * 1000, 2)}
+
+
+def zprava(vysledky, trvani):
+    po_endpointech = defaultdict(list)
+    stavy, chyby = Counter(), Counter()
+    for ep, status, latence, _ in vysledky:
+        po_endpointech[ep].append((status, latence))
+        if isinstance(status, int):
+            stavy[f"{status // 100}xx"] += 1
+            if status >= 400:
+                chyby[f"{status} {ep}"] += 1
+        else:
+            stavy["výjimka"] += 1
+            chyby[f"{status} {ep}"] += 1
+    return {
+        "requestu": len(vysledky),
+        "trvani_s": round(trvani, 2),
+        "rps": round(len(vysledky) / trvani, 1) if trvani else None,
+        "latence": _latence([v[2] for v in vysledky]),
+        "zpozdeni_max_ms": round(max((v[3] for v in vysledky), default=0) * 1000, 1),
+        "stavy": dict(stavy),
+        "chyby": dict(chyby.most_common(20)),
+        "endpointy": {
+            ep: {"pocet": len(r), "chyb": sum(1 for s, _ in r if not isinstance(s, int) or s >= 400),
+                 **_latence([l for _, l in r])}
+            for ep, r in sorted(po_endpointech.items(), key=lambda kv: -len(kv[1]))
+        },
+    }
+
+
+def vypsat(z):
+    print(f"{z['requestu']} requestů za {z['trvani_s']} s = {z['rps']} req/s, "
+          f"zpoždění za plánem max {z['zpozdeni_max_ms']} ms")
+    lat = z["latence"]
+    print(f"latence: p50 {lat['p50_ms']} ms, p95 {lat['p95_ms']} ms, p99 {lat['p99_ms']} ms, "
+          f"max {lat['max_ms']} ms")
+    print("stavy: " + ", ".join(f"{k}={v}" for k, v in sorted(z["stavy"].items())))
+    for ep, v in z["endpointy"].items():
+        print(f"  {ep:<36} {v['pocet']:6d}×  p50 {v['p50_ms']:8.2f}  p95 {v['p95_ms']:8.2f} ms"
+              f"  chyb {v['chyb']}")
+    for chyba, pocet in z["chyby"].items():
+        print(f"  ! {pocet}× {chyba}")
+
+
+def _dvojice(hodnoty, popis):
+    vysledek = {}
+    for h in hodnoty or ():
+        role, _, zbytek = h.partition("=")
+        if role not in ROLE[1:] or not zbytek:
+            raise SystemExit(f"{popis}: očekávám role=…, dostal jsem {h!r}")
+        vysledek[role] = zbytek
+    return vysledek
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    prikazy = parser.add_subparsers(dest="prikaz", required=True)
+
+    gen = prikazy.add_parser("generovat", help="syntetický záznam polední špičky (JSONL na stdout)")
+    gen.add_argument("--pocet", type=int, default=3000)
+    gen.add_argument("--delka", type=float, default=120, help="délka špičky [s]")
+    gen.add_argument("--seed", type=int, default=1)
+
+    pre = prikazy.add_parser("prehrat", help="přehrát záznam")
+    pre.add_argument("zaznam")
+    pre.add_argument("--url", help="HTTP cíl (jinak in-process test client)")
+    pre.add_argument("--db", help="in-process: URI databáze (jinak dočasná SQLite s daty)")
+    pre.add_argument("--zakazniku", type=int, default=500, help="in-process: velikost dat")
+    pre.add_argument("--vlakna", type=int, default=8)
+    tempo = pre.add_mutually_exclusive_group()
+    tempo.add_argument("--rychlost", type=float, help="pevné tempo [req/s]")
+    tempo.add_argument("--zrychleni", type=float, help="časy ze záznamu vydělit X")
+    pre.add_argument("--ucet", action="append", help="HTTP: role=email:heslo")
+    pre.add_argument("--token", action="append", help="HTTP: role=soubor s tokenem")
+    pre.add_argument("--vystup", help="uložit zprávu jako JSON")
+
+    args = parser.parse_args()
+    if args.prikaz == "generovat":
+        for z in generovat_obed(args.pocet, args.delka, args.seed):
+            print(json.dumps(z, ensure_ascii=False))
+        return
+
+    zaznamy = nacist(args.zaznam)
+    if args.url:
+        ucty = {r: tuple(h.split(":", 1)) for r, h in _dvojice(args.ucet, "--ucet").items()}
+        tokeny = {}
+        for role, soubor in _dvojice(args.token, "--token").items():
+            with open(soubor, encoding="utf-8") as f:
+                tokeny[role] = f.read().strip()
+        cil = Http(args.url, ucty, tokeny)
+    else:
+        from app.db import db
+        from app.seed_large import generovat
+
+        app = vytvorit_aplikaci(args.db or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'replay.sqlite')}")
+        if not args.db:
+            with app.app_context():
+                generovat(args.zakazniku, objednavek=args.zakazniku * 3, rezervaci=args.zakazniku * 2)
+                db.session.remove()
+        cil = InProcess(app, id_uzivatele=1)
+
+    vysledky, trvani = prehrat(cil, zaznamy, args.vlakna, args.rychlost, args.zrychleni)
+    z = zprava(vysledky, trvani)
+    vypsat(z)
+    if args.vystup:
+        with open(args.vystup, "w", encoding="utf-8") as f:
+            json.dump(z, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
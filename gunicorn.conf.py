@@ -0,0 +1,98 @@
+# gunicorn.conf.py
+
+"""
+Produkční spuštění:  gunicorn -c gunicorn.conf.py
+
+- preload: create_app (import modulů, seed menu, zahřátí) proběhne jednou
+  v masteru; workery ho zdědí forkem (copy-on-write) a startují hned
+- workery: GUNICORN_WORKERS, jinak 2 × jádra + 1 (jádra dostupná procesu –
+  v kontejneru s omezenou cpuset jen ta přidělená); gthread, protože SSE
+  (/api/udalosti/stream) drží vlákno po celou dobu spojení – streamy smí
+  zabrat nejvýš UDALOSTI_MAX_STREAMU vláken workeru (výchozí polovina
+  GUNICORN_THREADS), další obrazovky přejdou na long-poll (app/events.py)
+- recyklace workeru po GUNICORN_MAX_REQUESTS requestech (± jitter, ať se
+  nerestartují všechny naráz) – pojistka proti pomalému růstu paměti
+- graceful timeout: při SIGTERM / HUP mají rozjeté requesty čas doběhnout
+- zahřátí (app/warmup.py): master po preloadu, pak každý worker vlastním
+  poolem před prvním requestem; GET /ready do té doby vrací 503
+- Prometheus (app/metrics.py): víc workerů sdílí metriky přes soubory
+  v PROMETHEUS_MULTIPROC_DIR – nastavuje se tady, před importem aplikace
+"""
+
+import os
+import shutil
+import tempfile
+
+
+def _jader():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:      # macOS / Windows
+        return os.cpu_count() or 1
+
+
+wsgi_app = "wsgi:app"
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+preload_app = True
+
+workers = int(os.environ.get("GUNICORN_WORKERS", 2 * _jader() + 1))
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 2000))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", max_requests // 10))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", 5))
+# heartbeat workerů v RAM (v kontejneru bývá /tmp na overlay disku)
+worker_tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+accesslog = os.environ.get("GUNICORN_ACCESSLOG")        # "-" = stdout
+errorlog = "-"
+loglevel = os.environ.get("GUNICORN_LOGLEVEL", "info")
+
+# metriky všech workerů do jednoho adresáře (musí existovat před importem prometheus_client)
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR",
+                      os.path.join(tempfile.gettempdir(), "restaurace-prometheus"))
+
+
+def on_starting(server):
+    # soubory metrik z minulého běhu by se přičítaly k novým
+    adresar = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(adresar, ignore_errors=True)
+    os.makedirs(adresar, exist_ok=True)
+
+
+def _aplikace(server):
+    return server.app.wsgi()
+
+
+def when_ready(server):
+    from app import warmup
+    from app.db import db
+
+    app = _aplikace(server)
+    warmup.zahrat(app)
+    # master sám requesty neobsluhuje → jeho spojení zavřít před forkem workerů
+    with app.app_context():
+        db.engine.dispose()
+
+
+def post_fork(server, worker):
+    from app import warmup
+
+    warmup.po_forku(_aplikace(server))
+
+
+def post_worker_init(worker):
+    from app import warmup
+
+    # worker začne přijímat spojení až po návratu z tohoto hooku
+    if not warmup.zahrat(worker.wsgi):
+        worker.log.warning("Worker %s startuje nezahřátý – /ready to zkusí znovu.", worker.pid)
+
+
+def child_exit(server, worker):
+    from app import metrics
+
+    metrics.ukoncit_worker(worker.pid)
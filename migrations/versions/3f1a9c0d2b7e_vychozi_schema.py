@@ -0,0 +1,237 @@
+"""Výchozí schéma
+
+Revision ID: 3f1a9c0d2b7e
+Revises:
+Create Date: 2026-10-19 09:00:00
+
+Zmrazený stav schématu, ze kterého vycházejí databáze založené před
+zavedením migrací (agregace, outbox, věrnostní kniha… přidávají až další
+revize). Tabulky se zakládají s IF NOT EXISTS – existující databáze touto
+revizí projde beze změn. Revize záměrně nesahá na živé modely.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1a9c0d2b7e'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'alergen',
+        sa.Column('id_alergenu', sa.Integer(), nullable=False),
+        sa.Column('nazev', sa.String(length=100), nullable=False),
+        sa.Column('popis', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('id_alergenu'),
+        if_not_exists=True,
+    )
+    op.create_table(
+        'jidelni_plan',
+        sa.Column('id_plan', sa.Integer(), nullable=False),
+        sa.Column('nazev', sa.String(length=100), nullable=False),
+        sa.Column('platny_od', sa.Date(), nullable=False),
+        sa.Column('platny_do', sa.Date(), nullable=True),
+        sa.PrimaryKeyConstraint('id_plan'),
+        if_not_exists=True,
+    )
+    op.create_table(
+        'polozka_menu',
+        sa.Column('id_menu_polozka', sa.Integer(), nullable=False),
+        sa.Column('nazev', sa.String(length=100), nullable=False),
+        sa.Column('popis', sa.Text(), nullable=True),
+        sa.Column('cena', sa.Numeric(precision=8, scale=2), nullable=False),
+        sa.Column('obrazek_url', sa.String(), nullable=True),
+        sa.Column('kategorie', sa.String(length=20), nullable=False),
+        sa.Column('den', sa.String(length=10), nullable=False),
+        sa.PrimaryKeyConstraint('id_menu_polozka'),
+        if_not_exists=True,
+    )
+    op.create_table(
+        'role',
+        sa.Column('id_role', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=30), nullable=False),
+        sa.Column('description', sa.String(length=255), nullable=True),
+        sa.PrimaryKeyConstraint('id_role'),
+        sa.UniqueConstraint('name'),
+        if_not_exists=True,
+    )
+    op.create_table(
+        'salonek',
+        sa.Column('id_salonek', sa.Integer(), nullable=False),
+        sa.Column('nazev', sa.String(length=100), nullable=False),
+        sa.Column('kapacita', sa.Integer(), nullable=False),
+        sa.Column('popis', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('id_salonek'),
+        if_not_exists=True,
+    )
+    op.create_table(
+        'stul',
+        sa.Column('id_stul', sa.Integer(), nullable=False),
+        sa.Column('cislo', sa.Integer(), nullable=False),
+        sa.Column('kapacita', sa.Integer(), nullable=False),
+        sa.Column('popis', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('id_stul'),
+        sa.UniqueConstraint('cislo'),
+        if_not_exists=True,
+    )
+    op.create_table(
+        'token_blacklist',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('jti', sa.String(length=36), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('jti'),
+        if_not_exists=True,
+    )
+    op.create_table(
+        'zakaznik',
+        sa.Column('id_zakaznika', sa.Integer(), nullable=False),
+        sa.Column('jmeno', sa.String(length=50), nullable=False),
+        sa.Column('prijmeni', sa.String(length=50), nullable=False),
+        sa.Column('telefon', sa.String(length=20), nullable=True),
+        sa.Column('email', sa.String(length=100), nullable=False),
+        sa.Column('password', sa.String(length=255), server_default='', nullable=False),
+        sa.PrimaryKeyConstraint('id_zakaznika'),
+        sa.UniqueConstraint('email'),
+        if_not_exists=True,
+    )
+    op.create_table(
+        'objednavka',
+        sa.Column('id_objednavky', sa.Integer(), nullable=False),
+        sa.Column('datum_cas', sa.DateTime(), nullable=False),
+        sa.Column('stav', sa.String(length=20), nullable=True),
+        sa.Column('celkova_castka', sa.Numeric(precision=8, scale=2), nullable=True),
+        sa.Column('id_zakaznika', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['id_zakaznika'], ['zakaznik.id_zakaznika'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id_objednavky'),
+        if_not_exists=True,
+    )
+    op.create_table(
+        'podnikova_akce',
+        sa.Column('id_akce', sa.Integer(), nullable=False),
+        sa.Column('nazev', sa.String(length=100), nullable=False),
+        sa.Column('popis', sa.Text(), nullable=True),
+        sa.Column('datum', sa.Date(), nullable=False),
+        sa.Column('cas', sa.Time(), nullable=False),
+        sa.Column('id_salonek', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['id_salonek'], ['salonek.id_salonek']),
+        sa.PrimaryKeyConstraint('id_akce'),
+        if_not_exists=True,
+    )
+    op.create_table(
+        'polozka_jidelniho_planu',
+        sa.Column('id_polozka_jid_pl', sa.Integer(), nullable=False),
+        sa.Column('den', sa.Date(), nullable=False),
+        sa.Column('poradi', sa.Integer(), nullable=False),
+        sa.Column('id_plan', sa.Integer(), nullable=False),
+        sa.Column('id_menu_polozka', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['id_menu_polozka'], ['polozka_menu.id_menu_polozka']),
+        sa.ForeignKeyConstraint(['id_plan'], ['jidelni_plan.id_plan']),
+        sa.PrimaryKeyConstraint('id_polozka_jid_pl'),
+        if_not_exists=True,
+    )
+    op.create_table(
+        'polozka_menu_alergen',
+        sa.Column('id_menu_polozka', sa.Integer(), nullable=False),
+        sa.Column('id_alergenu', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['id_alergenu'], ['alergen.id_alergenu']),
+        sa.ForeignKeyConstraint(['id_menu_polozka'], ['polozka_menu.id_menu_polozka']),
+        sa.PrimaryKeyConstraint('id_menu_polozka', 'id_alergenu'),
+        if_not_exists=True,
+    )
+    op.create_table(
+        'user_roles',
+        sa.Column('zakaznik_id', sa.Integer(), nullable=False),
+        sa.Column('role_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['role_id'], ['role.id_role']),
+        sa.ForeignKeyConstraint(['zakaznik_id'], ['zakaznik.id_zakaznika']),
+        sa.PrimaryKeyConstraint('zakaznik_id', 'role_id'),
+        if_not_exists=True,
+    )
+    op.create_table(
+        'vernostni_ucet',
+        sa.Column('id_ucet', sa.Integer(), nullable=False),
+        sa.Column('body', sa.Integer(), nullable=False),
+        sa.Column('datum_zalozeni', sa.Date(), nullable=False),
+        sa.Column('id_zakaznika', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['id_zakaznika'], ['zakaznik.id_zakaznika'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id_ucet'),
+        if_not_exists=True,
+    )
+    op.create_table(
+        'hodnoceni',
+        sa.Column('id_hodnoceni', sa.Integer(), nullable=False),
+        sa.Column('hodnoceni', sa.SmallInteger(), nullable=False),
+        sa.Column('komentar', sa.Text(), nullable=True),
+        sa.Column('datum', sa.DateTime(), nullable=False),
+        sa.Column('id_objednavky', sa.Integer(), nullable=False),
+        sa.Column('id_zakaznika', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['id_objednavky'], ['objednavka.id_objednavky']),
+        sa.ForeignKeyConstraint(['id_zakaznika'], ['zakaznik.id_zakaznika'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id_hodnoceni'),
+        if_not_exists=True,
+    )
+    op.create_table(
+        'platba',
+        sa.Column('id_platba', sa.Integer(), nullable=False),
+        sa.Column('castka', sa.Numeric(precision=8, scale=2), nullable=False),
+        sa.Column('typ_platby', sa.String(length=20), nullable=False),
+        sa.Column('datum', sa.DateTime(), nullable=False),
+        sa.Column('id_objednavky', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['id_objednavky'], ['objednavka.id_objednavky']),
+        sa.PrimaryKeyConstraint('id_platba'),
+        if_not_exists=True,
+    )
+    op.create_table(
+        'polozka_objednavky',
+        sa.Column('id_polozky_obj', sa.Integer(), nullable=False),
+        sa.Column('mnozstvi', sa.Integer(), nullable=False),
+        sa.Column('cena', sa.Numeric(precision=8, scale=2), nullable=False),
+        sa.Column('id_objednavky', sa.Integer(), nullable=False),
+        sa.Column('id_menu_polozka', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['id_menu_polozka'], ['polozka_menu.id_menu_polozka']),
+        sa.ForeignKeyConstraint(['id_objednavky'], ['objednavka.id_objednavky']),
+        sa.PrimaryKeyConstraint('id_polozky_obj'),
+        if_not_exists=True,
+    )
+    op.create_table(
+        'rezervace',
+        sa.Column('id_rezervace', sa.Integer(), nullable=False),
+        sa.Column('datum_cas', sa.DateTime(), nullable=False),
+        sa.Column('pocet_osob', sa.Integer(), nullable=False),
+        sa.Column('stav_rezervace', sa.String(length=20), nullable=False),
+        sa.Column('sleva', sa.Numeric(precision=5, scale=2), nullable=True),
+        sa.Column('id_zakaznika', sa.Integer(), nullable=False),
+        sa.Column('id_stul', sa.Integer(), nullable=True),
+        sa.Column('id_salonek', sa.Integer(), nullable=True),
+        sa.Column('id_akce', sa.Integer(), nullable=True),
+        sa.CheckConstraint('(id_stul IS NOT NULL) OR (id_salonek IS NOT NULL) OR (id_akce IS NOT NULL)', name='chk_rezervace_misto'),
+        sa.ForeignKeyConstraint(['id_akce'], ['podnikova_akce.id_akce']),
+        sa.ForeignKeyConstraint(['id_salonek'], ['salonek.id_salonek']),
+        sa.ForeignKeyConstraint(['id_stul'], ['stul.id_stul']),
+        sa.ForeignKeyConstraint(['id_zakaznika'], ['zakaznik.id_zakaznika'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id_rezervace'),
+        if_not_exists=True,
+    )
+    op.create_table(
+        'notifikace',
+        sa.Column('id_notifikace', sa.Integer(), nullable=False),
+        sa.Column('typ', sa.String(length=20), nullable=False),
+        sa.Column('datum_cas', sa.DateTime(), nullable=False),
+        sa.Column('text', sa.Text(), nullable=True),
+        sa.Column('id_rezervace', sa.Integer(), nullable=True),
+        sa.Column('id_objednavky', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['id_objednavky'], ['objednavka.id_objednavky']),
+        sa.ForeignKeyConstraint(['id_rezervace'], ['rezervace.id_rezervace']),
+        sa.PrimaryKeyConstraint('id_notifikace'),
+        if_not_exists=True,
+    )
+
+
+def downgrade():
+    # základ se nevrací – smazal by všechna data
+    pass
@@ -0,0 +1,204 @@
+"""Agregace, věrnostní kniha, outbox notifikací, události, hledání a alergeny v menu
+
+Revision ID: 5a7e1c3b9d24
+Revises: 3f1a9c0d2b7e
+Create Date: 2026-10-19 09:05:00
+
+Vše, co přibylo do schématu po výchozí revizi:
+- tabulky agregace_denni_trzba, agregace_prodej_polozky, agregace_mix_plateb,
+  hodnoceni_statistika, bodovy_pohyb, planovac_znacka, udalost
+- notifikace: stav, pokusy, dalsi_pokus, odeslano, chyba (+ index fronty)
+- polozka_menu: hledani (+ trigramový index na Postgresu), alergeny_maska
+
+Doplnění dat u existující databáze:
+- dosavadní notifikace vznikly před outboxem → stav "odeslano", aby je
+  worker po nasazení nerozeslal znovu
+- hledani a alergeny_maska se dopočítají z nazev / popis a vazeb alergenů
+- nenulový zůstatek bodů dostane v knize pohyb "pocatecni_stav"
+- agregace se nepřepočítávají v migraci – po upgradu spusťte
+  flask agregace-prepocet a flask hodnoceni-prepocet
+
+Tabulky a sloupce, které už existují (schéma z create_all), se přeskočí.
+"""
+import unicodedata
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5a7e1c3b9d24'
+down_revision = '3f1a9c0d2b7e'
+branch_labels = None
+depends_on = None
+
+
+def _sloupce_notifikace():
+    return (
+        sa.Column('stav', sa.String(length=20), server_default='cekajici', nullable=False),
+        sa.Column('pokusy', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('dalsi_pokus', sa.DateTime(), nullable=True),
+        sa.Column('odeslano', sa.DateTime(), nullable=True),
+        sa.Column('chyba', sa.Text(), nullable=True),
+    )
+
+
+def _sloupce_menu():
+    return (
+        sa.Column('hledani', sa.Text(), nullable=True),
+        sa.Column('alergeny_maska', sa.BigInteger(), server_default='0', nullable=False),
+    )
+
+
+def _slozit(text):
+    # kopie app.search.slozit – migrace nesmí záviset na pozdějších změnách aplikace
+    rozlozeno = unicodedata.normalize("NFKD", text or "")
+    return "".join(z for z in rozlozeno if not unicodedata.combining(z)).casefold()
+
+
+def _sloupce(tabulka):
+    return {c['name'] for c in sa.inspect(op.get_bind()).get_columns(tabulka)}
+
+
+def _pridat_sloupce(tabulka, sloupce):
+    """Přidá chybějící sloupce; vrací názvy skutečně přidaných."""
+    existujici = _sloupce(tabulka)
+    pridane = [s for s in sloupce if s.name not in existujici]
+    for sloupec in pridane:
+        op.add_column(tabulka, sloupec)
+    return {s.name for s in pridane}
+
+
+def _tabulky():
+    op.create_table(
+        'agregace_denni_trzba',
+        sa.Column('den', sa.Date(), nullable=False),
+        sa.Column('trzba', sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column('pocet_plateb', sa.Integer(), nullable=False),
+        sa.Column('pocet_objednavek', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('den'),
+        if_not_exists=True,
+    )
+    op.create_table(
+        'agregace_mix_plateb',
+        sa.Column('den', sa.Date(), nullable=False),
+        sa.Column('typ_platby', sa.String(length=20), nullable=False),
+        sa.Column('pocet', sa.Integer(), nullable=False),
+        sa.Column('castka', sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.PrimaryKeyConstraint('den', 'typ_platby'),
+        if_not_exists=True,
+    )
+    op.create_table(
+        'agregace_prodej_polozky',
+        sa.Column('den', sa.Date(), nullable=False),
+        sa.Column('id_menu_polozka', sa.Integer(), nullable=False),
+        sa.Column('mnozstvi', sa.Integer(), nullable=False),
+        sa.Column('trzba', sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.PrimaryKeyConstraint('den', 'id_menu_polozka'),
+        if_not_exists=True,
+    )
+    op.create_table(
+        'hodnoceni_statistika',
+        sa.Column('id_menu_polozka', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('pocet', sa.Integer(), nullable=False),
+        sa.Column('soucet', sa.Integer(), nullable=False),
+        sa.Column('h1', sa.Integer(), nullable=False),
+        sa.Column('h2', sa.Integer(), nullable=False),
+        sa.Column('h3', sa.Integer(), nullable=False),
+        sa.Column('h4', sa.Integer(), nullable=False),
+        sa.Column('h5', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id_menu_polozka'),
+        if_not_exists=True,
+    )
+    op.create_table(
+        'bodovy_pohyb',
+        sa.Column('id_pohyb', sa.Integer(), nullable=False),
+        sa.Column('id_ucet', sa.Integer(), nullable=False),
+        sa.Column('body', sa.Integer(), nullable=False),
+        sa.Column('duvod', sa.String(length=20), nullable=False),
+        sa.Column('popis', sa.Text(), nullable=True),
+        sa.Column('id_platba', sa.Integer(), nullable=True),
+        sa.Column('datum', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['id_ucet'], ['vernostni_ucet.id_ucet'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id_pohyb'),
+        if_not_exists=True,
+    )
+    op.create_index('ix_bodovy_pohyb_id_platba', 'bodovy_pohyb', ['id_platba'], if_not_exists=True)
+    op.create_index('ix_bodovy_pohyb_id_ucet', 'bodovy_pohyb', ['id_ucet'], if_not_exists=True)
+    op.create_table(
+        'planovac_znacka',
+        sa.Column('nazev', sa.String(length=50), nullable=False),
+        sa.Column('hodnota', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('nazev'),
+        if_not_exists=True,
+    )
+    op.create_table(
+        'udalost',
+        sa.Column('id_udalost', sa.Integer(), nullable=False),
+        sa.Column('typ', sa.String(length=40), nullable=False),
+        sa.Column('id_entity', sa.Integer(), nullable=False),
+        sa.Column('data', sa.Text(), nullable=False),
+        sa.Column('datum', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id_udalost'),
+        if_not_exists=True,
+    )
+    op.create_index('ix_udalost_datum', 'udalost', ['datum'], if_not_exists=True)
+
+
+def _doplnit_menu(conn, pridane):
+    menu = sa.table('polozka_menu', sa.column('id_menu_polozka'), sa.column('nazev'),
+                    sa.column('popis'), sa.column('hledani'), sa.column('alergeny_maska'))
+    if 'hledani' in pridane:
+        for id_, nazev, popis in conn.execute(sa.select(menu.c.id_menu_polozka, menu.c.nazev, menu.c.popis)):
+            conn.execute(menu.update().where(menu.c.id_menu_polozka == id_)
+                         .values(hledani=_slozit(f"{nazev} {popis or ''}")))
+    if 'alergeny_maska' in pridane:
+        masky = {}
+        for id_menu, id_alergenu in conn.execute(sa.text(
+                "SELECT id_menu_polozka, id_alergenu FROM polozka_menu_alergen")):
+            if 1 <= id_alergenu <= 63:      # stejné bity jako app.allergens.bit
+                masky[id_menu] = masky.get(id_menu, 0) | (1 << (id_alergenu - 1))
+        for id_menu, maska in masky.items():
+            conn.execute(menu.update().where(menu.c.id_menu_polozka == id_menu)
+                         .values(alergeny_maska=maska))
+
+
+def upgrade():
+    conn = op.get_bind()
+    _tabulky()
+
+    if _pridat_sloupce('notifikace', _sloupce_notifikace()) >= {'stav'}:
+        op.execute("UPDATE notifikace SET stav = 'odeslano'")
+    op.create_index('ix_notifikace_fronta', 'notifikace', ['stav', 'dalsi_pokus'], if_not_exists=True)
+
+    _doplnit_menu(conn, _pridat_sloupce('polozka_menu', _sloupce_menu()))
+    if conn.dialect.name == 'postgresql':
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.create_index('ix_polozka_menu_hledani_trgm', 'polozka_menu', ['hledani'],
+                        postgresql_using='gin', postgresql_ops={'hledani': 'gin_trgm_ops'},
+                        if_not_exists=True)
+
+    # počáteční zůstatky do knihy pohybů (jen účty, které v ní ještě nic nemají)
+    op.execute(
+        "INSERT INTO bodovy_pohyb (id_ucet, body, duvod, datum) "
+        "SELECT u.id_ucet, u.body, 'pocatecni_stav', CURRENT_TIMESTAMP FROM vernostni_ucet u "
+        "WHERE u.body <> 0 AND NOT EXISTS (SELECT 1 FROM bodovy_pohyb p WHERE p.id_ucet = u.id_ucet)"
+    )
+
+
+def downgrade():
+    # create_all ho na SQLite zakládá jako obyčejný index → mazat všude
+    op.drop_index('ix_polozka_menu_hledani_trgm', table_name='polozka_menu', if_exists=True)
+    with op.batch_alter_table('polozka_menu') as batch:
+        for sloupec in _sloupce_menu():
+            batch.drop_column(sloupec.name)
+    op.drop_index('ix_notifikace_fronta', table_name='notifikace', if_exists=True)
+    with op.batch_alter_table('notifikace') as batch:
+        for sloupec in _sloupce_notifikace():
+            batch.drop_column(sloupec.name)
+    op.drop_index('ix_udalost_datum', table_name='udalost', if_exists=True)
+    op.drop_index('ix_bodovy_pohyb_id_ucet', table_name='bodovy_pohyb', if_exists=True)
+    op.drop_index('ix_bodovy_pohyb_id_platba', table_name='bodovy_pohyb', if_exists=True)
+    for tabulka in ('udalost', 'planovac_znacka', 'bodovy_pohyb', 'hodnoceni_statistika',
+                    'agregace_prodej_polozky', 'agregace_mix_plateb', 'agregace_denni_trzba'):
+        op.drop_table(tabulka)
@@ -0,0 +1,74 @@
+"""Indexy cizích klíčů, časových sloupců a otevřených objednávek
+
+Revision ID: 8c4e2d1f6a90
+Revises: 5a7e1c3b9d24
+Create Date: 2026-10-19 09:10:00
+
+- každý cizí klíč, podle kterého se filtruje nebo joinuje (seznamy zákazníka,
+  položky / platby / hodnocení objednávky, mazání s kaskádou…)
+- časové sloupce pro rozsahové dotazy (objednávky a platby podle data)
+- PolozkaMenu.nazev (seed a administrace hledají položky podle názvu)
+- částečný index otevřených objednávek – malý a stále v cache
+Na Postgresu se indexy stavějí CONCURRENTLY (bez zámku proti zápisům),
+IF NOT EXISTS je kvůli databázím, které už indexy mají z create_all.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c4e2d1f6a90'
+down_revision = '5a7e1c3b9d24'
+branch_labels = None
+depends_on = None
+
+INDEXY = [
+    ("ix_user_roles_role_id",                        "user_roles",              ["role_id"]),
+    ("ix_vernostni_ucet_id_zakaznika",               "vernostni_ucet",          ["id_zakaznika"]),
+    ("ix_rezervace_id_zakaznika",                    "rezervace",               ["id_zakaznika"]),
+    ("ix_rezervace_id_stul",                         "rezervace",               ["id_stul"]),
+    ("ix_rezervace_id_salonek",                      "rezervace",               ["id_salonek"]),
+    ("ix_rezervace_id_akce",                         "rezervace",               ["id_akce"]),
+    ("ix_rezervace_datum_cas",                       "rezervace",               ["datum_cas"]),
+    ("ix_podnikova_akce_id_salonek",                 "podnikova_akce",          ["id_salonek"]),
+    ("ix_objednavka_id_zakaznika",                   "objednavka",              ["id_zakaznika"]),
+    ("ix_objednavka_datum_cas",                      "objednavka",              ["datum_cas"]),
+    ("ix_objednavka_stav",                           "objednavka",              ["stav"]),
+    ("ix_polozka_objednavky_id_objednavky",          "polozka_objednavky",      ["id_objednavky"]),
+    ("ix_polozka_objednavky_id_menu_polozka",        "polozka_objednavky",      ["id_menu_polozka"]),
+    ("ix_platba_id_objednavky",                      "platba",                  ["id_objednavky"]),
+    ("ix_platba_datum",                              "platba",                  ["datum"]),
+    ("ix_hodnoceni_id_objednavky",                   "hodnoceni",               ["id_objednavky"]),
+    ("ix_hodnoceni_id_zakaznika",                    "hodnoceni",               ["id_zakaznika"]),
+    ("ix_polozka_menu_nazev",                        "polozka_menu",            ["nazev"]),
+    ("ix_polozka_menu_alergen_id_alergenu",          "polozka_menu_alergen",    ["id_alergenu"]),
+    ("ix_polozka_jidelniho_planu_den",               "polozka_jidelniho_planu", ["den"]),
+    ("ix_polozka_jidelniho_planu_id_plan",           "polozka_jidelniho_planu", ["id_plan"]),
+    ("ix_polozka_jidelniho_planu_id_menu_polozka",   "polozka_jidelniho_planu", ["id_menu_polozka"]),
+    ("ix_notifikace_id_rezervace",                   "notifikace",              ["id_rezervace"]),
+    ("ix_notifikace_id_objednavky",                  "notifikace",              ["id_objednavky"]),
+]
+# kopie app.models.OTEVRENE_STAVY – migrace nesmí záviset na pozdějších změnách aplikace
+OTEVRENE = sa.column('stav').in_(('nová', 'otevřená'))
+
+
+def _vytvorit(nazev, tabulka, sloupce, **kw):
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.create_index(nazev, tabulka, sloupce, if_not_exists=True,
+                            postgresql_concurrently=True, **kw)
+    else:
+        op.create_index(nazev, tabulka, sloupce, if_not_exists=True, **kw)
+
+
+def upgrade():
+    for nazev, tabulka, sloupce in INDEXY:
+        _vytvorit(nazev, tabulka, sloupce)
+    _vytvorit("ix_objednavka_otevrene", "objednavka", ["datum_cas"],
+              postgresql_where=OTEVRENE, sqlite_where=OTEVRENE)
+
+
+def downgrade():
+    op.drop_index("ix_objednavka_otevrene", table_name="objednavka", if_exists=True)
+    for nazev, tabulka, _ in reversed(INDEXY):
+        op.drop_index(nazev, table_name=tabulka, if_exists=True)
@@ -0,0 +1,39 @@
+"""Tabulka idempotentni_pozadavek (hlavička Idempotency-Key)
+
+Revision ID: b71d3e5a9c42
+Revises: 8c4e2d1f6a90
+Create Date: 2026-10-19 11:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b71d3e5a9c42'
+down_revision = '8c4e2d1f6a90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'idempotentni_pozadavek',
+        sa.Column('klic', sa.String(length=64), nullable=False),
+        sa.Column('otisk', sa.String(length=64), nullable=False),
+        sa.Column('stav', sa.String(length=12), nullable=False),
+        sa.Column('status', sa.Integer(), nullable=True),
+        sa.Column('telo', sa.LargeBinary(), nullable=True),
+        sa.Column('hlavicky', sa.Text(), nullable=True),
+        sa.Column('vytvoreno', sa.DateTime(), nullable=False),
+        sa.Column('vyprsi', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('klic'),
+        if_not_exists=True,
+    )
+    op.create_index('ix_idempotentni_pozadavek_vyprsi', 'idempotentni_pozadavek', ['vyprsi'],
+                    if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_idempotentni_pozadavek_vyprsi', table_name='idempotentni_pozadavek')
+    op.drop_table('idempotentni_pozadavek')
@@ -0,0 +1,41 @@
+"""Sloupec verze pro optimistické zamykání (ETag / If-Match)
+
+Revision ID: d42f8b6e1a07
+Revises: b71d3e5a9c42
+Create Date: 2026-10-19 12:00:00
+
+Stávající řádky dostanou verzi 1 (server_default). Tabulky, které už
+sloupec mají (schéma z create_all), se přeskočí.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd42f8b6e1a07'
+down_revision = 'b71d3e5a9c42'
+branch_labels = None
+depends_on = None
+
+TABULKY = (
+    'zakaznik', 'vernostni_ucet', 'rezervace', 'stul', 'salonek', 'podnikova_akce',
+    'objednavka', 'polozka_objednavky', 'platba', 'hodnoceni', 'polozka_menu',
+    'jidelni_plan', 'polozka_jidelniho_planu', 'alergen', 'notifikace',
+)
+
+
+def _ma_verzi(tabulka):
+    return any(c['name'] == 'verze' for c in sa.inspect(op.get_bind()).get_columns(tabulka))
+
+
+def upgrade():
+    for tabulka in TABULKY:
+        if not _ma_verzi(tabulka):
+            op.add_column(tabulka, sa.Column('verze', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade():
+    for tabulka in TABULKY:
+        if _ma_verzi(tabulka):
+            with op.batch_alter_table(tabulka) as batch:
+                batch.drop_column('verze')
@@ -0,0 +1,91 @@
+"""Archivní tabulky objednávek, položek, plateb a notifikací
+
+Revision ID: e5c93a7b2d18
+Revises: d42f8b6e1a07
+Create Date: 2026-10-19 13:00:00
+
+Na Postgresu jsou tabulky rozdělené po měsících (PARTITION BY RANGE);
+měsíční oddíly zakládá flask archivovat podle dat, která přesouvá.
+Bez cizích klíčů – archivní řádky nesmí blokovat mazání zákazníků ani menu.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5c93a7b2d18'
+down_revision = 'd42f8b6e1a07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'objednavka_archiv',
+        sa.Column('id_objednavky', sa.Integer(), nullable=False, autoincrement=False),
+        sa.Column('datum_cas', sa.DateTime(), nullable=False),
+        sa.Column('stav', sa.String(length=20), nullable=True),
+        sa.Column('celkova_castka', sa.Numeric(precision=8, scale=2), nullable=True),
+        sa.Column('id_zakaznika', sa.Integer(), nullable=False),
+        sa.Column('verze', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id_objednavky', 'datum_cas'),
+        postgresql_partition_by='RANGE (datum_cas)',
+        if_not_exists=True,
+    )
+    op.create_table(
+        'polozka_objednavky_archiv',
+        sa.Column('id_polozky_obj', sa.Integer(), nullable=False, autoincrement=False),
+        sa.Column('mnozstvi', sa.Integer(), nullable=False),
+        sa.Column('cena', sa.Numeric(precision=8, scale=2), nullable=False),
+        sa.Column('id_objednavky', sa.Integer(), nullable=False),
+        sa.Column('id_menu_polozka', sa.Integer(), nullable=False),
+        sa.Column('verze', sa.Integer(), nullable=False),
+        sa.Column('datum_cas', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id_polozky_obj', 'datum_cas'),
+        postgresql_partition_by='RANGE (datum_cas)',
+        if_not_exists=True,
+    )
+    op.create_index('ix_polozka_objednavky_archiv_id_objednavky', 'polozka_objednavky_archiv',
+                    ['id_objednavky'], if_not_exists=True)
+    op.create_table(
+        'platba_archiv',
+        sa.Column('id_platba', sa.Integer(), nullable=False, autoincrement=False),
+        sa.Column('castka', sa.Numeric(precision=8, scale=2), nullable=False),
+        sa.Column('typ_platby', sa.String(length=20), nullable=False),
+        sa.Column('datum', sa.DateTime(), nullable=False),
+        sa.Column('id_objednavky', sa.Integer(), nullable=False),
+        sa.Column('verze', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id_platba', 'datum'),
+        postgresql_partition_by='RANGE (datum)',
+        if_not_exists=True,
+    )
+    op.create_index('ix_platba_archiv_id_objednavky', 'platba_archiv', ['id_objednavky'],
+                    if_not_exists=True)
+    op.create_table(
+        'notifikace_archiv',
+        sa.Column('id_notifikace', sa.Integer(), nullable=False, autoincrement=False),
+        sa.Column('typ', sa.String(length=20), nullable=False),
+        sa.Column('datum_cas', sa.DateTime(), nullable=False),
+        sa.Column('text', sa.Text(), nullable=True),
+        sa.Column('id_rezervace', sa.Integer(), nullable=True),
+        sa.Column('id_objednavky', sa.Integer(), nullable=True),
+        sa.Column('stav', sa.String(length=20), nullable=False),
+        sa.Column('pokusy', sa.Integer(), nullable=False),
+        sa.Column('dalsi_pokus', sa.DateTime(), nullable=True),
+        sa.Column('odeslano', sa.DateTime(), nullable=True),
+        sa.Column('chyba', sa.Text(), nullable=True),
+        sa.Column('verze', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id_notifikace', 'datum_cas'),
+        postgresql_partition_by='RANGE (datum_cas)',
+        if_not_exists=True,
+    )
+
+
+def downgrade():
+    # oddíly (objednavka_archiv_2025_01 …) padnou s rodičovskou tabulkou
+    op.drop_table('notifikace_archiv')
+    op.drop_index('ix_platba_archiv_id_objednavky', table_name='platba_archiv')
+    op.drop_table('platba_archiv')
+    op.drop_index('ix_polozka_objednavky_archiv_id_objednavky', table_name='polozka_objednavky_archiv')
+    op.drop_table('polozka_objednavky_archiv')
+    op.drop_table('objednavka_archiv')
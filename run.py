@@ -1,17 +1,32 @@
 # run.py
 
 import os
+import signal
+import threading
 import click
 from datetime import datetime, date, time, timedelta
 from sqlalchemy import text
 
 from app import create_app, db
+from app.export import FORMATY, radky_exportu
+from app.reporting import prepocitat_agregace
+from app.ratings import prepocitat_hodnoceni
+from app.loyalty import prepocitat_body, pripsat_body_hromadne
+from app.outbox import spustit_worker
+from app.reminders import naplanovat_pripominky
+from app.events import smazat_stare_udalosti
+from app.idempotency import vycistit as vycistit_idempotenci
+from app.archive import archivovat as archivovat_data
+from app.search import prepocitat_hledani
+from app.allergens import prepocitat_masky
+from app.seed_large import HESLO, generovat
 from app.models import (
     Zakaznik, VernostniUcet, Rezervace, Stul, Salonek,
     PodnikovaAkce, Objednavka, PolozkaObjednavky,
     Platba, Hodnoceni, PolozkaMenu, PolozkaMenuAlergen,
     JidelniPlan, PolozkaJidelnihoPlanu, Alergen, Notifikace,
-    Role
+    Role, DenniTrzba, DenniProdejPolozky, DenniMixPlateb, HodnoceniStatistika, BodovyPohyb, PlanovacZnacka, Udalost,
+    objednavka_archiv, polozka_objednavky_archiv, platba_archiv, notifikace_archiv
 )
 
 os.environ.setdefault("DATABASE_HOST", "localhost")
@@ -21,8 +36,17 @@ app = create_app(config_name)
 
 
 def _vycistit_databazi():
+    # agregace se hromadným mazáním (mimo session události) neaktualizují
+    db.session.query(DenniTrzba).delete()
+    db.session.query(DenniProdejPolozky).delete()
+    db.session.query(DenniMixPlateb).delete()
+    db.session.query(HodnoceniStatistika).delete()
     db.session.query(PolozkaMenuAlergen).delete()
     db.session.query(Notifikace).delete()
+    db.session.query(PlanovacZnacka).delete()
+    for archiv in (notifikace_archiv, platba_archiv, polozka_objednavky_archiv, objednavka_archiv):
+        db.session.execute(archiv.delete())
+    db.session.query(Udalost).delete()
     db.session.query(Hodnoceni).delete()
     db.session.query(Platba).delete()
     db.session.query(PolozkaObjednavky).delete()
@@ -35,6 +59,7 @@ def _vycistit_databazi():
     db.session.query(PolozkaMenu).delete()
     db.session.query(Salonek).delete()
     db.session.query(Stul).delete()
+    db.session.query(BodovyPohyb).delete()
     db.session.query(VernostniUcet).delete()
     # nejdřív smažeme vazby user_roles, aby při mazání zakazniků nevznikl FK konflikt
     db.session.execute(text('DELETE FROM user_roles'))
@@ -197,6 +222,151 @@ def seed_db():
     click.echo("✅ Demo data a role úspěšně vloženy do všech tabulek.")
 
 
+@app.cli.command("export")
+@click.option("--format", "fmt", type=click.Choice(list(FORMATY)), default="ndjson", show_default=True)
+@click.option("--od", type=click.DateTime(formats=["%Y-%m-%d"]), default=None, help="Od data (včetně).")
+@click.option("--do", "do_", type=click.DateTime(formats=["%Y-%m-%d"]), default=None, help="Do data (bez).")
+@click.option("--po-id", type=int, default=None, help="Navázat za posledním exportovaným id_objednavky.")
+@click.option("--vystup", type=click.File("w", encoding="utf-8"), default="-", help="Cílový soubor (výchozí stdout).")
+def export_objednavek(fmt, od, do_, po_id, vystup):
+    """Streamuje účetní export objednávek, položek a plateb (NDJSON / CSV)."""
+    formatovac, _ = FORMATY[fmt]
+    posledni = {"id": po_id}
+
+    def sledovat(radky):
+        # pamatujeme si poslední id_objednavky pro případné navázání (--po-id)
+        for r in radky:
+            posledni["id"] = r["id_objednavky"]
+            yield r
+
+    radky = radky_exportu(od and od.date(), do_ and do_.date(), po_id)
+    for kus in formatovac(sledovat(radky)):
+        vystup.write(kus)
+    click.echo(f"Poslední exportované id_objednavky: {posledni['id']}", err=True)
+
+
+@app.cli.command("agregace-prepocet")
+@click.option("--od", type=click.DateTime(formats=["%Y-%m-%d"]), default=None, help="Od dne (včetně).")
+@click.option("--do", "do_", type=click.DateTime(formats=["%Y-%m-%d"]), default=None, help="Do dne (bez).")
+def agregace_prepocet(od, do_):
+    """Přestaví agregace tržeb pro období (bez rozsahu = celá historie)."""
+    prepocitat_agregace(od and od.date(), do_ and do_.date())
+    click.echo("✅ Agregace tržeb přepočítány.")
+
+
+@app.cli.command("hodnoceni-prepocet")
+def hodnoceni_prepocet():
+    """Přestaví statistiku hodnocení (souhrn + po položkách menu)."""
+    prepocitat_hodnoceni()
+    click.echo("✅ Statistika hodnocení přepočítána.")
+
+
+@app.cli.command("body-prepocet")
+def body_prepocet():
+    """Přestaví body všech věrnostních účtů z knihy pohybů (jeden UPDATE)."""
+    pocet = prepocitat_body()
+    click.echo(f"✅ Přepočítáno {pocet} účtů.")
+
+
+@app.cli.command("body-promo")
+@click.option("--body", type=int, required=True, help="Kolik bodů připsat (záporné = odečíst).")
+@click.option("--popis", default=None, help="Popis akce do knihy pohybů.")
+@click.option("--role", default=None, help="Jen zákazníci s rolí (např. user).")
+def body_promo(body, popis, role):
+    """Hromadně připíše body všem (vybraným) účtům bez smyčky přes zákazníky."""
+    pocet = pripsat_body_hromadne(body, popis, role)
+    click.echo(f"✅ Připsáno {body} bodů na {pocet} účtů.")
+
+
+@app.cli.command("outbox-worker")
+@click.option("--vlakna", type=int, default=None, help="Počet odesílacích vláken (výchozí OUTBOX_VLAKNA).")
+@click.option("--interval", type=float, default=2.0, show_default=True, help="Pauza při prázdné frontě [s].")
+@click.option("--jednou", is_flag=True, help="Odeslat, co čeká, a skončit.")
+def outbox_worker(vlakna, interval, jednou):
+    """Odesílá notifikace z outboxu (lze spustit víc procesů – SKIP LOCKED)."""
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    try:
+        pocet = spustit_worker(vlakna=vlakna, interval=interval, vyprazdnit=jednou, stop=stop)
+    except KeyboardInterrupt:
+        pocet = None
+    if pocet is not None:
+        click.echo(f"✅ Zpracováno {pocet} notifikací.")
+
+
+@app.cli.command("pripominky")
+@click.option("--okno", type=int, default=60, show_default=True,
+              help="Na kolik minut dopředu naplánovat odeslání připomínek.")
+def pripominky(okno):
+    """Vytvoří připomínky rezervací (24 h / 2 h předem) – spouštět z cronu častěji než okno."""
+    pocet = naplanovat_pripominky(okno=timedelta(minutes=okno))
+    click.echo(f"✅ Naplánováno {pocet} připomínek.")
+
+
+@app.cli.command("udalosti-cisteni")
+@click.option("--dni", type=int, default=7, show_default=True, help="Smazat události starší než N dní.")
+def udalosti_cisteni(dni):
+    """Promaže log událostí pro SSE (slouží jen živým obrazovkám)."""
+    pocet = smazat_stare_udalosti(dni)
+    click.echo(f"✅ Smazáno {pocet} událostí.")
+
+
+@app.cli.command("idempotence-cisteni")
+def idempotence_cisteni():
+    """Smaže uložené odpovědi Idempotency-Key po uplynutí TTL."""
+    pocet = vycistit_idempotenci()
+    click.echo(f"✅ Smazáno {pocet} uložených odpovědí.")
+
+
+@app.cli.command("archivovat")
+@click.option("--dni", type=int, default=None, help="Archivovat starší než N dní (výchozí ARCHIV_PO_DNECH).")
+@click.option("--davka", type=int, default=None, help="Objednávek na transakci (výchozí ARCHIV_DAVKA).")
+def archivovat(dni, davka):
+    """Přesune staré objednávky, položky, platby a notifikace do archivních tabulek."""
+    pocty = archivovat_data(dni, davka)
+    click.echo("✅ Archivováno: " + ", ".join(f"{t} {p}" for t, p in pocty.items()))
+
+
+@app.cli.command("hledani-prepocet")
+def hledani_prepocet():
+    """Doplní sloupec pro hledání v menu (bez diakritiky) u všech položek."""
+    pocet = prepocitat_hledani()
+    click.echo(f"✅ Přepočítáno {pocet} položek menu.")
+
+
+@app.cli.command("alergeny-prepocet")
+def alergeny_prepocet():
+    """Přestaví bitové masky alergenů položek menu z vazeb (jeden UPDATE)."""
+    pocet = prepocitat_masky()
+    click.echo(f"✅ Přepočítány masky {pocet} položek menu.")
+
+
+@app.cli.command("seed-large")
+@click.option("--customers", "--zakazniku", "zakazniku", type=int, default=10_000, show_default=True,
+              help="Počet zákazníků (každý s rolí user a věrnostním účtem).")
+@click.option("--orders", "--objednavek", "objednavek", type=int, default=None,
+              help="Počet objednávek celkem (výchozí 5 na zákazníka).")
+@click.option("--reservations", "--rezervaci", "rezervaci", type=int, default=None,
+              help="Počet rezervací celkem (výchozí 2 na zákazníka).")
+@click.option("--seed", type=int, default=42, show_default=True, help="Seed generátoru (stejný seed = stejná data).")
+@click.option("--davka", type=int, default=10_000, show_default=True, help="Zákazníků na jednu dávku nahrávání.")
+def seed_large(zakazniku, objednavek, rezervaci, seed, davka):
+    """Hromadně vygeneruje velká konzistentní data (COPY na Postgresu); nic nemaže."""
+    objednavek = zakazniku * 5 if objednavek is None else objednavek
+    rezervaci = zakazniku * 2 if rezervaci is None else rezervaci
+    zacatek = datetime.now()
+
+    def prubeh(celkem):
+        click.echo(f"  … {celkem['zakaznik']} zákazníků, {celkem['objednavka']} objednávek "
+                   f"({(datetime.now() - zacatek).total_seconds():.0f} s)", err=True)
+
+    celkem = generovat(zakazniku, objednavek, rezervaci, seed=seed, davka=davka, prubeh=prubeh)
+    for tabulka, pocet in celkem.items():
+        click.echo(f"{tabulka:>20}: {pocet}")
+    click.echo(f"✅ Hotovo za {(datetime.now() - zacatek).total_seconds():.0f} s "
+               f"(heslo všech zákazníků: {HESLO}).")
+
+
 @app.shell_context_processor
 def make_shell_context():
     return {
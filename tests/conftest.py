@@ -1,8 +1,12 @@
 # tests/conftest.py
 
 import pytest
+from sqlalchemy import create_engine
+from flask_jwt_extended import create_access_token
 from app import create_app
+from app.config import TestingConfig
 from app.db import db as _db
+from app.instrumentation import hlidat_dotazy as _hlidat_dotazy
 
 
 @pytest.fixture(scope='session')
@@ -23,3 +27,47 @@ def app():
 @pytest.fixture
 def client(app):
     return app.test_client()
+
+
+@pytest.fixture(scope='module')
+def db_app(tmp_path_factory):
+    # create_app při startu seeduje menu → tabulky musí existovat ještě před ním,
+    # proto použijeme souborovou SQLite a schéma vytvoříme napřed
+    uri = f"sqlite:///{tmp_path_factory.mktemp('db') / 'test.sqlite'}"
+    engine = create_engine(uri)
+    _db.metadata.create_all(engine)
+    engine.dispose()
+
+    class Cfg(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = uri
+        JWT_SECRET_KEY = "test-secret"
+        SQL_INSTRUMENTACE = True
+
+    app = create_app("testing", config_override=Cfg)
+    with app.app_context():
+        yield app
+        _db.session.remove()
+
+
+@pytest.fixture
+def db_client(db_app):
+    return db_app.test_client()
+
+
+@pytest.fixture
+def auth_headers(db_app):
+    # vytvoří Authorization hlavičku s danou identitou a rolemi
+    def _headers(id_zakaznika=1, roles=("staff",)):
+        token = create_access_token(
+            identity=str(id_zakaznika),
+            additional_claims={"roles": list(roles)}
+        )
+        return {"Authorization": f"Bearer {token}"}
+    return _headers
+
+
+@pytest.fixture
+def hlidat_dotazy(db_app):
+    # with hlidat_dotazy(max_dotazu=3, max_opakovani=1): db_client.get(...)
+    # → selže při víc dotazech nebo při opakování stejného dotazu (N+1)
+    return _hlidat_dotazy
@@ -0,0 +1,82 @@
+# tests/test_allergens.py
+
+from sqlalchemy import event
+
+from app.db import db
+from app.models import Alergen, PolozkaMenu, PolozkaMenuAlergen
+from app.allergens import MAX_ID, bit, prepocitat_masky
+from app.schemas import PolozkaMenuAlergenCreateSchema
+
+
+def _polozka(nazev):
+    return db.session.query(PolozkaMenu).filter_by(nazev=nazev).one()
+
+
+def _alergen(nazev):
+    return db.session.query(Alergen).filter_by(nazev=nazev).one()
+
+
+def test_maska_ze_seedu_a_po_zmene_vazeb(db_app):
+    pizza = _polozka('Sýrová pizza')
+    lepek, mleko, orechy = _alergen('Lepek'), _alergen('Mléko'), _alergen('Ořechy')
+    assert pizza.alergeny_maska == bit(lepek.id_alergenu) | bit(mleko.id_alergenu)
+
+    db.session.add(PolozkaMenuAlergen(menu_polozka=pizza, alergen=orechy))
+    db.session.commit()
+    assert pizza.alergeny_maska & bit(orechy.id_alergenu)
+
+    db.session.delete(db.session.get(PolozkaMenuAlergen, (pizza.id_menu_polozka, orechy.id_alergenu)))
+    db.session.commit()
+    assert pizza.alergeny_maska == bit(lepek.id_alergenu) | bit(mleko.id_alergenu)
+
+    ulozene = {p.id_menu_polozka: p.alergeny_maska for p in db.session.query(PolozkaMenu)}
+    db.session.query(PolozkaMenu).update({'alergeny_maska': 0})
+    db.session.commit()
+    prepocitat_masky()
+    db.session.expire_all()
+    assert {p.id_menu_polozka: p.alergeny_maska for p in db.session.query(PolozkaMenu)} == ulozene
+
+
+def test_filtr_bez_alergenu(db_client):
+    vse = db_client.get('/api/menu').get_json()
+    resp = db_client.get('/api/menu?bez_alergenu=lepek,Orechy')
+    assert resp.status_code == 200
+    nazvy = {p['nazev'] for p in resp.get_json()}
+    assert nazvy == {p['nazev'] for p in vse
+                     if not {'Lepek', 'Ořechy'} & {a['nazev'] for a in p['alergeny']}}
+    assert 'crème brûlée' in nazvy and 'Sýrová pizza' not in nazvy
+
+    assert db_client.get('/api/menu?bez_alergenu=Celer').status_code == 400
+
+
+def test_serializace_nesaha_na_vazby(db_app, db_client):
+    dotazy = []
+
+    def zaznamenat(conn, cursor, statement, *args):
+        dotazy.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', zaznamenat)
+    try:
+        polozky = db_client.get('/api/menu').get_json()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', zaznamenat)
+    assert {'id_alergenu', 'nazev'} <= set(polozky[0]['alergeny'][0])
+    assert not any('polozka_menu_alergen' in d for d in dotazy)
+
+
+def test_alergen_mimo_masku_vraci_422(db_app, db_client, auth_headers):
+    posledni = Alergen(id_alergenu=MAX_ID, nazev='Poslední bit')
+    db.session.add(posledni)
+    db.session.commit()
+
+    # další id už se do masky nevejde → 422 a nic se neuloží
+    resp = db_client.post('/api/alergen', json={'nazev': 'Navíc'}, headers=auth_headers())
+    assert resp.status_code == 422
+    assert 'id_alergenu' in resp.get_json()['errors']
+    assert db.session.query(Alergen).filter_by(nazev='Navíc').count() == 0
+
+    chyby = PolozkaMenuAlergenCreateSchema().validate({'id_menu_polozka': 1, 'id_alergenu': MAX_ID + 1})
+    assert 'id_alergenu' in chyby
+
+    db.session.delete(posledni)
+    db.session.commit()
@@ -113,9 +113,12 @@ def test_get_single_zakaznik_not_found(test_client, seed_db):
 
 def test_update_zakaznik_success(test_client, seed_db):
     zak = Zakaznik.query.filter_by(email='test1@example.com').first()
-    resp = test_client.put(f'/api/zakaznik/{zak.id_zakaznika}', json={"telefon": "123"})
+    etag = test_client.get(f'/api/zakaznik/{zak.id_zakaznika}').headers['ETag']
+    resp = test_client.put(f'/api/zakaznik/{zak.id_zakaznika}', json={"telefon": "123"},
+                           headers={'If-Match': etag})
     assert resp.status_code == 200
     assert resp.get_json()['telefon'] == "123"
+    assert resp.headers['ETag'] != etag
 
 
 def test_update_zakaznik_not_found(test_client, seed_db):
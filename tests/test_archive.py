@@ -0,0 +1,94 @@
+# tests/test_archive.py
+
+import json
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func, select
+
+from app.archive import archivovano_do, archivovat
+from app.db import db
+from app.models import (
+    Zakaznik, Objednavka, PolozkaObjednavky, Platba, PolozkaMenu, Notifikace, DenniTrzba,
+    objednavka_archiv, polozka_objednavky_archiv, platba_archiv, notifikace_archiv,
+)
+from app.reporting import prepocitat_agregace
+
+STARY_DEN = date.today() - timedelta(days=400)
+POZDNI_PLATBA = datetime.combine(date.today() - timedelta(days=10), datetime.min.time())
+
+
+@pytest.fixture(scope='module')
+def objednavky(db_app):
+    zak = Zakaznik(jmeno='Archiv', prijmeni='Test', email='archiv@example.com')
+    zak.password = 'password1'
+    menu = db.session.query(PolozkaMenu).first()
+    stara_cas = datetime.combine(STARY_DEN, datetime.min.time()).replace(hour=12)
+    stara = Objednavka(datum_cas=stara_cas, stav='zaplacená',
+                       celkova_castka=Decimal('200.00'), zakaznik=zak)
+    otevrena = Objednavka(datum_cas=stara_cas, stav='otevřená', zakaznik=zak)
+    nova = Objednavka(datum_cas=datetime.now(), stav='zaplacená', zakaznik=zak)
+    neodeslana = Objednavka(datum_cas=stara_cas, stav='zaplacená', zakaznik=zak)
+    db.session.add_all([
+        zak, stara, otevrena, nova, neodeslana,
+        PolozkaObjednavky(mnozstvi=2, cena=Decimal('100.00'), objednavka=stara, menu_polozka=menu),
+        Platba(castka=Decimal('200.00'), typ_platby='kartou', datum=stara_cas, objednavka=stara),
+        # doplatek staré objednávky až po hranici archivu
+        Platba(castka=Decimal('30.00'), typ_platby='hotove', datum=POZDNI_PLATBA, objednavka=stara),
+        PolozkaObjednavky(mnozstvi=1, cena=Decimal('50.00'), objednavka=nova, menu_polozka=menu),
+    ])
+    db.session.commit()
+    # potvrzení staré objednávky už outbox doručil, u `neodeslana` ještě ne
+    for n in stara.notifikace:
+        n.stav = 'odeslano'
+    db.session.commit()
+    return stara.id_objednavky, otevrena.id_objednavky, nova.id_objednavky, neodeslana.id_objednavky
+
+
+def _pocet(tabulka):
+    return db.session.scalar(select(func.count()).select_from(tabulka))
+
+
+def test_archivace_presune_jen_stare_uzavrene(db_app, objednavky):
+    stara, otevrena, nova, neodeslana = objednavky
+    pocty = archivovat(dni=365, davka=1)
+
+    assert pocty == {"objednavka": 1, "polozka_objednavky": 1, "platba": 2,
+                     "notifikace": pocty["notifikace"]}
+    db.session.expire_all()
+    assert db.session.get(Objednavka, stara) is None
+    assert db.session.get(Objednavka, otevrena) is not None
+    assert db.session.get(Objednavka, nova) is not None
+    # nedoručená zpráva drží objednávku v provozu, dokud ji outbox neodešle
+    assert db.session.get(Objednavka, neodeslana).notifikace[0].stav == 'cekajici'
+    assert _pocet(objednavka_archiv) == _pocet(polozka_objednavky_archiv) == 1
+    assert _pocet(platba_archiv) == 2
+    assert _pocet(notifikace_archiv) == pocty["notifikace"]
+    assert db.session.scalar(select(func.count()).select_from(Notifikace)
+                             .where(Notifikace.id_objednavky == stara)) == 0
+    assert archivovano_do().date() == date.today() - timedelta(days=365)
+
+    # druhý běh nemá co přesouvat
+    assert set(archivovat(dni=365).values()) == {0}
+
+
+def test_agregace_pod_hranici_zustanou(db_app, objednavky):
+    prepocitat_agregace()
+    assert db.session.get(DenniTrzba, STARY_DEN).trzba == Decimal('200.00')
+    # platba archivované objednávky po hranici se při přestavbě nesmí ztratit
+    assert db.session.get(DenniTrzba, POZDNI_PLATBA.date()).trzba == Decimal('30.00')
+
+
+def test_export_cte_archiv_jen_pro_stare_obdobi(db_client, auth_headers, objednavky):
+    stara = objednavky[0]
+
+    resp = db_client.get('/api/export/objednavky', headers=auth_headers())
+    ids = [json.loads(r)['id_objednavky'] for r in resp.get_data(as_text=True).splitlines()]
+    assert stara not in ids
+
+    resp = db_client.get(f'/api/export/objednavky?od={STARY_DEN}', headers=auth_headers())
+    radky = [json.loads(r) for r in resp.get_data(as_text=True).splitlines()]
+    assert [r['id_objednavky'] for r in radky] == list(objednavky)
+    assert radky[0]['polozky'][0]['mnozstvi'] == 2
+    assert [p['castka'] for p in radky[0]['platby']] == ['200.00', '30.00']
@@ -0,0 +1,29 @@
+# tests/test_bench_endpoints.py
+
+from benchmarks.bench_endpoints import porovnat, zmerit
+
+
+def _vysledek(**scenare):
+    return {"meta": {}, "vysledky": scenare}
+
+
+def test_porovnat():
+    zaklad = _vysledek(menu={"p50_ms": 10.0, "p95_ms": 12.0, "dotazu": 2},
+                       login={"p50_ms": 100.0, "p95_ms": 110.0, "dotazu": 2})
+    novy = _vysledek(menu={"p50_ms": 10.5, "p95_ms": 20.0, "dotazu": 3},
+                     login={"p50_ms": 100.4, "p95_ms": 110.0, "dotazu": 2},
+                     nove={"p50_ms": 1.0, "p95_ms": 1.0, "dotazu": 1})
+    assert porovnat(zaklad, novy, prah=0.2) == [
+        ("menu", "p95_ms", 12.0, 20.0),
+        ("menu", "dotazu", 2, 3),
+    ]
+    # malé absolutní rozdíly jsou šum i při velké relativní změně
+    assert porovnat(_vysledek(a={"p50_ms": 0.2, "p95_ms": 0.3, "dotazu": 1}),
+                    _vysledek(a={"p50_ms": 0.5, "p95_ms": 0.6, "dotazu": 1})) == []
+
+
+def test_zmerit(db_client):
+    v = zmerit(db_client, "GET", "/api/menu", None, {}, opakovani=5, zahrati=1)
+    assert v["status"] == [200]
+    assert v["dotazu"] >= 1
+    assert 0 < v["p50_ms"] <= v["p95_ms"] <= v["p99_ms"]
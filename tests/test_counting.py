@@ -0,0 +1,73 @@
+# tests/test_counting.py
+
+from datetime import datetime
+
+import pytest
+
+from app.api.counting import celkovy_pocet
+from app.db import db
+from app.models import Notifikace
+
+
+@pytest.fixture
+def notifikace(db_app):
+    zaznamy = [Notifikace(typ='email', datum_cas=datetime(2025, 1, 1), text=f'n{i}', stav='odeslano')
+               for i in range(12)]
+    db.session.add_all(zaznamy)
+    db.session.commit()
+    yield zaznamy
+    for n in zaznamy:
+        db.session.delete(n)
+    db.session.commit()
+
+
+def test_bez_parametru_cely_seznam(db_client, auth_headers, notifikace):
+    resp = db_client.get('/api/notifikace', headers=auth_headers())
+    assert len(resp.get_json()) == db.session.query(Notifikace).count()
+    assert 'X-Total-Count' not in resp.headers
+
+
+def test_stranka_a_presny_pocet(db_client, auth_headers, notifikace):
+    celkem = db.session.query(Notifikace).count()
+    resp = db_client.get('/api/notifikace?limit=5&offset=5&pocet=presny', headers=auth_headers())
+    assert resp.headers['X-Total-Count'] == str(celkem)
+    assert resp.headers['X-Total-Count-Mode'] == 'presny'
+    ids = [n['id_notifikace'] for n in resp.get_json()]
+    assert len(ids) == 5 and ids == sorted(ids)
+    assert ids[0] == sorted(n.id_notifikace for n in db.session.query(Notifikace))[5]
+
+
+def test_cache_drzi_pocet_do_ttl(db_app, db_client, auth_headers, notifikace, monkeypatch):
+    db_app.extensions.pop('pocty_cache', None)
+    url = '/api/notifikace?limit=1&pocet=cache'
+    prvni = db_client.get(url, headers=auth_headers())
+    assert prvni.headers['X-Total-Count-Mode'] == 'presny'       # první výpočet
+
+    nova = Notifikace(typ='sms', datum_cas=datetime(2025, 1, 2), text='nová', stav='odeslano')
+    notifikace.append(nova)                 # fixture ji na konci smaže
+    db.session.add(nova)
+    db.session.commit()
+    druhy = db_client.get(url, headers=auth_headers())
+    assert druhy.headers['X-Total-Count-Mode'] == 'cache'
+    assert druhy.headers['X-Total-Count'] == prvni.headers['X-Total-Count']
+
+    monkeypatch.setitem(db_app.config, 'POCET_CACHE_TTL_S', 0)
+    db_app.extensions['pocty_cache'].clear()
+    treti = db_client.get(url, headers=auth_headers())
+    assert int(treti.headers['X-Total-Count']) == int(prvni.headers['X-Total-Count']) + 1
+
+
+def test_odhad_mimo_postgres_je_presny(db_app, notifikace):
+    pocet, rezim = celkovy_pocet(db.select(Notifikace), 'odhad')
+    assert rezim == 'presny'
+    assert pocet == db.session.query(Notifikace).count()
+
+
+def test_neplatny_rezim(db_client, auth_headers):
+    assert db_client.get('/api/notifikace?pocet=vsechno', headers=auth_headers()).status_code == 422
+
+
+def test_filtr_zakazniku_podle_role(db_client, auth_headers):
+    resp = db_client.get('/api/zakaznik?role=admin&pocet=presny', headers=auth_headers())
+    assert resp.status_code == 200
+    assert resp.headers['X-Total-Count'] == str(len(resp.get_json()))
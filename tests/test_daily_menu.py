@@ -0,0 +1,55 @@
+# tests/test_daily_menu.py
+
+from datetime import date, timedelta
+
+from app.db import db
+from app.models import JidelniPlan, PolozkaJidelnihoPlanu, PolozkaMenu
+from app.daily_menu import DNY
+
+
+def _menu(nazev):
+    return db.session.query(PolozkaMenu).filter_by(nazev=nazev).one()
+
+
+def test_dnesni_nabidka(db_app, db_client):
+    dnes = date.today()
+    db.session.add(PolozkaMenu(nazev='Polévka dne', popis='', cena=49, kategorie='týdenní',
+                               den=DNY[dnes.weekday()]))
+    db.session.add(PolozkaMenu(nazev='Zítřejší speciál', popis='', cena=49, kategorie='týdenní',
+                               den=DNY[(dnes.weekday() + 1) % 7]))
+    plan = JidelniPlan(nazev='Polední menu', platny_od=dnes - timedelta(days=1))
+    stary = JidelniPlan(nazev='Starý plán', platny_od=dnes - timedelta(days=30),
+                        platny_do=dnes - timedelta(days=1))
+    db.session.add_all([
+        plan, stary,
+        PolozkaJidelnihoPlanu(den=dnes, poradi=2, plan=plan, menu_polozka=_menu('cordon bleu')),
+        PolozkaJidelnihoPlanu(den=dnes, poradi=1, plan=plan, menu_polozka=_menu('craquelin')),
+        PolozkaJidelnihoPlanu(den=dnes + timedelta(days=1), poradi=3, plan=plan,
+                              menu_polozka=_menu('paris brest')),
+        PolozkaJidelnihoPlanu(den=dnes, poradi=1, plan=stary, menu_polozka=_menu('Caesar salát')),
+    ])
+    db.session.commit()
+
+    data = db_client.get('/api/menu/dnes').get_json()
+    assert data['den_tydne'] == DNY[dnes.weekday()]
+    polozky = data['polozky']
+    assert [(p['nazev'], p['sekce']) for p in polozky[:3]] == [
+        ('craquelin', 'plan'), ('cordon bleu', 'plan'), ('Polévka dne', 'den')
+    ]
+    nazvy = [p['nazev'] for p in polozky]
+    assert 'Zítřejší speciál' not in nazvy and 'paris brest' in nazvy   # stálá nabídka
+    assert nazvy.count('cordon bleu') == 1
+    assert {'alergeny', 'hodnoceni', 'cena'} <= set(polozky[0])
+
+
+def test_cache_do_zapisu(db_app, db_client):
+    prvni = db_client.get('/api/menu/dnes').get_json()
+    # zápis mimo ORM cache nezneplatní…
+    db.session.query(PolozkaMenu).filter_by(nazev='craquelin').update({'cena': 1})
+    db.session.commit()
+    assert db_client.get('/api/menu/dnes').get_json() == prvni
+    # …zápis přes ORM ano
+    _menu('craquelin').cena = 70
+    db.session.commit()
+    druhy = db_client.get('/api/menu/dnes').get_json()
+    assert next(p['cena'] for p in druhy['polozky'] if p['nazev'] == 'craquelin') == '70.00'
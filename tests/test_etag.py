@@ -0,0 +1,58 @@
+# tests/test_etag.py
+
+import pytest
+from sqlalchemy import update
+from werkzeug.exceptions import HTTPException
+
+from app.api.etag import ulozit_zmeny
+from app.db import db
+from app.models import Stul
+
+
+@pytest.fixture
+def stul(db_client, auth_headers):
+    resp = db_client.post('/api/stul', json={'cislo': 801, 'kapacita': 4}, headers=auth_headers())
+    assert resp.headers['ETag'] == 'W/"1"'
+    yield resp.get_json()['id_stul']
+    db_client.delete(f"/api/stul/{resp.get_json()['id_stul']}", headers=auth_headers())
+
+
+def test_put_vyzaduje_if_match(db_client, auth_headers, stul):
+    url = f'/api/stul/{stul}'
+    etag = db_client.get(url, headers=auth_headers()).headers['ETag']
+
+    assert db_client.put(url, json={'kapacita': 6}, headers=auth_headers()).status_code == 428
+    resp = db_client.put(url, json={'kapacita': 6}, headers={**auth_headers(), 'If-Match': etag})
+    assert resp.status_code == 200
+    assert resp.headers['ETag'] == 'W/"2"'
+
+    # druhý klient s původním ETagem nic nepřepíše
+    resp = db_client.put(url, json={'kapacita': 2}, headers={**auth_headers(), 'If-Match': etag})
+    assert resp.status_code == 412
+    assert resp.headers['ETag'] == 'W/"2"'
+    assert db.session.get(Stul, stul).kapacita == 6
+
+    # "*" i silný tvar ETagu projdou
+    assert db_client.put(url, json={'popis': 'u okna'},
+                         headers={**auth_headers(), 'If-Match': '"2"'}).status_code == 200
+    assert db_client.put(url, json={'popis': 'u dveří'},
+                         headers={**auth_headers(), 'If-Match': '*'}).headers['ETag'] == 'W/"4"'
+
+
+def test_soubezna_zmena_mezi_nactenim_a_commitem(db_app, stul):
+    with db_app.test_request_context(headers={'If-Match': '"1"'}):
+        obj = db.session.get(Stul, stul)
+        # jiný request mezitím zapsal vlastním spojením – session o tom neví,
+        # If-Match proti načtené verzi projde a zastaví to až hlídaný UPDATE
+        with db.engine.begin() as conn:
+            conn.execute(update(Stul).where(Stul.id_stul == stul).values(verze=Stul.verze + 1))
+        assert obj.verze == 1
+
+        with pytest.raises(HTTPException) as chyba:
+            ulozit_zmeny(obj, {'kapacita': 10})
+        assert chyba.value.code == 412
+        # 412 z If-Match nese ETag; z neúspěšného UPDATE (StaleDataError) ne
+        assert 'headers' not in chyba.value.data
+    db.session.expire_all()
+    stav = db.session.get(Stul, stul)
+    assert (stav.kapacita, stav.verze) == (4, 2)
@@ -0,0 +1,69 @@
+# tests/test_events.py
+
+import json
+import threading
+from datetime import datetime
+
+from app.db import db
+from app.models import Zakaznik, Objednavka
+from app.events import posledni_id
+
+
+def _zpravy(resp):
+    telo = b''.join(resp.response).decode('utf-8')
+    zpravy = []
+    for blok in telo.split('\n\n'):
+        radky = dict(r.split(': ', 1) for r in blok.splitlines() if ': ' in r and not r.startswith(':'))
+        if 'event' in radky:
+            zpravy.append(radky)
+    return zpravy
+
+
+def test_stream_od_last_event_id(db_app, db_client, auth_headers):
+    db_app.config['UDALOSTI_MAX_S'] = 0     # jeden průchod a konec
+    zacatek = posledni_id()
+
+    zak = Zakaznik(jmeno='Kuchyně', prijmeni='Test', email='udalosti@example.com')
+    zak.password = 'password1'
+    obj = Objednavka(datum_cas=datetime(2025, 7, 1, 12), stav='nová', zakaznik=zak)
+    db.session.add_all([zak, obj])
+    db.session.commit()
+    obj.stav = 'připravuje se'
+    db.session.commit()
+
+    resp = db_client.get('/api/udalosti/stream',
+                         headers={**auth_headers(), 'Last-Event-ID': str(zacatek)})
+    assert resp.mimetype == 'text/event-stream'
+    zpravy = _zpravy(resp)
+    assert [z['event'] for z in zpravy] == ['objednavka.vytvorena', 'objednavka.zmenena']
+    assert json.loads(zpravy[1]['data'])['stav'] == 'připravuje se'
+
+    # navázání za poslední id → nic nového; token v query (EventSource)
+    token = auth_headers()['Authorization'].split()[1]
+    resp = db_client.get(f"/api/udalosti/stream?po_id={zpravy[-1]['id']}&jwt={token}")
+    assert _zpravy(resp) == []
+
+
+def test_stream_jen_pro_obsluhu(db_client, auth_headers):
+    resp = db_client.get('/api/udalosti/stream', headers=auth_headers(roles=('user',)))
+    assert resp.status_code == 403
+
+
+def test_nad_limitem_streamu_long_poll(db_app, db_client, auth_headers, monkeypatch):
+    sloty = threading.BoundedSemaphore(1)
+    monkeypatch.setitem(db_app.extensions, 'udalosti_sloty', sloty)
+    monkeypatch.setitem(db_app.config, 'UDALOSTI_MAX_S', 0)
+    monkeypatch.setitem(db_app.config, 'UDALOSTI_POLL_S', 7)
+
+    # dokončený stream místo vrátí
+    resp = db_client.get('/api/udalosti/stream', headers=auth_headers())
+    assert resp.get_data(as_text=True).startswith('retry: 1000')
+    resp.close()
+    assert sloty.acquire(blocking=False)
+
+    # plno (místo drží jiná obrazovka) → jeden průchod, retry za UDALOSTI_POLL_S
+    monkeypatch.setitem(db_app.config, 'UDALOSTI_MAX_S', 300)
+    resp = db_client.get('/api/udalosti/stream', headers=auth_headers())
+    assert resp.status_code == 200
+    assert resp.get_data(as_text=True).startswith('retry: 7000')
+    sloty.release()
@@ -0,0 +1,61 @@
+# tests/test_export.py
+
+import csv
+import io
+import json
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from app.db import db
+from app.models import Zakaznik, Objednavka, PolozkaObjednavky, Platba, PolozkaMenu
+
+
+@pytest.fixture(scope='module')
+def objednavky(db_app):
+    zak = Zakaznik(jmeno='Export', prijmeni='Test', email='export@example.com')
+    zak.password = 'password1'
+    menu = db.session.query(PolozkaMenu).first()
+    o1 = Objednavka(datum_cas=datetime(2025, 1, 10, 12), stav='zaplacená',
+                    celkova_castka=Decimal('398.00'), zakaznik=zak)
+    o2 = Objednavka(datum_cas=datetime(2025, 2, 3, 18), stav='otevřená',
+                    celkova_castka=Decimal('99.00'), zakaznik=zak)
+    db.session.add_all([
+        zak, o1, o2,
+        PolozkaObjednavky(mnozstvi=2, cena=Decimal('199.00'), objednavka=o1, menu_polozka=menu),
+        Platba(castka=Decimal('398.00'), typ_platby='kartou', datum=datetime(2025, 1, 10, 13), objednavka=o1),
+        PolozkaObjednavky(mnozstvi=1, cena=Decimal('99.00'), objednavka=o2, menu_polozka=menu),
+    ])
+    db.session.commit()
+    return o1.id_objednavky, o2.id_objednavky
+
+
+def test_export_ndjson(db_client, auth_headers, objednavky):
+    resp = db_client.get('/api/export/objednavky', headers=auth_headers())
+    assert resp.status_code == 200
+    assert resp.mimetype == 'application/x-ndjson'
+    radky = [json.loads(r) for r in resp.get_data(as_text=True).splitlines()]
+    assert [r['id_objednavky'] for r in radky] == list(objednavky)
+    assert radky[0]['polozky'][0]['cena'] == '199.00'
+    assert radky[0]['platby'][0]['typ_platby'] == 'kartou'
+    assert radky[1]['platby'] == []
+
+
+def test_export_csv_rozsah_data(db_client, auth_headers, objednavky):
+    resp = db_client.get('/api/export/objednavky?format=csv&od=2025-01-01&do=2025-02-01',
+                         headers=auth_headers())
+    assert resp.status_code == 200
+    radky = list(csv.DictReader(io.StringIO(resp.get_data(as_text=True))))
+    assert [r['druh'] for r in radky] == ['objednavka', 'polozka', 'platba']
+    assert {r['id_objednavky'] for r in radky} == {str(objednavky[0])}
+
+
+def test_export_navazani_po_id(db_client, auth_headers, objednavky):
+    resp = db_client.get(f'/api/export/objednavky?po_id={objednavky[0]}', headers=auth_headers())
+    radky = [json.loads(r) for r in resp.get_data(as_text=True).splitlines()]
+    assert [r['id_objednavky'] for r in radky] == [objednavky[1]]
+
+
+def test_export_jen_pro_obsluhu(db_client, auth_headers, objednavky):
+    resp = db_client.get('/api/export/objednavky', headers=auth_headers(roles=('user',)))
+    assert resp.status_code == 403
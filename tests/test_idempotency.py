@@ -0,0 +1,109 @@
+# tests/test_idempotency.py
+
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import idempotency
+from app.db import db
+from app.models import IdempotentniPozadavek, Rezervace, Stul
+
+
+def _stul(db_client, hlavicky, cislo, klic=None):
+    if klic:
+        hlavicky = {**hlavicky, 'Idempotency-Key': klic}
+    return db_client.post('/api/stul', json={'cislo': cislo, 'kapacita': 4}, headers=hlavicky)
+
+
+def _pocet_stolu(cislo):
+    return db.session.query(Stul).filter_by(cislo=cislo).count()
+
+
+def test_opakovani_prehraje_prvni_odpoved(db_client, auth_headers):
+    prvni = _stul(db_client, auth_headers(), 901, klic='tablet-1')
+    druhy = _stul(db_client, auth_headers(), 901, klic='tablet-1')
+    assert prvni.status_code == druhy.status_code == 201
+    assert druhy.get_json() == prvni.get_json()
+    assert druhy.headers['Idempotent-Replayed'] == 'true'
+    assert 'Idempotent-Replayed' not in prvni.headers
+    assert _pocet_stolu(901) == 1
+
+
+def test_bez_klice_se_nic_neprehrava(db_client, auth_headers):
+    # číslo stolu je unikátní → opakovaný POST bez klíče skončí konfliktem
+    assert _stul(db_client, auth_headers(), 902).status_code == 201
+    assert _stul(db_client, auth_headers(), 902).status_code == 409
+
+
+def test_klic_s_jinym_telem(db_client, auth_headers):
+    assert _stul(db_client, auth_headers(), 903, klic='tablet-2').status_code == 201
+    assert _stul(db_client, auth_headers(), 904, klic='tablet-2').status_code == 422
+
+
+def test_klic_patri_identite(db_client, auth_headers):
+    _stul(db_client, auth_headers(1), 905, klic='sdileny')
+    resp = _stul(db_client, auth_headers(2), 905, klic='sdileny')
+    assert resp.status_code == 409          # request se opravdu provedl znovu
+    assert 'Idempotent-Replayed' not in resp.headers
+
+
+def test_chyba_klic_uvolni(db_client, auth_headers):
+    hlavicky = {**auth_headers(roles=('user',)), 'Idempotency-Key': 'rez-1'}
+    telo = {'datum_cas': '2025-08-01T18:00:00', 'pocet_osob': 2}
+    assert db_client.post('/api/rezervace', json=telo, headers=hlavicky).status_code == 422
+    telo['id_stul'] = 1
+    assert db_client.post('/api/rezervace', json=telo, headers=hlavicky).status_code == 201
+    resp = db_client.post('/api/rezervace', json=telo, headers=hlavicky)
+    assert resp.headers['Idempotent-Replayed'] == 'true'
+    assert db.session.query(Rezervace).filter_by(datum_cas=datetime(2025, 8, 1, 18)).count() == 1
+
+
+def test_soubezny_duplikat_ceka(db_app, db_client, auth_headers):
+    hlavicky = auth_headers(7)
+    telo = b'{"cislo": 906, "kapacita": 4}'
+    with db_app.test_request_context('/api/stul', method='POST', data=telo, headers=hlavicky):
+        klic = idempotency._sha(b"7|POST|/api/stul|soubezne")
+        assert idempotency._zabrat(klic, idempotency._sha(telo)) is None     # „první request“ běží
+
+    # po chvíli první request doběhne a uloží odpověď
+    def _dobehnout():
+        with db_app.test_request_context():
+            resp = db_app.response_class(b'{"id_stul": 999}', status=201, mimetype='application/json')
+            idempotency._ulozit(klic, resp)
+    threading.Timer(0.2, _dobehnout).start()
+
+    resp = db_client.post('/api/stul', data=telo, content_type='application/json',
+                          headers={**hlavicky, 'Idempotency-Key': 'soubezne'})
+    assert resp.status_code == 201
+    assert resp.get_json() == {'id_stul': 999}
+    assert _pocet_stolu(906) == 0
+
+
+def test_cekani_vyprsi(db_app, db_client, auth_headers, monkeypatch):
+    monkeypatch.setitem(db_app.config, 'IDEMPOTENCE_CEKANI_S', 0.1)
+    hlavicky = auth_headers(8)
+    telo = b'{"cislo": 907, "kapacita": 4}'
+    with db_app.test_request_context():
+        idempotency._zabrat(idempotency._sha(b"8|POST|/api/stul|visi"), idempotency._sha(telo))
+    resp = db_client.post('/api/stul', data=telo, content_type='application/json',
+                          headers={**hlavicky, 'Idempotency-Key': 'visi'})
+    assert resp.status_code == 409
+    assert resp.headers['Retry-After'] == '1'
+
+
+def test_vycistit(db_app):
+    db.session.add(IdempotentniPozadavek(klic='x' * 64, otisk='y' * 64, stav='hotovo',
+                                         vyprsi=datetime.now() - timedelta(seconds=1)))
+    db.session.commit()
+    assert idempotency.vycistit() >= 1
+    assert db.session.get(IdempotentniPozadavek, 'x' * 64) is None
+
+
+def test_klic_s_jinym_formatem(db_client, auth_headers):
+    pytest.importorskip('msgpack')
+    assert _stul(db_client, auth_headers(), 908, klic='tablet-3').status_code == 201
+    # uložená odpověď je JSON – v msgpack ji přehrát nejde
+    resp = _stul(db_client, {**auth_headers(), 'Accept': 'application/msgpack'}, 908, klic='tablet-3')
+    assert resp.status_code == 422
+    assert _pocet_stolu(908) == 1
@@ -0,0 +1,51 @@
+# tests/test_instrumentation.py
+
+import logging
+
+import pytest
+
+from app.db import db
+from app.instrumentation import tvar
+from app.models import Alergen, PolozkaMenuAlergen
+
+
+def test_hlavicky(db_app, db_client):
+    resp = db_client.get('/api/menu')
+    assert resp.status_code == 200
+    assert int(resp.headers['X-Query-Count']) >= 1
+    assert resp.headers['Server-Timing'].startswith('db;dur=')
+    assert 'app;dur=' in resp.headers['Server-Timing']
+
+
+def test_menu_bez_n_plus_1(db_app, db_client, hlidat_dotazy):
+    with hlidat_dotazy(max_dotazu=5, max_opakovani=1) as dotazy:
+        assert db_client.get('/api/menu').status_code == 200
+    assert dotazy.pocet >= 1
+
+
+def test_odhali_n_plus_1(db_app, hlidat_dotazy):
+    vazby = db.session.query(PolozkaMenuAlergen).limit(3).all()
+    with pytest.raises(AssertionError, match='3× stejný dotaz'):
+        with hlidat_dotazy(max_opakovani=1):
+            for v in vazby:                # dotaz na každý řádek
+                db.session.query(Alergen.nazev).filter_by(id_alergenu=v.id_alergenu).scalar()
+
+
+def test_odhali_prilis_dotazu(db_app, hlidat_dotazy):
+    with pytest.raises(AssertionError, match=r'3 dotazů \(povoleno 2\)'):
+        with hlidat_dotazy(max_dotazu=2):
+            for nazev in ('Lepek', 'Mléko', 'Vejce'):
+                db.session.query(Alergen.popis).filter_by(nazev=nazev).scalar()
+
+
+def test_tvar_sjednoti_in_seznam():
+    assert tvar('SELECT a FROM t WHERE id IN (?, ?, ?)') == tvar('SELECT a FROM t WHERE id IN (?)')
+    assert tvar('x IN (%(id_1_1)s, %(id_1_2)s)') == 'x IN (…)'
+
+
+def test_pomaly_request_se_zaloguje(db_app, db_client, caplog, monkeypatch):
+    monkeypatch.setitem(db_app.config, 'SQL_POMALY_REQUEST_MS', 0.001)
+    with caplog.at_level(logging.WARNING):
+        db_client.get('/api/menu')
+    assert 'Pomalý request GET /api/menu → 200' in caplog.text
+    assert 'FROM polozka_menu' in caplog.text
@@ -0,0 +1,38 @@
+# tests/test_json_provider.py
+
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import UUID
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from app.json_provider import OrjsonProvider
+
+
+def _provider(cls, debug=False):
+    app = Flask(__name__)
+    app.debug = debug
+    app.json = cls(app)
+    app.json.ensure_ascii = False
+    return app
+
+
+def test_stejny_vystup_jako_vychozi_provider():
+    data = {
+        "nazev": "Svíčková na smetaně", "cena": Decimal("329.00"),
+        "datum": date(2025, 3, 1), "cas": datetime(2025, 3, 1, 18, 30),
+        "id": UUID(int=1), "hodnoceni": {"5": 2, "1": 0}, "z": None, "a": [1.5, True],
+    }
+    for debug in (False, True):
+        vychozi, rychly = _provider(DefaultJSONProvider, debug), _provider(OrjsonProvider, debug)
+        with vychozi.app_context(), rychly.app_context():
+            assert rychly.json.response(data).get_data() == vychozi.json.response(data).get_data()
+            # dumps() je vždy kompaktní (orjson nepřidává mezery) – obsah je stejný
+            assert rychly.json.loads(rychly.json.dumps(data)) == vychozi.json.loads(vychozi.json.dumps(data))
+
+
+def test_aplikace_pouziva_orjson(db_app, db_client):
+    assert isinstance(db_app.json, OrjsonProvider)
+    resp = db_client.get('/api/menu/hledat?q=svickova')
+    assert 'svíčková'.encode() in resp.data
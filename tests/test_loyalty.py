@@ -0,0 +1,93 @@
+# tests/test_loyalty.py
+
+from datetime import date, datetime
+
+import pytest
+from app.db import db
+from app.models import Zakaznik, VernostniUcet, Objednavka, Platba, BodovyPohyb
+from app.loyalty import prepocitat_body, pripsat_body_hromadne
+
+
+@pytest.fixture(scope='module')
+def ucet(db_app):
+    zak = Zakaznik(jmeno='Věrný', prijmeni='Host', email='vernost@example.com')
+    zak.password = 'password1'
+    ucet = VernostniUcet(body=5, datum_zalozeni=date.today(), zakaznik=zak)
+    obj = Objednavka(datum_cas=datetime(2025, 5, 1, 12), zakaznik=zak)
+    db.session.add_all([zak, ucet, obj])
+    db.session.commit()
+    return ucet, obj
+
+
+def _body(id_ucet):
+    db.session.expire_all()
+    return db.session.get(VernostniUcet, id_ucet).body
+
+
+def test_body_za_platbu_a_storno(db_app, ucet):
+    u, obj = ucet
+    p = Platba(castka=398, typ_platby='karta', datum=datetime.now(), objednavka=obj)
+    db.session.add(p)
+    db.session.commit()
+    assert _body(u.id_ucet) == 5 + 39
+
+    p.castka = 120
+    db.session.commit()
+    assert _body(u.id_ucet) == 5 + 12
+
+    db.session.delete(p)
+    db.session.commit()
+    assert _body(u.id_ucet) == 5
+    duvody = [x.duvod for x in u.pohyby.order_by(BodovyPohyb.id_pohyb)]
+    assert duvody == ['pocatecni_stav', 'platba', 'storno', 'storno']
+
+
+def test_prepocet_a_promo(db_app, ucet):
+    u, _ = ucet
+    db.session.query(VernostniUcet).filter_by(id_ucet=u.id_ucet).update({'body': 999})
+    db.session.commit()
+    prepocitat_body()
+    assert _body(u.id_ucet) == 5
+
+    pripsat_body_hromadne(50, 'Jarní akce')
+    assert _body(u.id_ucet) == 55
+    prepocitat_body()
+    assert _body(u.id_ucet) == 55
+
+
+def test_body_nelze_menit_pres_put(db_client, auth_headers, ucet):
+    u, _ = ucet
+    url = f'/api/ucet/{u.id_ucet}'
+    etag = db_client.get(url, headers=auth_headers()).headers['ETag']
+
+    # body jsou jen pro čtení – PUT s nimi neprojde validací
+    resp = db_client.put(url, json={'body': 10000, 'datum_zalozeni': date.today().isoformat()},
+                         headers={**auth_headers(), 'If-Match': etag})
+    assert resp.status_code == 422
+    assert 'body' in resp.get_json()['errors']['json']
+    assert _body(u.id_ucet) == 55
+
+    # platná úprava ostatních polí zůstatek nezmění
+    resp = db_client.put(url, json={'datum_zalozeni': '2024-01-01'},
+                         headers={**auth_headers(), 'If-Match': etag})
+    assert resp.status_code == 200
+    assert resp.get_json()['body'] == 55
+    assert _body(u.id_ucet) == 55
+
+    resp = db_client.post(f'/api/ucet/{u.id_ucet}/body', json={'body': -5, 'popis': 'oprava'},
+                          headers=auth_headers())
+    assert resp.status_code == 201
+    assert resp.get_json()['body'] == 50
+    resp = db_client.get(f'/api/ucet/{u.id_ucet}/body', headers=auth_headers())
+    assert resp.get_json()[0]['duvod'] == 'uprava'
+
+
+def test_pripsani_zveda_verzi_uctu(db_app, ucet):
+    u, obj = ucet
+    verze = u.verze
+    # body i verzi mění UPDATE mimo ORM – načtený účet se musí dát dál upravit
+    db.session.add(Platba(castka=100, typ_platby='hotovost', datum=datetime.now(), objednavka=obj))
+    db.session.flush()
+    u.datum_zalozeni = date(2024, 2, 1)
+    db.session.commit()
+    assert u.verze == verze + 2
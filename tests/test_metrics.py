@@ -0,0 +1,31 @@
+# tests/test_metrics.py
+
+import pytest
+
+from app import metrics
+
+
+@pytest.mark.skipif(metrics.prometheus_client is not None, reason='prometheus_client je nainstalovaný')
+def test_bez_knihovny(db_client):
+    assert db_client.get('/metrics').status_code == 503
+    # ostatní endpointy ani přihlášení na chybějící knihovně nezávisí
+    assert db_client.post('/api/auth/login',
+                          json={'email': 'nikdo@example.com', 'password': 'x'}).status_code == 401
+
+
+def test_metriky(db_client):
+    pytest.importorskip('prometheus_client')
+    db_client.get('/api/menu')
+    db_client.get('/api/menu/1')
+    db_client.post('/api/auth/login', json={'email': 'nikdo@example.com', 'password': 'x'})
+
+    resp = db_client.get('/metrics')
+    assert resp.status_code == 200
+    text = resp.get_data(as_text=True)
+    # štítek routy je šablona URL, ne konkrétní cesta
+    assert 'http_request_duration_seconds_bucket{' in text
+    assert 'route="/api/menu/<int:id_menu_polozka>"' in text
+    assert 'route="/api/menu/1"' not in text
+    assert 'http_responses_total{method="POST",route="/api/auth/login",status="401"}' in text
+    assert 'auth_login_attempts_total{result="neplatne_udaje"}' in text
+    assert 'db_pool_checked_out' in text
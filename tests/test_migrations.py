@@ -0,0 +1,81 @@
+# tests/test_migrations.py
+
+import os
+
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from flask import Flask
+from flask_migrate import downgrade, upgrade
+from sqlalchemy import inspect, text
+
+from app import create_app
+from app.config import TestingConfig
+from app.db import db, migrate
+
+ADRESAR = os.path.join(os.path.dirname(__file__), "..", "migrations")
+
+
+def _indexy(tabulka):
+    return {i["name"] for i in inspect(db.engine).get_indexes(tabulka)}
+
+
+def test_upgrade_na_existujici_databazi(db_app):
+    # schéma z create_all už indexy má → IF NOT EXISTS, nic nespadne
+    upgrade(directory=ADRESAR)
+    assert {"ix_objednavka_id_zakaznika", "ix_objednavka_otevrene"} <= _indexy("objednavka")
+
+
+def test_downgrade_a_znovu_upgrade(db_app):
+    upgrade(directory=ADRESAR)
+    downgrade(directory=ADRESAR, revision="3f1a9c0d2b7e")
+    assert "ix_platba_id_objednavky" not in _indexy("platba")
+
+    upgrade(directory=ADRESAR)
+    assert {"ix_platba_id_objednavky", "ix_platba_datum"} <= _indexy("platba")
+    assert "ix_user_roles_role_id" in _indexy("user_roles")
+
+
+def test_upgrade_databaze_z_vychoziho_schematu(tmp_path):
+    # databáze ze schématu před agregacemi, outboxem… – žádné create_all
+    uri = f"sqlite:///{tmp_path / 'stara.sqlite'}"
+    stara = Flask(__name__)
+    stara.config["SQLALCHEMY_DATABASE_URI"] = uri
+    db.init_app(stara)
+    migrate.init_app(stara, db)
+
+    with stara.app_context():
+        upgrade(directory=ADRESAR, revision="3f1a9c0d2b7e")
+        with db.engine.begin() as conn:
+            conn.execute(text(
+                "INSERT INTO zakaznik (id_zakaznika, jmeno, prijmeni, email) "
+                "VALUES (1, 'Stará', 'Data', 'stara@example.com')"))
+            conn.execute(text(
+                "INSERT INTO vernostni_ucet (id_ucet, body, datum_zalozeni, id_zakaznika) "
+                "VALUES (1, 50, '2024-01-01', 1)"))
+            conn.execute(text(
+                "INSERT INTO polozka_menu (id_menu_polozka, nazev, popis, cena, kategorie, den) "
+                "VALUES (1, 'Svíčková', 'na smetaně', 329, 'stálá nabídka', '')"))
+            conn.execute(text("INSERT INTO alergen (id_alergenu, nazev) VALUES (2, 'Mléko')"))
+            conn.execute(text(
+                "INSERT INTO polozka_menu_alergen (id_menu_polozka, id_alergenu) VALUES (1, 2)"))
+            conn.execute(text(
+                "INSERT INTO notifikace (typ, datum_cas, text) VALUES ('email', '2024-01-01', 'stará')"))
+
+        upgrade(directory=ADRESAR)
+
+        with db.engine.connect() as conn:
+            rozdily = [r for r in compare_metadata(MigrationContext.configure(conn), db.metadata)
+                       # trigramový GIN index existuje jen na Postgresu
+                       if not (r[0] == "add_index" and r[1].name == "ix_polozka_menu_hledani_trgm")]
+            assert rozdily == []
+            assert conn.execute(text("SELECT stav FROM notifikace")).scalar() == "odeslano"
+            assert conn.execute(text(
+                "SELECT hledani, alergeny_maska FROM polozka_menu")).one() == ("svickova na smetane", 2)
+            assert conn.execute(text(
+                "SELECT body, duvod FROM bodovy_pohyb")).one() == (50, "pocatecni_stav")
+
+    class Cfg(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = uri
+
+    # create_app seeduje menu přes ORM → potřebuje všechny sloupce modelů
+    create_app("testing", config_override=Cfg)
@@ -0,0 +1,42 @@
+# tests/test_negotiation.py
+
+import gzip
+import json
+
+import pytest
+
+
+def test_gzip_nad_prahem(db_client):
+    plain = db_client.get('/api/menu')
+    resp = db_client.get('/api/menu', headers={'Accept-Encoding': 'gzip'})
+    assert resp.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in resp.headers['Vary']
+    assert len(resp.data) < len(plain.data)
+    assert json.loads(gzip.decompress(resp.data)) == plain.get_json()
+
+
+def test_male_odpovedi_a_bez_accept_encoding(db_client):
+    assert 'Content-Encoding' not in db_client.get('/api/menu').headers
+    resp = db_client.get('/api/menu/hledat?q=svickova', headers={'Accept-Encoding': 'gzip'})
+    assert len(resp.data) < 1024 and 'Content-Encoding' not in resp.headers
+    resp = db_client.get('/api/menu', headers={'Accept-Encoding': 'gzip;q=0, identity'})
+    assert 'Content-Encoding' not in resp.headers
+
+
+def test_msgpack(db_app, db_client, monkeypatch):
+    msgpack = pytest.importorskip('msgpack')
+    plain = db_client.get('/api/menu').get_json()
+
+    # výstup schématu jde rovnou do msgpack – JSON se nikde neparsuje
+    def _neparsovat(*args, **kwargs):
+        raise AssertionError('JSON mezikrok')
+    monkeypatch.setattr(db_app.json, 'loads', _neparsovat)
+
+    resp = db_client.get('/api/menu', headers={'Accept': 'application/msgpack'})
+    assert resp.mimetype == 'application/msgpack'
+    assert 'Accept' in resp.headers['Vary']
+    assert msgpack.unpackb(resp.data, raw=False) == plain
+
+    # JSON má u klienta přednost → JSON
+    resp = db_client.get('/api/menu', headers={'Accept': 'application/json, application/msgpack;q=0.5'})
+    assert resp.mimetype == 'application/json'
@@ -0,0 +1,100 @@
+# tests/test_outbox.py
+
+import json
+from datetime import datetime
+from itertools import count
+
+import pytest
+from app.db import db
+from app.models import Zakaznik, Stul, Rezervace, Notifikace
+from app.outbox import TRANSPORTY, spustit_worker, zabrat_davku, zapsat_vysledky
+
+
+class PadajiciTransport:
+    def __init__(self, config):
+        pass
+
+    def odeslat(self, zprava):
+        raise ConnectionError("SMTP nedostupné")
+
+
+@pytest.fixture
+def outbox(db_app, tmp_path):
+    soubor = tmp_path / 'outbox.ndjson'
+    puvodni = dict(db_app.config)
+    db_app.config.update(OUTBOX_SOUBOR=str(soubor), OUTBOX_MAX_POKUSU=2, OUTBOX_BACKOFF_S=0,
+                         OUTBOX_TRANSPORTY={'email': 'soubor', 'sms': 'soubor', 'push': 'soubor'})
+    db.session.query(Notifikace).delete()
+    db.session.commit()
+    yield soubor
+    db_app.config.clear()
+    db_app.config.update(puvodni)
+
+
+_cislo_stolu = count(900)
+
+
+def _rezervace(email):
+    zak = Zakaznik(jmeno='Fronta', prijmeni='Test', email=email)
+    zak.password = 'password1'
+    stul = Stul(cislo=next(_cislo_stolu), kapacita=4)
+    rez = Rezervace(datum_cas=datetime(2025, 6, 1, 19), pocet_osob=2, zakaznik=zak, stul=stul)
+    db.session.add_all([zak, stul, rez])
+    db.session.commit()
+    return rez
+
+
+def test_rezervace_zaradi_a_worker_odesle(db_app, outbox):
+    rez = _rezervace('outbox1@example.com')
+    n = db.session.query(Notifikace).filter_by(id_rezervace=rez.id_rezervace).one()
+    assert n.stav == 'cekajici'
+
+    assert spustit_worker(vlakna=2, vyprazdnit=True) == 1
+    db.session.expire_all()
+    assert (n.stav, n.pokusy) == ('odeslano', 1)
+    zprava = json.loads(outbox.read_text(encoding='utf-8'))
+    assert zprava['prijemce'] == 'outbox1@example.com'
+    assert '01.06.2025 19:00' in zprava['text']
+
+
+def test_opakovani_a_trvala_chyba(db_app, outbox, monkeypatch):
+    monkeypatch.setitem(TRANSPORTY, 'padajici', PadajiciTransport)
+    db_app.config['OUTBOX_TRANSPORTY'] = {'email': 'padajici'}
+    rez = _rezervace('outbox2@example.com')
+    db.session.add(Notifikace(typ='sms', datum_cas=datetime.now(), text='bez telefonu', rezervace=rez))
+    db.session.commit()
+
+    spustit_worker(vyprazdnit=True)
+    db.session.expire_all()
+    stavy = {n.typ: (n.stav, n.pokusy) for n in db.session.query(Notifikace)}
+    # e-mail: backoff 0 s → hned druhý pokus, pak vyčerpáno; sms: žádný transport → trvalá chyba
+    assert stavy == {'email': ('chyba', 2), 'sms': ('chyba', 1)}
+    chyba = db.session.query(Notifikace).filter_by(typ='email').one().chyba
+    assert 'SMTP nedostupné' in chyba
+
+
+def test_zabrani_je_pokus_a_padly_worker_nezacykli(db_app, outbox):
+    rez = _rezervace('outbox3@example.com')
+    n = db.session.query(Notifikace).filter_by(id_rezervace=rez.id_rezervace).one()
+
+    # worker zprávu dvakrát zabere a spadne dřív, než zapíše výsledek
+    for pokus in (1, 2):
+        [zprava] = zabrat_davku(10, zamek_s=0, max_pokusu=2)
+        assert zprava['pokusy'] == pokus
+    assert zabrat_davku(10, zamek_s=0, max_pokusu=2) == []
+    db.session.expire_all()
+    assert (n.stav, n.pokusy) == ('chyba', 2)
+    assert 'zámek' in n.chyba
+
+
+def test_vysledek_po_vyprseni_zamku_se_zahodi(db_app, outbox):
+    rez = _rezervace('outbox4@example.com')
+    n = db.session.query(Notifikace).filter_by(id_rezervace=rez.id_rezervace).one()
+
+    [pomaly] = zabrat_davku(10, zamek_s=0, max_pokusu=5)
+    [rychly] = zabrat_davku(10, zamek_s=60, max_pokusu=5)   # zámek vypršel → převzetí
+    zapsat_vysledky([(rychly, None)], max_pokusu=5, zaklad_s=0)
+    zapsat_vysledky([(pomaly, ConnectionError('pozdě'))], max_pokusu=5, zaklad_s=0)
+
+    db.session.expire_all()
+    assert (n.stav, n.pokusy, n.chyba) == ('odeslano', 2, None)
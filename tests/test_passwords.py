@@ -0,0 +1,68 @@
+# tests/test_passwords.py
+
+import pytest
+from werkzeug.security import generate_password_hash
+
+from app import passwords
+from app.config import Config, VLAKNA_WORKERU
+from app.db import db
+from app.models import Zakaznik
+
+
+@pytest.fixture
+def zakaznik(db_app):
+    zak = Zakaznik(jmeno='Heslo', prijmeni='Test', email='heslo@example.com')
+    zak.password = 'tajneheslo1'
+    db.session.add(zak)
+    db.session.commit()
+    yield zak
+    db.session.delete(zak)
+    db.session.commit()
+
+
+def _login(client, heslo='tajneheslo1'):
+    return client.post('/api/auth/login', json={'email': 'heslo@example.com', 'password': heslo})
+
+
+def test_metoda_z_konfigurace(zakaznik):
+    # TestingConfig má levný PBKDF2
+    assert zakaznik._password.startswith('pbkdf2:sha256:1000$')
+    assert not passwords.potreba_prehashovat(zakaznik._password)
+
+
+def test_zkracena_metoda_se_doplni(db_app, monkeypatch):
+    monkeypatch.setitem(db_app.config, 'HESLA_METODA', 'pbkdf2:sha256')
+    hash_ = generate_password_hash('x', 'pbkdf2:sha256')
+    assert not passwords.potreba_prehashovat(hash_)
+
+
+def test_prehashovani_pri_prihlaseni(db_client, zakaznik):
+    zakaznik._password = generate_password_hash('tajneheslo1', 'pbkdf2:sha256:2000')
+    db.session.commit()
+
+    assert _login(db_client, 'spatne').status_code == 401
+    assert zakaznik._password.startswith('pbkdf2:sha256:2000$')   # neúspěch nic nemění
+
+    assert _login(db_client).status_code == 200
+    db.session.refresh(zakaznik)
+    assert zakaznik._password.startswith('pbkdf2:sha256:1000$')
+    assert _login(db_client).status_code == 200
+
+
+def test_plna_fronta_vraci_503(db_app, db_client, zakaznik, monkeypatch):
+    plny = passwords._Pool(1, 0)
+    plny.mista.acquire()
+    monkeypatch.setitem(db_app.extensions, 'hesla_pool', plny)
+    monkeypatch.setitem(db_app.config, 'HESLA_CEKANI_S', 0.01)
+
+    resp = _login(db_client)
+    assert resp.status_code == 503
+    assert resp.headers['Retry-After'] == '1'
+    plny.executor.shutdown()
+
+
+def test_pool_mensi_nez_vlakna_workeru():
+    # výchozí limity nechají část vláken workeru pro zbytek API
+    if VLAKNA_WORKERU > 1:
+        assert Config.HESLA_VLAKNA + Config.HESLA_FRONTA < VLAKNA_WORKERU
+    assert Config.HESLA_CEKANI_S < 0.5
@@ -0,0 +1,111 @@
+# tests/test_query_plans.py
+
+"""
+Regrese plánů dotazů – běží jen proti Postgresu (TEST_POSTGRES_URL, prázdná
+databáze určená k testům). Na datech ze seed_large ověří, že dotazy hlavních
+endpointů nejdou přes sekvenční sken velkých tabulek.
+"""
+
+import json
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app import create_app
+from app.api.counting import celkovy_pocet
+from app.config import TestingConfig
+from app.db import db
+from app.models import Notifikace, Objednavka, PolozkaMenu
+from app.search import hledat_menu, skore, slova
+from app.seed_large import generovat
+
+URL = os.environ.get("TEST_POSTGRES_URL")
+pytestmark = pytest.mark.skipif(not URL, reason="TEST_POSTGRES_URL není nastavená")
+
+# malé číselníky – sekvenční sken je u nich správná volba
+MALE_TABULKY = {"role", "stul", "salonek", "polozka_menu", "alergen", "jidelni_plan"}
+
+TED = datetime.now()
+DOTAZY = {
+    "rezervace_zakaznika": ("SELECT * FROM rezervace WHERE id_zakaznika = :id", {"id": 7}),
+    "rezervace_v_case": (
+        "SELECT * FROM rezervace WHERE datum_cas BETWEEN :od AND :do",
+        {"od": TED, "do": TED + timedelta(hours=2)},
+    ),
+    "objednavky_zakaznika": ("SELECT * FROM objednavka WHERE id_zakaznika = :id", {"id": 7}),
+    "otevrene_objednavky": (
+        "SELECT * FROM objednavka WHERE stav IN ('nová', 'otevřená') ORDER BY datum_cas", {},
+    ),
+    "polozky_objednavky": ("SELECT * FROM polozka_objednavky WHERE id_objednavky = :id", {"id": 11}),
+    "platby_objednavky": ("SELECT * FROM platba WHERE id_objednavky = :id", {"id": 11}),
+    "platby_za_den": (
+        "SELECT * FROM platba WHERE datum >= :od AND datum < :do",
+        {"od": TED - timedelta(days=100), "do": TED - timedelta(days=99)},
+    ),
+    "hodnoceni_objednavky": ("SELECT * FROM hodnoceni WHERE id_objednavky = :id", {"id": 11}),
+    "pohyby_uctu": ("SELECT * FROM bodovy_pohyb WHERE id_ucet = :id", {"id": 7}),
+    "notifikace_objednavky": ("SELECT * FROM notifikace WHERE id_objednavky = :id", {"id": 11}),
+    "role_uzivatelu": ("SELECT * FROM user_roles WHERE role_id = :id", {"id": 999}),
+}
+
+
+@pytest.fixture(scope="module")
+def pg_app():
+    engine = create_engine(URL)
+    db.metadata.create_all(engine)
+    engine.dispose()
+
+    class Cfg(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = URL
+        JWT_SECRET_KEY = "test-secret"
+
+    app = create_app("testing", config_override=Cfg)
+    with app.app_context():
+        generovat(2000, objednavek=6000, rezervaci=4000)    # na konci ANALYZE
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def _sekvencni_skeny(uzel):
+    if uzel.get("Node Type") == "Seq Scan":
+        yield uzel["Relation Name"]
+    for dite in uzel.get("Plans", ()):
+        yield from _sekvencni_skeny(dite)
+
+
+@pytest.mark.parametrize("nazev", DOTAZY)
+def test_bez_sekvencniho_skenu(pg_app, nazev):
+    sql, parametry = DOTAZY[nazev]
+    plan = db.session.execute(text("EXPLAIN (FORMAT JSON) " + sql), parametry).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    skeny = set(_sekvencni_skeny(plan[0]["Plan"])) - MALE_TABULKY
+    assert not skeny, f"{nazev}: Seq Scan na {sorted(skeny)}\n{json.dumps(plan, indent=1)[:2000]}"
+
+
+@pytest.mark.parametrize("stmt", [
+    db.select(Notifikace),
+    db.select(Objednavka).where(Objednavka.stav == "zaplacená"),
+], ids=["bez_filtru", "s_filtrem"])
+def test_odhad_poctu(pg_app, monkeypatch, stmt):
+    monkeypatch.setitem(pg_app.config, "POCET_ODHAD_OD", 1000)
+    presny, _ = celkovy_pocet(stmt, "presny")
+    odhad, rezim = celkovy_pocet(stmt, "odhad")
+    assert rezim == "odhad"
+    assert abs(odhad - presny) <= presny * 0.2
+
+
+@pytest.mark.parametrize("dotaz", ["pizza", "sal", "hovezi na"])
+def test_hledani_radi_v_sql_pred_limitem(pg_app, dotaz):
+    # stejné pořadí jako skore() nad všemi položkami – LIMIT nic dobrého neusekne
+    tokeny = slova(dotaz)
+    vse = []
+    for p in db.session.scalars(db.select(PolozkaMenu)):
+        s = skore(tokeny, slova(p.nazev), slova(p.popis))
+        if s is not None:
+            vse.append((-s, " ".join(slova(p.nazev)), p.id_menu_polozka))
+    ocekavane = [id_ for _, _, id_ in sorted(vse)[:3]]
+    assert hledat_menu(dotaz, limit=3) == ocekavane
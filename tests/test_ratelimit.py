@@ -0,0 +1,103 @@
+# tests/test_ratelimit.py
+
+import time
+
+import pytest
+
+from app import create_app, ratelimit
+from app.config import TestingConfig
+
+
+@pytest.fixture
+def limity(db_app, monkeypatch):
+    # čerstvá počítadla a zapnutý limit jen pro tento test
+    monkeypatch.setitem(db_app.extensions, 'ratelimit', ratelimit._Stav(ratelimit.PametovyBackend()))
+    monkeypatch.setitem(db_app.config, 'RATE_LIMIT', True)
+
+    def _nastavit(pravidla):
+        monkeypatch.setitem(db_app.config, 'RATE_LIMITY', pravidla)
+    return _nastavit
+
+
+def test_token_bucket_doplnovani():
+    backend = ratelimit.PametovyBackend()
+    kapacita, rychlost = ratelimit.parsovat_limit('2/10')    # 1 token za 5 s
+    assert backend.vzit('k', kapacita, rychlost, ted=0)[0]
+    assert backend.vzit('k', kapacita, rychlost, ted=0)[0]
+    povoleno, _, cekat = backend.vzit('k', kapacita, rychlost, ted=1)
+    assert not povoleno and cekat == pytest.approx(4)
+    assert backend.vzit('k', kapacita, rychlost, ted=6)[0]
+    assert not backend.vzit('k', kapacita, rychlost, ted=6)[0]
+
+
+def test_login_podle_ip(db_client, limity):
+    limity({'auth.LoginResource': {'ip': '2/60'}})
+    telo = {'email': 'nikdo@example.com', 'password': 'x'}
+    assert db_client.post('/api/auth/login', json=telo).status_code == 401
+    assert db_client.post('/api/auth/login', json=telo).status_code == 401
+    resp = db_client.post('/api/auth/login', json=telo)
+    assert resp.status_code == 429
+    assert int(resp.headers['Retry-After']) >= 1
+    # jiná adresa má vlastní kbelík
+    resp = db_client.post('/api/auth/login', json=telo, environ_base={'REMOTE_ADDR': '10.0.0.9'})
+    assert resp.status_code == 401
+
+
+def test_ip_z_x_forwarded_for_za_proxy(db_app, db_client, limity):
+    class Cfg(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = db_app.config['SQLALCHEMY_DATABASE_URI']
+        JWT_SECRET_KEY = 'test-secret'
+        RATE_LIMIT = True
+        RATE_LIMITY = {'auth.LoginResource': {'ip': '1/60'}}
+        PROXY_POCET = 1
+
+    client = create_app('testing', config_override=Cfg).test_client()
+    telo = {'email': 'nikdo@example.com', 'password': 'x'}
+    balancer = {'REMOTE_ADDR': '10.0.0.1'}
+
+    def login(klient, ip):
+        return klient.post('/api/auth/login', json=telo, environ_base=balancer,
+                           headers={'X-Forwarded-For': ip})
+
+    # klienti za stejným balancerem mají každý svůj kbelík
+    assert login(client, '203.0.113.1').status_code == 401
+    assert login(client, '203.0.113.1').status_code == 429
+    assert login(client, '203.0.113.2').status_code == 401
+    # důvěřuje se jen poslední proxy – podvržená adresa vlevo se ignoruje
+    assert login(client, '198.51.100.7, 203.0.113.1').status_code == 429
+
+    # bez PROXY_POCET se hlavička nepoužije (šlo by ji podvrhnout)
+    limity({'auth.LoginResource': {'ip': '1/60'}})
+    assert login(db_client, '203.0.113.1').status_code == 401
+    assert login(db_client, '203.0.113.2').status_code == 429
+
+
+def test_identita_ma_vlastni_kbelik(db_client, auth_headers, limity):
+    limity({'api': {'identita': '1/60'}, 'auth.LoginResource': {'ip': '1/60'}})
+    assert db_client.get('/api/menu', headers=auth_headers(1)).status_code == 200
+    assert db_client.get('/api/menu', headers=auth_headers(1)).status_code == 429
+    assert db_client.get('/api/menu', headers=auth_headers(2)).status_code == 200
+    # bez tokenu se pravidlo s identitou neuplatní
+    assert db_client.get('/api/menu').status_code == 200
+
+
+def test_odlehceni_podle_fronty(db_app, db_client, monkeypatch):
+    monkeypatch.setitem(db_app.config, 'ZATEZ_MAX_FRONTA_MS', 100)
+    cerstvy = {'X-Request-Start': f't={time.time():.3f}'}
+    stary = {'X-Request-Start': str(int((time.time() - 5) * 1000))}
+    assert db_client.get('/api/menu', headers=cerstvy).status_code == 200
+    resp = db_client.get('/api/menu', headers=stary)
+    assert resp.status_code == 503
+    assert resp.headers['Retry-After'] == '1'
+
+
+def test_odlehceni_soubeznych(db_app, db_client, monkeypatch):
+    monkeypatch.setitem(db_app.config, 'ZATEZ_MAX_SOUBEZNYCH', 1)
+    stav = db_app.extensions['ratelimit']
+    assert db_client.get('/api/menu').status_code == 200
+    assert stav.aktivni == 0            # teardown počítadlo vrátil
+    stav.aktivni = 1                    # jako by jiný request právě běžel
+    try:
+        assert db_client.get('/api/menu').status_code == 503
+    finally:
+        stav.aktivni = 0
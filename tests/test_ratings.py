@@ -0,0 +1,98 @@
+# tests/test_ratings.py
+
+from datetime import datetime
+
+import pytest
+from app.db import db
+from app.models import (
+    Zakaznik, Objednavka, PolozkaObjednavky, PolozkaMenu, Hodnoceni, HodnoceniStatistika
+)
+from app.ratings import CELKEM, prepocitat_hodnoceni
+
+
+@pytest.fixture(scope='module')
+def objednavka(db_app):
+    zak = Zakaznik(jmeno='Hodnotitel', prijmeni='Test', email='hodnoceni@example.com')
+    zak.password = 'password1'
+    menu = db.session.query(PolozkaMenu).order_by(PolozkaMenu.id_menu_polozka).limit(2).all()
+    obj = Objednavka(datum_cas=datetime(2025, 4, 1, 12), zakaznik=zak)
+    db.session.add_all([zak, obj] + [
+        PolozkaObjednavky(mnozstvi=1, cena=m.cena, objednavka=obj, menu_polozka=m) for m in menu
+    ])
+    db.session.commit()
+    return obj, zak, menu
+
+
+def _stat(id_menu):
+    db.session.expire_all()
+    return db.session.get(HodnoceniStatistika, id_menu)
+
+
+def test_statistika_vytvoreni_zmena_smazani(db_app, objednavka):
+    obj, zak, menu = objednavka
+    h = Hodnoceni(hodnoceni=5, datum=datetime.now(), objednavka=obj, zakaznik=zak)
+    db.session.add_all([h, Hodnoceni(hodnoceni=3, datum=datetime.now(), objednavka=obj, zakaznik=zak)])
+    db.session.commit()
+    assert (_stat(CELKEM).pocet, _stat(CELKEM).prumer) == (2, 4.0)
+    assert _stat(menu[0].id_menu_polozka).rozlozeni == {'1': 0, '2': 0, '3': 1, '4': 0, '5': 1}
+
+    h.hodnoceni = 1
+    db.session.commit()
+    assert _stat(menu[1].id_menu_polozka).rozlozeni['1'] == 1
+    assert _stat(menu[1].id_menu_polozka).soucet == 4
+
+    db.session.delete(h)
+    db.session.commit()
+    assert (_stat(CELKEM).pocet, _stat(CELKEM).soucet) == (1, 3)
+
+
+def test_prepocet_a_api(db_app, objednavka):
+    _, _, menu = objednavka
+    pred = {s.id_menu_polozka: (s.pocet, s.soucet, s.h3)
+            for s in db.session.scalars(db.select(HodnoceniStatistika))}
+    prepocitat_hodnoceni()
+    po = {s.id_menu_polozka: (s.pocet, s.soucet, s.h3)
+          for s in db.session.scalars(db.select(HodnoceniStatistika)) if s.pocet}
+    assert {k: v for k, v in pred.items() if v[0]} == po
+
+    client = db_app.test_client()
+    data = client.get('/api/hodnoceni/statistiky').get_json()
+    assert data['celkem']['pocet'] == 1
+    assert {p['id_menu_polozka'] for p in data['polozky']} == {m.id_menu_polozka for m in menu}
+
+    polozka = client.get(f'/api/menu/{menu[0].id_menu_polozka}').get_json()
+    assert polozka['hodnoceni'] == {'pocet': 1, 'prumer': 3.0,
+                                    'rozlozeni': {'1': 0, '2': 0, '3': 1, '4': 0, '5': 0}}
+
+
+def test_zmena_polozek_hodnocene_objednavky(db_app, objednavka):
+    obj, zak, menu = objednavka
+    treti = db.session.query(PolozkaMenu).order_by(PolozkaMenu.id_menu_polozka).offset(2).first()
+    pred = {m: (_stat(m).pocet if _stat(m) else 0) for m in (menu[0].id_menu_polozka, treti.id_menu_polozka)}
+
+    # přidaná položka převezme hodnocení objednávky, druhý kus téže položky nic nemění
+    nova = PolozkaObjednavky(mnozstvi=1, cena=treti.cena, objednavka=obj, menu_polozka=treti)
+    druhy_kus = PolozkaObjednavky(mnozstvi=2, cena=menu[0].cena, objednavka=obj, menu_polozka=menu[0])
+    db.session.add_all([nova, druhy_kus])
+    db.session.commit()
+    assert _stat(treti.id_menu_polozka).pocet == pred[treti.id_menu_polozka] + 1
+    assert _stat(menu[0].id_menu_polozka).pocet == pred[menu[0].id_menu_polozka]
+
+    # odebrání jednoho ze dvou řádků položky ji z objednávky neodstraní
+    db.session.delete(druhy_kus)
+    db.session.commit()
+    assert _stat(menu[0].id_menu_polozka).pocet == pred[menu[0].id_menu_polozka]
+
+    # smazání hodnocení spolu s položkou v jednom flushi – nikdy pod nulu
+    for h in obj.hodnoceni:
+        db.session.delete(h)
+    db.session.delete(nova)
+    db.session.commit()
+    assert _stat(treti.id_menu_polozka).pocet == pred[treti.id_menu_polozka]
+
+    # průběžná statistika = přepočet od nuly
+    prubezne = {s.id_menu_polozka: (s.pocet, s.soucet)
+                for s in db.session.scalars(db.select(HodnoceniStatistika)) if s.pocet}
+    prepocitat_hodnoceni()
+    assert prubezne == {s.id_menu_polozka: (s.pocet, s.soucet)
+                        for s in db.session.scalars(db.select(HodnoceniStatistika)) if s.pocet}
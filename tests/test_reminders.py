@@ -0,0 +1,79 @@
+# tests/test_reminders.py
+
+from datetime import datetime, timedelta
+
+from app import reminders
+from app.db import db
+from app.models import Zakaznik, Stul, Rezervace, Notifikace
+from app.reminders import naplanovat_pripominky
+
+TED = datetime(2030, 3, 1, 8, 0)
+
+
+def _pripominky():
+    return db.session.query(Notifikace).filter(Notifikace.text.like('Připomínka%')) \
+        .order_by(Notifikace.dalsi_pokus).all()
+
+
+def test_pripominky_okno_a_znacka(db_app):
+    zak = Zakaznik(jmeno='Připomínka', prijmeni='Test', email='pripominky@example.com')
+    zak.password = 'password1'
+    stul = Stul(cislo=800, kapacita=4)
+    db.session.add_all([zak, stul] + [
+        Rezervace(datum_cas=TED + posun, pocet_osob=2, zakaznik=zak, stul=stul, stav_rezervace=stav)
+        for posun, stav in [
+            (timedelta(hours=24, minutes=30), 'potvrzená'),   # 24h připomínka v 8:30
+            (timedelta(hours=2, minutes=15), 'potvrzená'),    # 2h připomínka v 8:15
+            (timedelta(hours=2, minutes=45), 'zrušená'),      # zrušená – nic
+            (timedelta(hours=10), 'potvrzená'),               # mimo okno
+        ]
+    ])
+    db.session.commit()
+
+    assert naplanovat_pripominky(ted=TED) == 2
+    assert [(n.typ, n.dalsi_pokus) for n in _pripominky()] == [
+        ('email', TED + timedelta(minutes=15)),   # bez telefonu → e-mail
+        ('email', TED + timedelta(minutes=30)),
+    ]
+    # opakovaný běh nad stejným úsekem nic nepřidá
+    assert naplanovat_pripominky(ted=TED) == 0
+
+    db.session.add(Rezervace(datum_cas=TED + timedelta(hours=25, minutes=10), pocet_osob=4,
+                             zakaznik=zak, stul=stul))
+    db.session.commit()
+    assert naplanovat_pripominky(ted=TED + timedelta(minutes=20)) == 1
+    assert len(_pripominky()) == 3
+
+
+def test_rezervace_v_uz_naplanovanem_useku(db_app, monkeypatch):
+    class Hodiny(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return TED + timedelta(minutes=20)
+    monkeypatch.setattr(reminders, 'datetime', Hodiny)
+
+    # značky z předchozího testu: úsek do TED + 1:20 je prošlý
+    zak = db.session.query(Zakaznik).filter_by(email='pripominky@example.com').one()
+    zak.telefon = '+420777000111'
+    stul = db.session.query(Stul).filter_by(cislo=800).one()
+    pred = len(_pripominky())
+
+    # vytvořená do prošlého úseku → 2h SMS hned, bez dalšího běhu plánovače
+    rez = Rezervace(datum_cas=TED + timedelta(hours=3), pocet_osob=3, zakaznik=zak, stul=stul)
+    db.session.add(rez)
+    db.session.commit()
+    nove = [n for n in rez.notifikace if n.text.startswith('Připomínka')]
+    assert [(n.typ, n.dalsi_pokus) for n in nove] == [('sms', TED + timedelta(hours=1))]
+
+    # přesun: stará čekající připomínka zmizí, nová pro nový čas vznikne
+    rez.datum_cas = TED + timedelta(hours=3, minutes=10)
+    db.session.commit()
+    db.session.expire(rez)
+    nove = [n for n in rez.notifikace if n.text.startswith('Připomínka')]
+    assert [n.dalsi_pokus for n in nove] == [TED + timedelta(hours=1, minutes=10)]
+
+    # plánovač ji už podruhé nevytvoří; zrušení čekající připomínku smaže
+    assert naplanovat_pripominky(ted=TED + timedelta(minutes=20)) == 0
+    rez.stav_rezervace = 'zrušená'
+    db.session.commit()
+    assert len(_pripominky()) == pred
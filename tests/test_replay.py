@@ -0,0 +1,44 @@
+# tests/test_replay.py
+
+from benchmarks.replay import InProcess, endpoint, generovat_obed, prehrat, zprava
+
+
+def test_generovat_obed():
+    zaznamy = generovat_obed(500, delka_s=60, seed=3)
+    assert zaznamy == generovat_obed(500, delka_s=60, seed=3)
+    assert len(zaznamy) == 500
+    casy = [z['t'] for z in zaznamy]
+    assert casy == sorted(casy) and 30 < casy[-1] < 90
+    assert {z['role'] for z in zaznamy} == {'anon', 'user', 'staff', 'admin'}
+    assert all(z['id_stul'] for z in (r['body'] for r in zaznamy
+                                      if r['path'] == '/api/rezervace' and r['method'] == 'POST'))
+
+
+def test_endpoint():
+    assert endpoint({'method': 'GET', 'path': '/api/menu/12?x=1'}) == 'GET /api/menu/{id}'
+    assert endpoint({'method': 'PUT', 'path': '/api/ucet/3/body'}) == 'PUT /api/ucet/{id}/body'
+
+
+def test_prehrat_in_process(db_app):
+    zaznamy = [
+        {'method': 'GET', 'path': '/api/menu', 'role': 'anon'},
+        {'method': 'GET', 'path': '/api/menu/dnes', 'role': 'anon'},
+        {'method': 'GET', 'path': '/api/zakaznik', 'role': 'staff'},
+        {'method': 'GET', 'path': '/api/zakaznik', 'role': 'anon'},
+        {'method': 'GET', 'path': '/api/menu/999999', 'role': 'anon'},
+    ] * 4
+    vysledky, trvani = prehrat(InProcess(db_app, id_uzivatele=1), zaznamy, vlakna=4, rychlost=200)
+    z = zprava(vysledky, trvani)
+    assert z['requestu'] == 20
+    assert z['stavy'] == {'2xx': 12, '4xx': 8}
+    assert z['chyby'] == {'401 GET /api/zakaznik': 4, '404 GET /api/menu/{id}': 4}
+    assert z['endpointy']['GET /api/menu']['pocet'] == 4
+    assert z['latence']['p50_ms'] <= z['latence']['max_ms']
+
+
+def test_zprava_bez_requestu():
+    z = zprava([], 0)
+    assert z['requestu'] == 0
+    assert z['latence'] == {'p50_ms': 0.0, 'p90_ms': 0.0, 'p95_ms': 0.0, 'p99_ms': 0.0, 'max_ms': 0.0}
+    assert z['zpozdeni_max_ms'] == 0
+    assert z['endpointy'] == {}
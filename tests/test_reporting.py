@@ -0,0 +1,58 @@
+# tests/test_reporting.py
+
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+from app.db import db
+from app.models import (
+    Zakaznik, Objednavka, PolozkaObjednavky, Platba, PolozkaMenu,
+    DenniTrzba, DenniMixPlateb
+)
+from app.reporting import prepocitat_agregace
+
+
+@pytest.fixture(scope='module')
+def data(db_app):
+    zak = Zakaznik(jmeno='Report', prijmeni='Test', email='report@example.com')
+    zak.password = 'password1'
+    menu = db.session.query(PolozkaMenu).first()
+    obj = Objednavka(datum_cas=datetime(2025, 3, 1, 12), stav='zaplacená', zakaznik=zak)
+    pol = PolozkaObjednavky(mnozstvi=2, cena=Decimal('100.00'), objednavka=obj, menu_polozka=menu)
+    pl1 = Platba(castka=Decimal('150.00'), typ_platby='kartou', datum=datetime(2025, 3, 1, 13), objednavka=obj)
+    pl2 = Platba(castka=Decimal('50.00'), typ_platby='hotově', datum=datetime(2025, 3, 1, 13), objednavka=obj)
+    db.session.add_all([zak, obj, pol, pl1, pl2])
+    db.session.commit()
+    return {"menu": menu.id_menu_polozka, "pol": pol, "pl1": pl1}
+
+
+def test_agregace_pri_zapisu(db_app, data):
+    den = db.session.get(DenniTrzba, date(2025, 3, 1))
+    assert den.trzba == Decimal('200.00')
+    assert den.pocet_plateb == 2 and den.pocet_objednavek == 1
+    assert db.session.get(DenniMixPlateb, (date(2025, 3, 1), 'kartou')).castka == Decimal('150.00')
+
+
+def test_agregace_zmena_a_smazani(db_app, data):
+    data["pl1"].typ_platby = 'hotově'
+    data["pol"].mnozstvi = 3
+    db.session.commit()
+    assert db.session.get(DenniMixPlateb, (date(2025, 3, 1), 'kartou')).pocet == 0
+    assert db.session.get(DenniMixPlateb, (date(2025, 3, 1), 'hotově')).castka == Decimal('200.00')
+
+    db.session.delete(data["pl1"])
+    db.session.commit()
+    db.session.expire_all()
+    assert db.session.get(DenniTrzba, date(2025, 3, 1)).trzba == Decimal('50.00')
+
+
+def test_prepocet_odpovida_inkrementu(db_app, auth_headers, data):
+    client = db_app.test_client()
+    pred = client.get('/api/reporty/trzby?od=2025-03-01&do=2025-03-02', headers=auth_headers()).get_json()
+    prepocitat_agregace(date(2025, 3, 1), date(2025, 3, 2))
+    po = client.get('/api/reporty/trzby?od=2025-03-01&do=2025-03-02', headers=auth_headers()).get_json()
+    assert pred[0]['trzba'] == po[0]['trzba'] == '50.00'
+    assert po[0]['platby'] == [{'typ_platby': 'hotově', 'pocet': 1, 'castka': '50.00'}]
+
+    polozky = client.get('/api/reporty/polozky?od=2025-03-01&do=2025-03-02', headers=auth_headers()).get_json()
+    assert polozky == [{'id_menu_polozka': data["menu"], 'mnozstvi': 3, 'trzba': '300.00'}]
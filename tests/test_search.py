@@ -0,0 +1,37 @@
+# tests/test_search.py
+
+from app.db import db
+from app.models import PolozkaMenu
+from app.search import slozit, hledat_menu
+
+
+def test_slozit():
+    assert slozit('Svíčková na smetaně') == 'svickova na smetane'
+    assert slozit('CRÈME BRÛLÉE') == 'creme brulee'
+
+
+def test_hledani_bez_diakritiky(db_client):
+    resp = db_client.get('/api/menu/hledat?q=svickova')
+    assert resp.status_code == 200
+    assert [p['nazev'] for p in resp.get_json()] == ['svíčková na smetaně']
+
+    nazvy = [p['nazev'] for p in db_client.get('/api/menu/hledat?q=tatar').get_json()]
+    assert nazvy == ['hovězí tatarák']
+
+
+def test_razeni_nazev_pred_popisem(db_app):
+    # "focaccia" je v názvu "naše focaccia" i v popisu "římský salát"
+    ids = hledat_menu('focac')
+    nazvy = [db.session.get(PolozkaMenu, i).nazev for i in ids]
+    assert nazvy == ['naše focaccia', 'římský salát']
+    assert hledat_menu('burger hranol') == [
+        db.session.query(PolozkaMenu).filter_by(nazev='Hovězí burger').one().id_menu_polozka
+    ]
+
+
+def test_index_po_zmene_menu(db_app):
+    assert hledat_menu('langos') == []
+    db.session.add(PolozkaMenu(nazev='Langoš', popis='česnek, sýr', cena=89,
+                               kategorie='stálá nabídka', den=''))
+    db.session.commit()
+    assert len(hledat_menu('langos')) == 1
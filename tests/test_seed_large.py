@@ -0,0 +1,65 @@
+# tests/test_seed_large.py
+
+from sqlalchemy import func, select
+
+from app.db import db
+from app.models import (
+    BodovyPohyb, DenniTrzba, Hodnoceni, HodnoceniStatistika, Notifikace, Objednavka,
+    Platba, PolozkaObjednavky, Rezervace, VernostniUcet, Zakaznik,
+)
+from app.seed_large import HESLO, email_zakaznika, generovat
+
+
+def _pocet(model):
+    return db.session.scalar(select(func.count()).select_from(model))
+
+
+def test_generovat(db_app, db_client):
+    pred = {m: _pocet(m) for m in (Zakaznik, Objednavka, Rezervace)}
+    celkem = generovat(zakazniku=25, objednavek=60, rezervaci=30, davka=10)
+
+    assert celkem['zakaznik'] == 25 and celkem['objednavka'] == 60 and celkem['rezervace'] == 30
+    assert _pocet(Zakaznik) == pred[Zakaznik] + 25
+    assert _pocet(Objednavka) == pred[Objednavka] + 60
+    assert _pocet(Rezervace) == pred[Rezervace] + 30
+    assert celkem['notifikace'] == 90
+    assert celkem['polozka_objednavky'] >= 60
+    assert _pocet(PolozkaObjednavky) >= celkem['polozka_objednavky']
+
+    # odvozené tabulky jsou přepočítané
+    assert _pocet(DenniTrzba) > 0
+    assert _pocet(HodnoceniStatistika) > 0 or celkem['hodnoceni'] == 0
+    soucet_uctu = db.session.scalar(select(func.sum(VernostniUcet.body)))
+    assert soucet_uctu == db.session.scalar(select(func.sum(BodovyPohyb.body)))
+
+    # každá platba patří k objednávce, každé hodnocení k jejímu zákazníkovi
+    assert db.session.scalar(
+        select(func.count()).select_from(Platba)
+        .outerjoin(Objednavka, Objednavka.id_objednavky == Platba.id_objednavky)
+        .where(Objednavka.id_objednavky.is_(None))
+    ) == 0
+    assert db.session.scalar(
+        select(func.count()).select_from(Hodnoceni)
+        .join(Objednavka, Objednavka.id_objednavky == Hodnoceni.id_objednavky)
+        .where(Objednavka.id_zakaznika != Hodnoceni.id_zakaznika)
+    ) == 0
+    assert _pocet(Notifikace) >= 90
+
+    # vygenerovaný zákazník se přihlásí
+    prvni = db.session.scalar(select(func.max(Zakaznik.id_zakaznika))) - 24
+    resp = db_client.post('/api/auth/login', json={'email': email_zakaznika(prvni), 'password': HESLO})
+    assert resp.status_code == 200
+
+
+def test_reprodukovatelnost(db_app):
+    def otisk(od):
+        return db.session.execute(
+            select(Zakaznik.jmeno, Zakaznik.prijmeni, Zakaznik.telefon)
+            .where(Zakaznik.id_zakaznika > od).order_by(Zakaznik.id_zakaznika)
+        ).all()
+
+    start = db.session.scalar(select(func.max(Zakaznik.id_zakaznika))) or 0
+    generovat(zakazniku=12, objednavek=12, rezervaci=0, seed=7, davka=5)
+    prvni = otisk(start)
+    generovat(zakazniku=12, objednavek=12, rezervaci=0, seed=7, davka=5)
+    assert otisk(start + 12) == prvni
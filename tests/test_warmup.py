@@ -0,0 +1,52 @@
+# tests/test_warmup.py
+
+from app import warmup
+
+
+def _nezahrato(db_app):
+    stav = db_app.extensions["warmup"]
+    warmup.po_forku(db_app)
+    return stav
+
+
+def test_ready_bez_zahrati_v_testech(db_client):
+    resp = db_client.get('/ready')
+    assert resp.status_code == 200
+    assert resp.get_json() == {"status": "pripraveno"}
+
+
+def test_ready_zahreje_proces(db_app, db_client):
+    _nezahrato(db_app)
+    db_app.extensions.pop("menu_dnes", None)
+
+    resp = db_client.get('/ready')
+    assert resp.status_code == 200
+    # reprezentativní dotazy naplnily cache dnešního menu
+    assert "menu_dnes" in db_app.extensions
+
+
+def test_ready_po_chybe_503_a_opakuje_s_odstupem(db_app, db_client, monkeypatch, caplog):
+    stav = _nezahrato(db_app)
+    pokusy = []
+
+    def _selhat(radku):
+        pokusy.append(radku)
+        raise RuntimeError("DB nedostupná")
+
+    monkeypatch.setattr(warmup, "_dotazy", _selhat)
+    # fileConfig alembicu (test_migrations) vypíná existující loggery
+    monkeypatch.setattr(db_app.logger, "disabled", False)
+    resp = db_client.get('/ready')
+    assert resp.status_code == 503
+    assert resp.headers["Retry-After"] == "1"
+    # detail chyby jen v logu, ne v odpovědi
+    assert resp.get_json() == {"status": "zahrivani"}
+    assert "DB nedostupná" in caplog.text
+
+    # v rámci WARMUP_OPAKOVANI_S se znovu nezahřívá
+    assert db_client.get('/ready').status_code == 503
+    assert len(pokusy) == 1
+
+    monkeypatch.undo()
+    stav.posledni_pokus = None
+    assert db_client.get('/ready').status_code == 200
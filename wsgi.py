@@ -0,0 +1,12 @@
+# wsgi.py
+
+"""
+Vstupní bod pro produkční WSGI server:  gunicorn -c gunicorn.conf.py
+(run.py je jen pro vývoj – flask run / debug server a CLI příkazy).
+"""
+
+import os
+
+from app import create_app
+
+app = create_app(os.getenv("FLASK_CONFIG", "production"))